@@ -1,9 +1,39 @@
+from startup_timeline import startup_timeline, parse_args
+import os
 import sys
+import logging
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from auth import AuthWindow
 
+
+def finish_startup(app, exit_code):
+    """Print and save the startup timeline, then quit with exit_code."""
+    if startup_timeline.reached("exit") or startup_timeline.reached("timeout"):
+        return
+    startup_timeline.mark("exit" if exit_code == 0 else "timeout")
+    print(startup_timeline.format_report())
+    if startup_timeline.options.startup_report:
+        startup_timeline.write_report(startup_timeline.options.startup_report)
+    app.exit(exit_code)
+
+
 if __name__ == '__main__':
+    startup_timeline.options = options = parse_args(sys.argv[1:])
+    startup_timeline.mark("imports_done")
     app = QApplication(sys.argv)
+    startup_timeline.mark("qapplication_created")
     auth_window = AuthWindow()
     auth_window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    startup_timeline.on("first_frame", lambda: logging.info(startup_timeline.format_report()))
+    if options.exit_after_first_frame:
+        # Deferred so the frame that got us here is dispatched before the loop stops
+        startup_timeline.on("first_frame", lambda: QTimer.singleShot(0, lambda: finish_startup(app, 0)))
+        if options.timeout:
+            QTimer.singleShot(int(options.timeout * 1000), lambda: finish_startup(app, 1))
+    if options.login:
+        QTimer.singleShot(0, lambda: auth_window.login_as(options.login, os.environ.get("SARAYU_PASSWORD", "")))
+    exit_code = app.exec_()
+    if options.startup_report and not (startup_timeline.reached("exit") or startup_timeline.reached("timeout")):
+        startup_timeline.write_report(options.startup_report)
+    sys.exit(exit_code)
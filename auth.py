@@ -3,13 +3,91 @@ from PyQt5.QtGui import QPixmap, QColor
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit,
                              QPushButton, QMessageBox, QFormLayout, QApplication,
                              QGraphicsDropShadowEffect)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
 import os
+import logging
 from database import Database
 from project_selection import ProjectSelectionWindow
+from features.registry import feature_registry
+from startup_timeline import startup_timeline
+
+MONGO_URI = "mongodb://localhost:27017/"
+
+
+class AuthWorker(QThread):
+    """Login or signup off the GUI thread.
+
+    The user's Database (server check, index creation, project list) is opened on a second
+    thread while the account is looked up and the password hashed or checked, so pressing
+    Login costs the slower of the two rather than their sum. A Database opened for a
+    failed attempt is closed again.
+    """
+    progress = pyqtSignal(str)
+    succeeded = pyqtSignal(object)  # Database with its projects loaded
+    failed = pyqtSignal(str, str)  # title, message
+
+    def __init__(self, user_collection, email, password, signup=False):
+        super().__init__()
+        self.user_collection = user_collection
+        self.email = email
+        self.password = password
+        self.signup = signup
+
+    def run(self):
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auth-database")
+        database_future = pool.submit(self.open_database)
+        pool.shutdown(wait=False)
+        try:
+            error = self.create_account() if self.signup else self.verify_account()
+        except Exception as e:
+            logging.error(f"Authentication failed for {self.email}: {str(e)}")
+            error = ("Database Error", "Failed to sign up." if self.signup else f"Failed to log in: {e}")
+        if error:
+            database_future.add_done_callback(self.close_unused)
+            self.failed.emit(*error)
+            return
+        self.progress.emit("Opening your projects...")
+        try:
+            self.succeeded.emit(database_future.result())
+        except Exception as e:
+            self.failed.emit("Error", f"Failed to open project selection: {e}")
+
+    def verify_account(self):
+        self.progress.emit("Checking your account...")
+        with startup_timeline.span("user_lookup"):
+            user = self.user_collection.find_one({"email": self.email})
+        if not user:
+            return ("Login Failed", "Incorrect email or password.")
+        self.progress.emit("Verifying password...")
+        with startup_timeline.span("password_check"):
+            verified = bcrypt.checkpw(self.password.encode('utf-8'), user["password"])
+        return None if verified else ("Login Failed", "Incorrect email or password.")
+
+    def create_account(self):
+        self.progress.emit("Checking your account...")
+        if self.user_collection.find_one({"email": self.email}):
+            return ("Signup Failed", "User with this email already exists. Please log in.")
+        self.progress.emit("Securing password...")
+        hashed_password = bcrypt.hashpw(self.password.encode('utf-8'), bcrypt.gensalt())
+        self.user_collection.insert_one({"email": self.email, "password": hashed_password})
+        return None
+
+    def open_database(self):
+        with startup_timeline.span("database_connect"):
+            db = Database(connection_string=MONGO_URI, email=self.email)
+        with startup_timeline.span("load_projects"):
+            db.load_projects()
+        return db
+
+    @staticmethod
+    def close_unused(future):
+        if future.exception() is None:
+            future.result().close_connection()
+
 
 class AuthWindow(QWidget):
     def __init__(self):
@@ -18,13 +96,18 @@ class AuthWindow(QWidget):
         self.db = None
         self.user_collection = None
         self.is_login_mode = True
+        self.warmup_started = False
+        self.auth_worker = None
+        self.close_pending = False  # Close requested while auth_worker was running
         self.initDB()
         self.initUI()
         self.setWindowState(Qt.WindowMaximized)
 
     def initDB(self):
         try:
-            self.client = MongoClient("mongodb://localhost:27017/")
+            # connect=False defers the connection to the first query, which runs on the auth worker
+            with startup_timeline.span("auth_mongo_client"):
+                self.client = MongoClient(MONGO_URI, connect=False)
             self.db = self.client["changed_db"]
             self.user_collection = self.db["users"]
             print("Connected to MongoDB successfully!")
@@ -143,6 +226,12 @@ class AuthWindow(QWidget):
         self.action_button.clicked.connect(self.handle_action)
         self.form_layout.addWidget(self.action_button, alignment=Qt.AlignCenter)
 
+        # Progress of a running login or signup
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("font-size: 14px; color: #555;")
+        self.status_label.hide()
+        self.form_layout.addWidget(self.status_label, alignment=Qt.AlignCenter)
+
         # Toggle link
         self.toggle_link = QLabel('<a href="#" style="color: #0099ff; text-decoration: none; font-size: 14px;">Don\'t have an account? Sign Up</a>')
         self.toggle_link.setOpenExternalLinks(False)
@@ -166,6 +255,14 @@ class AuthWindow(QWidget):
         main_layout.addWidget(self.form_container, alignment=Qt.AlignCenter)
         self.setStyleSheet("background-color: white;")
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.warmup_started:
+            self.warmup_started = True
+            startup_timeline.mark("login_window_painted")
+            # Load the dashboard and feature modules while the user types, not before the first paint
+            QTimer.singleShot(0, lambda: feature_registry.start_warmup(["dashboard.dashboard_window"]))
+
     def create_input_field(self, placeholder):
         input_field = QLineEdit()
         input_field.setPlaceholderText(placeholder)
@@ -252,6 +349,8 @@ class AuthWindow(QWidget):
         self.confirm_password_input.clear()
 
     def handle_action(self):
+        if self.auth_worker is not None and self.auth_worker.isRunning():
+            return
         if self.is_login_mode:
             self.login()
         else:
@@ -265,18 +364,16 @@ class AuthWindow(QWidget):
             QMessageBox.warning(self, "Input Error", "Please enter both email and password.")
             return
 
-        user = self.user_collection.find_one({"email": email})
-        if user and bcrypt.checkpw(password.encode('utf-8'), user["password"]):
-            try:
-                db = Database(connection_string="mongodb://localhost:27017/", email=email)
-                ProjectSelectionWindow(db, email, self)
+        startup_timeline.mark("login_pressed")
+        self.start_auth(email, password, signup=False)
 
-                self.hide()
-            except Exception as e:
-                print(f"Error opening Project Selection: {e}")
-                QMessageBox.critical(self, "Error", f"Failed to open project selection: {e}")
-        else:
-            QMessageBox.warning(self, "Login Failed", "Incorrect email or password.")
+    def login_as(self, email, password):
+        """Log in with the given credentials without user input (app.py --login)."""
+        if not self.is_login_mode:
+            self.toggle_mode()
+        self.email_input.setText(email)
+        self.password_input.setText(password)
+        self.login()
 
     def signup(self):
         email = self.email_input.text().strip()
@@ -291,24 +388,65 @@ class AuthWindow(QWidget):
             QMessageBox.warning(self, "Input Error", "Passwords do not match.")
             return
 
-        if self.user_collection.find_one({"email": email}):
-            QMessageBox.warning(self, "Signup Failed", "User with this email already exists. Please log in.")
-            return
+        self.start_auth(email, password, signup=True)
+
+    def start_auth(self, email, password, signup):
+        self.auth_worker = AuthWorker(self.user_collection, email, password, signup)
+        self.auth_worker.progress.connect(self.on_auth_progress)
+        self.auth_worker.succeeded.connect(self.on_auth_succeeded)
+        self.auth_worker.failed.connect(self.on_auth_failed)
+        self.set_busy(True)
+        self.auth_worker.start()
+
+    def set_busy(self, busy):
+        for widget in (self.email_input, self.password_input, self.confirm_password_input, self.toggle_link):
+            widget.setEnabled(not busy)
+        self.action_button.setEnabled(not busy)
+        if busy:
+            self.action_button.setText("Signing In..." if self.is_login_mode else "Signing Up...")
+        else:
+            self.action_button.setText("Sign In" if self.is_login_mode else "Sign Up")
+            self.status_label.hide()
 
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-        user_data = {"email": email, "password": hashed_password}
-        try:
-            self.user_collection.insert_one(user_data)
-            QMessageBox.information(self, "Success", "Signup successful! Proceeding to project selection.")
-            db = Database(connection_string="mongodb://localhost:27017/", email=email)
-            ProjectSelectionWindow(db, email, self)
+    def on_auth_progress(self, message):
+        self.status_label.setText(message)
+        self.status_label.show()
 
+    def on_auth_succeeded(self, db):
+        if self.close_pending:
+            db.close_connection()
+            return
+        email = self.auth_worker.email
+        self.set_busy(False)
+        if self.auth_worker.signup:
+            QMessageBox.information(self, "Success", "Signup successful! Proceeding to project selection.")
+        try:
+            with startup_timeline.span("dashboard_opened"):
+                ProjectSelectionWindow(db, email, self)
             self.hide()
         except Exception as e:
-            print(f"Error inserting user: {e}")
-            QMessageBox.critical(self, "Database Error", "Failed to sign up.")
+            print(f"Error opening Project Selection: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to open project selection: {e}")
+
+    def on_auth_failed(self, title, message):
+        if self.close_pending:
+            return
+        self.set_busy(False)
+        if title in ("Login Failed", "Signup Failed"):
+            QMessageBox.warning(self, title, message)
+        else:
+            QMessageBox.critical(self, title, message)
 
     def closeEvent(self, event):
+        if self.auth_worker is not None and self.auth_worker.isRunning():
+            # The worker still uses self.client; close again once it has finished
+            # instead of blocking the GUI thread on it
+            if not self.close_pending:
+                self.close_pending = True
+                self.auth_worker.finished.connect(self.close)
+                self.on_auth_progress("Closing...")
+            event.ignore()
+            return
         if self.client:
             self.client.close()
         event.accept()
@@ -0,0 +1,231 @@
+import sys
+import time
+import subprocess
+import numpy as np
+from scipy.fft import rfft
+from scipy.signal import lfilter
+from features.harmonics import harmonic_components
+from features.frame_cache import FrameCache
+from features.filter_bank import design_fir, StreamingFIR
+from features.order_tracking import resample_revolutions
+from features.ring_buffer import RingBuffer
+from features.envelope import minmax_envelope
+
+
+def legacy_harmonics(channel_data, start_idx, end_idx, orders=(1, 2, 3)):
+    """The original per-sample loop from TabularViewFeature.calculate_metrics."""
+    segment_length = end_idx - start_idx
+    amplitudes, phases = [], []
+    for harmonic in orders:
+        sine_sum = cosine_sum = 0.0
+        for n in range(segment_length):
+            global_idx = start_idx + n
+            theta = (2 * np.pi * harmonic * n) / segment_length
+            sine_sum += channel_data[global_idx] * np.sin(theta)
+            cosine_sum += channel_data[global_idx] * np.cos(theta)
+        amplitude = np.sqrt((sine_sum / segment_length) ** 2 + (cosine_sum / segment_length) ** 2) * 4
+        phase = np.arctan2(cosine_sum, sine_sum) * (180.0 / np.pi)
+        if phase < 0:
+            phase += 360
+        amplitudes.append(amplitude)
+        phases.append(phase)
+    return np.array(amplitudes), np.array(phases)
+
+
+def make_frame(num_channels, samples=4096, sample_rate=4096, rpm=1800.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples) / sample_rate
+    shaft_hz = rpm / 60.0
+    phases = rng.uniform(0, 2 * np.pi, size=(num_channels, 1))
+    data = (np.sin(2 * np.pi * shaft_hz * t + phases)
+            + 0.3 * np.sin(2 * np.pi * 2 * shaft_hz * t + 2 * phases)
+            + 0.05 * rng.standard_normal((num_channels, samples)))
+    return data
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def bench_harmonics(num_channels=32):
+    data = make_frame(num_channels)
+    start_idx, end_idx = 37, 3999
+
+    legacy_time, legacy = timed(lambda: [legacy_harmonics(data[ch], start_idx, end_idx) for ch in range(num_channels)], 1)
+    vector_time, (amplitudes, phases) = timed(lambda: harmonic_components(data, start_idx, end_idx), 20)
+
+    legacy_amplitudes = np.array([a for a, _ in legacy])
+    legacy_phases = np.array([p for _, p in legacy])
+    print(f"Harmonics, {num_channels} channels x {end_idx - start_idx} samples x 3 orders")
+    print(f"  per-sample loop : {legacy_time * 1000:9.2f} ms/frame")
+    print(f"  vectorized      : {vector_time * 1000:9.2f} ms/frame ({legacy_time / vector_time:.0f}x)")
+    print(f"  max |amp diff|  : {np.max(np.abs(amplitudes - legacy_amplitudes)):.3e}")
+    print(f"  max |phase diff|: {np.max(np.abs(phases - legacy_phases)):.3e} deg")
+
+
+def bench_frame_cache(num_views=(1, 2, 4, 8), frames=50):
+    print("Shared spectra, 4 channels x 4096 samples, one FFT per channel per view")
+    for views in num_views:
+        cache = FrameCache()
+        start = time.perf_counter()
+        for f in range(frames):
+            frame = [list(ch) for ch in (make_frame(4, seed=f) * 1000 + 32768)]
+            for _ in range(views):
+                for ch in range(4):
+                    cache.spectrum(frame, ch, "Hamming", 4096, 0, 4096)
+        elapsed = (time.perf_counter() - start) / frames
+        stats = cache.stats()
+        print(f"  {views} views: {elapsed * 1000:7.2f} ms/frame, hit rate {stats['hitRate']:.2f}")
+    # FFT view (one channel per window) next to a Waterfall (all channels in one call)
+    cache = FrameCache()
+    for f in range(frames):
+        frame = list((make_frame(4, seed=f) * 1000 + 32768).astype(np.float32))
+        for ch in range(4):
+            cache.spectrum(frame, ch, None, 4096, 0, 4096)
+        cache.spectra(frame, 4, None, 4096, 0, 4096)
+    print(f"  4 FFT views + Waterfall: spectra hit rate {cache.stats()['hitRate']:.2f}")
+
+
+def make_adc_frame(num_channels=4, samples=4096, sample_rate=4096, rpm=1800.0, seed=0):
+    """uint16 frame as MQTTHandler receives it: main channels, tacho frequency, tacho trigger."""
+    counts = np.round(make_frame(num_channels, samples, sample_rate, rpm, seed) * 12000 + 32768).astype(np.uint16)
+    period = int(round(sample_rate * 60.0 / rpm))
+    trigger = ((np.arange(samples) % period) < 8).astype(np.uint16) * 4000
+    tacho_freq = np.full(samples, int(rpm / 60.0 * 100), dtype=np.uint16)
+    return np.vstack((counts, tacho_freq, trigger))
+
+
+def reference_revolutions(data, triggers, samples_per_rev=256):
+    """float64 np.interp version of order_tracking.resample_revolutions."""
+    samples = np.arange(data.shape[1])
+    return np.array([[np.interp(np.linspace(a, b, samples_per_rev, endpoint=False), samples, channel)
+                      for a, b in zip(triggers[:-1], triggers[1:])] for channel in data])
+
+
+def relative_error(result, reference):
+    return float(np.max(np.abs(np.asarray(result, dtype=float) - reference)) / (np.max(np.abs(reference)) or 1.0))
+
+
+def check_float32_accuracy(tolerance=1e-4):
+    """Compare the float32 pipeline stages against the same stages in float64."""
+    frame = make_adc_frame()
+    gain = 3.3 / 65535.0 / 25.4
+    coeffs, step_zi = design_fir(4096, (50.0, 200.0), pass_zero=False)
+    window = np.hamming(4096)
+    triggers = np.flatnonzero(np.diff((frame[-1] > 2000).astype(np.int8)) > 0)
+
+    single = frame.astype(np.float32)
+    double = frame.astype(np.float64)
+    checks = {
+        "calibration": (single[:4] * np.float32(gain), double[:4] * gain),
+        "band-pass FIR": (StreamingFIR(coeffs, step_zi).process(0, single[0] * np.float32(gain)),
+                          lfilter(coeffs, 1.0, double[0] * gain, zi=step_zi * double[0, 0] * gain)[0]),
+        "spectrum |X|": (np.abs(rfft(single[0] * window.astype(np.float32))), np.abs(rfft(double[0] * window))),
+        "1X/2X/3X amplitude": (harmonic_components(resample_revolutions(single[:4], triggers).mean(axis=1), 0, 256)[0],
+                               harmonic_components(reference_revolutions(double[:4], triggers).mean(axis=1), 0, 256)[0])
+    }
+    print(f"float32 pipeline vs float64, tolerance {tolerance:.0e} relative to full scale")
+    passed = True
+    for name, (result, reference) in checks.items():
+        error = relative_error(result, reference)
+        ok = error <= tolerance
+        passed &= ok
+        print(f"  {name:20s}: {error:.2e} {'ok' if ok else 'FAIL'}")
+    print(f"  frame footprint     : {single.nbytes // 1024} KiB float32 vs {double.nbytes // 1024} KiB float64")
+    return passed
+
+
+def bench_batched(channel_counts=(4, 16, 64), frames=20):
+    """Per-channel loop vs one (channels x samples) block: calibrate, 3 FIR bands, rfft, stats."""
+    bands = [design_fir(4096, 100.0), design_fir(4096, 200.0, pass_zero=False), design_fir(4096, (50.0, 200.0), pass_zero=False)]
+    print("Batched frame processing, 4096 samples per channel")
+    for count in channel_counts:
+        block = (make_frame(count) * 12000 + 32768).astype(np.float32)
+        gains = np.linspace(1e-5, 2e-5, count).astype(np.float32)
+
+        def per_channel(filters=[StreamingFIR(*band) for band in bands]):
+            for ch in range(count):
+                raw = block[ch] * gains[ch]
+                for fir in filters:
+                    fir.process(ch, raw)
+                np.abs(rfft(raw))
+                np.ptp(raw), np.sqrt(np.mean(np.square(raw))), np.mean(raw)
+
+        def batched(filters=[StreamingFIR(*band) for band in bands]):
+            raw = block * gains[:, None]
+            for fir in filters:
+                fir.process_block("frame", raw)
+            np.abs(rfft(raw, axis=1))
+            np.ptp(raw, axis=1), np.sqrt(np.mean(np.square(raw), axis=1)), np.mean(raw, axis=1)
+
+        loop_time, _ = timed(per_channel, frames)
+        block_time, _ = timed(batched, frames)
+        print(f"  {count:3d} channels: per-channel {loop_time * 1000:7.2f} ms, batched {block_time * 1000:7.2f} ms ({loop_time / block_time:.1f}x)")
+
+
+def bench_ring_buffer(window_seconds=(1, 10), sample_rate=4096, plots=6, frames=100):
+    """TimeView FIFO update per frame: np.roll of every data and time array vs RingBuffer.write."""
+    block = np.random.default_rng(0).random((plots, sample_rate)).astype(np.float32)
+    print(f"TimeView FIFO update, {plots} plots, {sample_rate} new samples per frame")
+    for seconds in window_seconds:
+        window = seconds * sample_rate
+
+        def rolled(data=[np.zeros(window) for _ in range(plots)], times=[np.arange(window) / sample_rate for _ in range(plots)]):
+            for ch in range(plots):
+                data[ch] = np.roll(data[ch], -sample_rate)
+                data[ch][-sample_rate:] = block[ch]
+                times[ch] = np.roll(times[ch], -sample_rate)
+                base_time = times[ch][-sample_rate - 1] if window > sample_rate else 0.0
+                times[ch][-sample_rate:] = base_time + np.arange(1, sample_rate + 1) / sample_rate
+
+        ring = RingBuffer(plots, window, 1.0 / sample_rate)
+        roll_time, _ = timed(rolled, frames)
+        ring_time, _ = timed(lambda: ring.write(block), frames)
+        print(f"  {seconds:2d} s window: np.roll {roll_time * 1e6:7.0f} us, ring buffer {ring_time * 1e6:5.0f} us")
+
+
+def bench_envelope(window_seconds=(1, 10), sample_rate=4096, columns=1000, frames=100):
+    """Points handed to setData per plot and refresh: the whole window vs its min/max envelope."""
+    rng = np.random.default_rng(0)
+    print(f"TimeView plot decimation, {columns} pixel columns")
+    for seconds in window_seconds:
+        data = rng.standard_normal(seconds * sample_rate).astype(np.float32)
+        data[len(data) // 3] = 25.0  # A one-sample spike must survive decimation
+        envelope_time, (indices, values) = timed(lambda: minmax_envelope(data, 0, len(data), columns), frames)
+        assert values.max() == data.max() and values.min() == data.min()
+        print(f"  {seconds:2d} s window: {len(data):6d} points -> {len(values):5d} points, envelope {envelope_time * 1e6:4.0f} us")
+
+
+def import_time(module_name):
+    """Seconds to import module_name in a fresh interpreter, or the error if it cannot load."""
+    code = f"import time; t = time.perf_counter(); import {module_name}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    return float(result.stdout), None
+
+
+def bench_startup_imports():
+    """Cold import cost of what the login window used to wait for, and what it loads now."""
+    from features.registry import FEATURE_MODULES, WARMUP_MODULES
+    print("Cold imports before the login window can paint")
+    before = ["dashboard.dashboard_window"] + WARMUP_MODULES + [module for module, _ in FEATURE_MODULES.values()]
+    for label, module_name in [("auth (login window)", "auth"), ("all features (previously eager)", "; import ".join(before))]:
+        seconds, error = import_time(module_name)
+        print(f"  {label}: " + (f"{seconds * 1000:6.0f} ms" if error is None else f"skipped ({error})"))
+    for module_name in WARMUP_MODULES:
+        seconds, error = import_time(module_name)
+        print(f"    {module_name}: " + (f"{seconds * 1000:6.0f} ms" if error is None else f"skipped ({error})"))
+
+
+if __name__ == "__main__":
+    bench_harmonics()
+    bench_frame_cache()
+    bench_batched()
+    bench_ring_buffer()
+    bench_envelope()
+    bench_startup_imports()
+    check_float32_accuracy()
@@ -1,10 +1,25 @@
-from PyQt5.QtWidgets import QWidget, QHBoxLayout, QTextEdit, QPushButton, QSizePolicy
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPlainTextEdit, QPushButton, QSizePolicy
+from PyQt5.QtCore import pyqtSignal, QTimer
+from collections import deque
 import logging
+from lazy_log import lazy_log
 
 class Console(QWidget):
+    # Features log from compute-stage worker threads; the signal hops to the GUI thread
+    message_posted = pyqtSignal(str)
+
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
+        self.max_lines = 1000  # The view keeps only the newest lines
+        self.pending = deque(maxlen=self.max_lines)  # Posted but not yet shown
+        self.message_posted.connect(self.show_message)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(100)
+        self.flush_timer.timeout.connect(self.flush_messages)
+        lazy_log.add_sink(self.on_log_record)
+        self.destroyed.connect(lambda *args, sink=self.on_log_record: lazy_log.remove_sink(sink))
         self.initUI()
         self.minimize_console()  # Set initial state to minimized
 
@@ -59,11 +74,12 @@ class Console(QWidget):
         """)
         button_layout.addWidget(self.maximize_button)
 
-        self.console_message_area = QTextEdit()
+        self.console_message_area = QPlainTextEdit()
         self.console_message_area.setReadOnly(True)
+        self.console_message_area.setMaximumBlockCount(self.max_lines)
         self.console_message_area.setFixedHeight(200)
         self.console_message_area.setStyleSheet("""
-            QTextEdit { 
+            QPlainTextEdit { 
                 background-color: #0a0a0a; 
                 color: #e0e0e0; 
                 border: none; 
@@ -77,12 +93,34 @@ class Console(QWidget):
         self.maximize_button.show()
         self.minimize_button.hide()
 
-    def append_to_console(self, text):
-        if "MQTT" in text or "mqtt" in text or "layout" in text.lower():
-            logging.info(text)
-            if self.console_message_area.isVisible():
-                self.console_message_area.append(text)
-                self.console_message_area.ensureCursorVisible()
+    def append_to_console(self, text, category=None, level=logging.INFO):
+        """Safe to call from any thread.
+
+        The text goes through lazy_log, so it is shown only if its category is enabled at
+        level. Without a category, text mentioning MQTT or layout is filed under those and
+        everything else under "console", which is hidden below WARNING by default.
+        Per-frame callers should use lazy_log directly so the text is not even built.
+        """
+        if category is None:
+            lowered = text.lower()
+            category = "mqtt" if "mqtt" in lowered else "layout" if "layout" in lowered else "console"
+        lazy_log.log(category, level, text)
+
+    def on_log_record(self, category, level, text):
+        self.message_posted.emit(text)
+
+    def show_message(self, text):
+        # Lines are batched into one append per flush; the deque drops the oldest meanwhile
+        self.pending.append(text)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_messages(self):
+        if not self.pending or not self.console_message_area.isVisible():
+            return  # Kept until the console is shown
+        lines, self.pending = list(self.pending), deque(maxlen=self.max_lines)
+        self.console_message_area.appendPlainText("\n".join(lines))
+        self.console_message_area.ensureCursorVisible()
 
     def clear_console(self):
         try:
@@ -131,6 +169,7 @@ class Console(QWidget):
             self.maximize_button.hide()
 
             self.parent.console_container.setFixedHeight(200)  
+            self.flush_messages()
             logging.info("Console maximized")
         except Exception as e:
             logging.error(f"Error maximizing console: {str(e)}")
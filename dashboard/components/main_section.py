@@ -1,15 +1,24 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QMdiArea, QScrollArea, QMdiSubWindow
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QRect, QTimer, QEvent, pyqtSignal
 import logging
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class MainSection(QWidget):
+    # (subwindow, visible): emitted when a subwindow scrolls or is dragged into or out of
+    # view, is minimized or restored, or is covered or uncovered by a maximized sibling
+    subwindow_visibility_changed = pyqtSignal(object, bool)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.current_widget = None
         self.current_layout = "2x2"
+        self.visibility = {}  # QMdiSubWindow -> whether any of it is on screen
+        self.visibility_timer = QTimer(self)
+        self.visibility_timer.setSingleShot(True)
+        self.visibility_timer.setInterval(50)  # Coalesces scroll and resize bursts
+        self.visibility_timer.timeout.connect(self.update_visibility)
         self.initUI()
 
     def initUI(self):
@@ -67,6 +76,8 @@ class MainSection(QWidget):
         self.mdi_area.setActivationOrder(QMdiArea.ActivationHistoryOrder)
 
         self.scroll_area.setWidget(self.mdi_area)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_visibility_update)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.schedule_visibility_update)
         self.layout.addWidget(self.scroll_area)
         self.setLayout(self.layout)
 
@@ -75,6 +86,7 @@ class MainSection(QWidget):
         self.current_widget = widget
         self.layout.addWidget(widget)
         self.scroll_area.hide()
+        self.schedule_visibility_update()
         logging.debug(f"Set widget in MainSection: {type(widget).__name__}")
 
     def add_subwindow(self, widget, feature_name, channel_name=None, model_name=None):
@@ -88,6 +100,8 @@ class MainSection(QWidget):
             subwindow.setWindowTitle(title)
             self.mdi_area.addSubWindow(subwindow)
             subwindow.showNormal()
+            self.visibility[subwindow] = True
+            subwindow.installEventFilter(self)  # Dragging or resizing it can change what is on screen
 
             # Connect to window state change signal to handle maximize/restore
             subwindow.windowStateChanged.connect(self.on_window_state_changed)
@@ -107,6 +121,7 @@ class MainSection(QWidget):
                     subwindow.windowStateChanged.disconnect()
                 except:
                     pass
+                subwindow.removeEventFilter(self)
                 subwindow.close()
                 self.mdi_area.removeSubWindow(subwindow)
                 widget = subwindow.widget()
@@ -124,6 +139,7 @@ class MainSection(QWidget):
                 self.current_widget.deleteLater()
                 self.current_widget = None
 
+            self.visibility.clear()
             self.scroll_area.show()
             self.mdi_area.update()
             logging.debug("Cleared all subwindows and custom widget")
@@ -133,6 +149,7 @@ class MainSection(QWidget):
     def on_window_state_changed(self, old_state, new_state):
         """Handle subwindow state changes (e.g., maximize, restore)."""
         try:
+            self.schedule_visibility_update()
             if (old_state & Qt.WindowMaximized) and not (new_state & Qt.WindowMaximized):
                 # Subwindow was restored from maximized state
                 self.arrange_layout()
@@ -190,6 +207,7 @@ class MainSection(QWidget):
             total_height = total_rows_needed * (subwindow_height + GAP) + GAP
             self.mdi_area.setMinimumSize(total_width, total_height)
             self.mdi_area.update()
+            self.schedule_visibility_update()
 
             logging.info(
                 f"Arranged {len(subwindows)} MDI subwindows in a {self.current_layout} grid: "
@@ -197,4 +215,52 @@ class MainSection(QWidget):
                 f"Total size ({total_width}x{total_height})"
             )
         except Exception as e:
-            logging.error(f"Error in arrange_layout: {str(e)}")
\ No newline at end of file
+            logging.error(f"Error in arrange_layout: {str(e)}")
+
+    def schedule_visibility_update(self, *args):
+        if not self.visibility_timer.isActive():
+            self.visibility_timer.start()
+
+    def is_subwindow_visible(self, subwindow):
+        return self.visibility.get(subwindow, True)
+
+    def update_visibility(self):
+        """Work out which subwindows are on screen and signal those whose state changed."""
+        try:
+            subwindows = self.mdi_area.subWindowList()
+            on_screen = self.isVisible() and self.scroll_area.isVisible() and not self.window().isMinimized()
+            maximized = next((sw for sw in subwindows if sw.isMaximized() and sw.isVisible()), None)
+            # The MDI area scrolls inside scroll_area; this is its on-screen part in MDI coordinates
+            visible_rect = QRect(-self.mdi_area.pos(), self.scroll_area.viewport().size())
+            visibility = {}
+            for subwindow in subwindows:
+                if not on_screen or subwindow.isMinimized() or not subwindow.isVisible():
+                    visible = False
+                elif maximized is not None and subwindow is not maximized:
+                    visible = False
+                else:
+                    visible = subwindow.geometry().intersects(visible_rect)
+                visibility[subwindow] = visible
+                if self.visibility.get(subwindow, True) != visible:
+                    self.subwindow_visibility_changed.emit(subwindow, visible)
+                    logging.debug(f"Subwindow {subwindow.windowTitle()} {'shown' if visible else 'hidden'}")
+            self.visibility = visibility
+        except Exception as e:
+            logging.error(f"Error in update_visibility: {str(e)}")
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Move, QEvent.Resize) and obj in self.visibility:
+            self.schedule_visibility_update()
+        return super().eventFilter(obj, event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_visibility_update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_visibility_update()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.schedule_visibility_update()
@@ -608,13 +608,17 @@
 
 from PyQt5.QtWidgets import (
     QToolBar, QAction, QWidget, QHBoxLayout, QSizePolicy, QLineEdit,
-    QLabel, QDialog, QVBoxLayout, QPushButton, QGridLayout, QComboBox, QMessageBox
+    QLabel, QDialog, QVBoxLayout, QPushButton, QGridLayout, QComboBox, QMessageBox,
+    QFileDialog, QProgressDialog, QApplication
 )
 from PyQt5.QtCore import QSize, Qt, QTimer
 from PyQt5.QtGui import QIcon
+import os
 import logging
 import re
 from datetime import datetime
+from recording_cache import recording_cache
+from recording_archive import export_recording, import_recording, MANIFEST_NAME
 
 class LayoutSelectionDialog(QDialog):
     def __init__(self, parent=None, current_layout=None):
@@ -876,6 +880,12 @@ class SubToolBar(QWidget):
         add_action("🔌", "#ffffff", self.parent.disconnect_mqtt, "Disconnect from MQTT", disconnect_enabled, disconnect_bg)
         self.toolbar.addSeparator()
 
+        archive_enabled = bool(self.parent.current_project)
+        archive_bg = "#1e88e5" if archive_enabled else "#546e7a"
+        add_action("📤", "#ffffff", self.export_saved_file, "Export selected saved file to a folder", archive_enabled, archive_bg)
+        add_action("📥", "#ffffff", self.import_saved_file, "Import a saved file from an exported folder", archive_enabled, archive_bg)
+        self.toolbar.addSeparator()
+
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.toolbar.addWidget(spacer)
@@ -1043,6 +1053,7 @@ class SubToolBar(QWidget):
 
             success, msg = self.parent.db.save_feature_message(self.parent.current_project, model_name, feature_name, message_data)
             if success:
+                recording_cache.invalidate(self.parent.current_project, model_name, feature_name, filename)
                 self.parent.console.append_to_console(f"Saved data to {filename} for {feature_name}")
                 self.cached_filenames.append(filename)
                 self.refresh_saved_files()
@@ -1059,10 +1070,12 @@ class SubToolBar(QWidget):
                 if not hasattr(feature_instance, 'fifo_data') or not hasattr(feature_instance, 'main_channels'):
                     logging.warning(f"Feature {feature_name} lacks required attributes for data collection")
                     return {}
+                # tolist() gives plain floats; BSON cannot encode the ring buffer's np.float32 elements
+                fifo_data = feature_instance.fifo_data
                 data = {
-                    "channel_data": [list(data) for data in feature_instance.fifo_data[:feature_instance.main_channels]],
-                    "tacho_freq": list(feature_instance.fifo_data[feature_instance.main_channels]) if feature_instance.tacho_channels_count >= 1 else [],
-                    "tacho_trigger": list(feature_instance.fifo_data[feature_instance.main_channels + 1]) if feature_instance.tacho_channels_count >= 2 else [],
+                    "channel_data": [row.tolist() for row in fifo_data[:feature_instance.main_channels]],
+                    "tacho_freq": fifo_data[feature_instance.main_channels].tolist() if feature_instance.tacho_channels_count >= 1 else [],
+                    "tacho_trigger": fifo_data[feature_instance.main_channels + 1].tolist() if feature_instance.tacho_channels_count >= 2 else [],
                     "tacho_channels_count": feature_instance.tacho_channels_count
                 }
                 return data if any(data["channel_data"]) else {}
@@ -1178,6 +1191,66 @@ class SubToolBar(QWidget):
             self.parent.console.append_to_console(f"Error loading saved file {text}: {str(e)}")
             QMessageBox.warning(self, "Error", f"Error loading saved file {text}: {str(e)}")
 
+    def archive_progress(self, title, label):
+        """QProgressDialog and a (done, total) callback that keeps the window responsive."""
+        dialog = QProgressDialog(label, None, 0, 100, self)
+        dialog.setWindowTitle(title)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+
+        def progress(done, total):
+            dialog.setMaximum(max(total, 1))
+            dialog.setValue(done)
+            QApplication.processEvents()
+        return dialog, progress
+
+    def export_saved_file(self):
+        model_name = self.parent.tree_view.get_selected_model() if self.parent.tree_view else None
+        feature_name = self.parent.current_feature
+        if not self.selected_saved_file or not model_name or not feature_name:
+            QMessageBox.warning(self, "Error", "Please select a feature, model and saved file to export")
+            return
+        parent_dir = QFileDialog.getExistingDirectory(self, "Export Saved File To")
+        if not parent_dir:
+            return
+        out_dir = os.path.join(parent_dir, re.sub(r'[^\w.-]', '_', self.selected_saved_file))
+        dialog, progress = self.archive_progress("Export", f"Exporting {self.selected_saved_file}...")
+        try:
+            manifest_path = export_recording(self.parent.db, self.parent.current_project, model_name, feature_name,
+                                             self.selected_saved_file, out_dir, progress=progress)
+        except Exception as e:
+            manifest_path = None
+            logging.error(f"SubToolBar: Error exporting {self.selected_saved_file}: {str(e)}")
+        finally:
+            dialog.close()
+        if manifest_path:
+            self.parent.console.append_to_console(f"Exported {self.selected_saved_file} to {out_dir}")
+        else:
+            QMessageBox.warning(self, "Error", f"Failed to export {self.selected_saved_file}")
+
+    def import_saved_file(self):
+        model_name = self.parent.tree_view.get_selected_model() if self.parent.tree_view else None
+        archive_dir = QFileDialog.getExistingDirectory(self, "Import Saved File From")
+        if not archive_dir:
+            return
+        if not os.path.exists(os.path.join(archive_dir, MANIFEST_NAME)):
+            QMessageBox.warning(self, "Error", "The selected folder is not an exported saved file")
+            return
+        dialog, progress = self.archive_progress("Import", "Importing saved file...")
+        try:
+            success, msg = import_recording(self.parent.db, archive_dir, project_name=self.parent.current_project,
+                                            model_name=model_name, progress=progress)
+        except Exception as e:
+            logging.error(f"SubToolBar: Error importing {archive_dir}: {str(e)}")
+            success, msg = False, f"Failed to import {archive_dir}: {str(e)}"
+        finally:
+            dialog.close()
+        self.parent.console.append_to_console(msg)
+        if success:
+            self.refresh_saved_files()
+        else:
+            QMessageBox.warning(self, "Error", msg)
+
     def show_layout_menu(self):
         dialog = LayoutSelectionDialog(self, current_layout=self.selected_layout)
         parent_geom = self.parent.geometry()
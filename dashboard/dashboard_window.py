@@ -13,19 +13,10 @@ from dashboard.components.tree_view import TreeView
 from dashboard.components.console import Console
 from dashboard.components.mqtt_status import MQTTStatus
 from mqtthandler import MQTTHandler
-from features.tabular_view import TabularViewFeature
-from features.polar import PolarPlotFeature
-from features.time_view import TimeViewFeature
-from features.fft_view import FFTViewFeature
-from features.waterfall import WaterfallFeature
-from features.centerline import CenterLineFeature
-from features.orbit import OrbitFeature
-from features.trend_view import TrendViewFeature
-from features.multi_trend import MultiTrendFeature
-from features.bode_plot import BodePlotFeature
-from features.history_plot import HistoryPlotFeature
-from features.time_report import TimeReportFeature
-from features.report import ReportFeature
+from features.registry import feature_registry
+from features.compute_stage import ComputeStage, Frame
+from lazy_log import lazy_log
+from startup_timeline import startup_timeline
 from select_project import SelectProjectWidget
 from create_project import CreateProjectWidget
 from project_structure import ProjectStructureWidget
@@ -44,6 +35,7 @@ class DashboardWindow(QWidget):
         self.current_feature = None
         self.mqtt_handler = None
         self.feature_instances = {}
+        self.compute_stage = ComputeStage(self)
         self.sub_windows = {}
         self.timer = QTimer(self)
         self.timer.setSingleShot(True)
@@ -153,6 +145,7 @@ class DashboardWindow(QWidget):
         right_layout.addWidget(self.sub_tool_bar)
 
         self.main_section = MainSection(self)
+        self.main_section.subwindow_visibility_changed.connect(self.on_subwindow_visibility_changed)
         right_layout.addWidget(self.main_section, 1)
 
         self.main_splitter.addWidget(right_container)
@@ -176,7 +169,14 @@ class DashboardWindow(QWidget):
         main_layout.addWidget(self.console_container)
 
     def deferred_initialization(self):
-        projects = self.db.load_projects()
+        if self.db.projects_loaded:
+            projects = self.db.projects  # Loaded by the auth worker during login
+        else:
+            with startup_timeline.span("load_projects"):
+                projects = self.db.load_projects()
+        startup_project = startup_timeline.options.project
+        if startup_project and not self.current_project and startup_project in (projects or []):
+            self.current_project = startup_project
         if projects and self.current_project:
             self.load_project(self.current_project)
         else:
@@ -227,6 +227,7 @@ class DashboardWindow(QWidget):
             self.project_structure_widget = None
             logging.debug("ProjectStructureWidget removed from MainSection")
         self.load_project_features()
+        startup_timeline.mark("project_loaded", project=project_name)
         QTimer.singleShot(0, self.setup_mqtt)
 
     def setup_mqtt(self):
@@ -238,10 +239,16 @@ class DashboardWindow(QWidget):
         try:
             tags = self.get_project_tags()
             if tags:
-                self.mqtt_handler = MQTTHandler(self.db, self.current_project)
+                broker = startup_timeline.options.broker
+                if broker:
+                    host, _, port = broker.partition(":")
+                    self.mqtt_handler = MQTTHandler(self.db, self.current_project, broker=host, port=int(port or 1883))
+                else:
+                    self.mqtt_handler = MQTTHandler(self.db, self.current_project)
                 self.mqtt_handler.data_received.connect(self.on_data_received)
                 self.mqtt_handler.connection_status.connect(self.on_mqtt_status)
                 self.mqtt_handler.start()
+                startup_timeline.mark("mqtt_started")
                 logging.info(f"MQTT setup initiated for project: {self.current_project}")
                 self.console.append_to_console(f"MQTT setup initiated for project: {self.current_project}")
             else:
@@ -315,24 +322,31 @@ class DashboardWindow(QWidget):
             self.console.append_to_console(f"Failed to disconnect MQTT: {str(e)}")
             self.mqtt_status.update_mqtt_status_indicator()
 
-    def on_data_received(self, feature_name, tag_name, model_name, values, sample_rate):
+    def on_data_received(self, tag_name, model_name, values, sample_rate):
         try:
-            # Update only the relevant feature instances
-            for key, feature_instance in self.feature_instances.items():
+            # Every open feature of the model receives the same frame object, so products
+            # derived from it (see features.frame_cache) are computed once per frame.
+            frame = Frame(tag_name, model_name, values, sample_rate)
+            startup_timeline.mark("first_frame", model=model_name)
+            for key, feature_instance in list(self.feature_instances.items()):
                 instance_feature, instance_model, instance_channel, _ = key
-                if instance_feature == feature_name and instance_model == model_name and hasattr(feature_instance, 'on_data_received'):
-                    QTimer.singleShot(0, lambda: self._update_feature(
-                        instance_feature, instance_model, instance_channel, 
-                        feature_instance, tag_name, values, sample_rate
+                if instance_model != model_name:
+                    continue
+                if hasattr(feature_instance, 'compute') and hasattr(feature_instance, 'render'):
+                    # DSP runs on the compute stage workers; only render() runs on this thread
+                    self.compute_stage.submit(key, feature_instance, frame)
+                elif hasattr(feature_instance, 'on_data_received'):
+                    QTimer.singleShot(0, lambda f=instance_feature, m=instance_model, c=instance_channel, inst=feature_instance: self._update_feature(
+                        f, m, c, inst, tag_name, values, sample_rate
                     ))
         except Exception as e:
-            logging.error(f"Error in on_data_received for {feature_name}: {str(e)}")
-            self.console.append_to_console(f"Error processing data for {feature_name}: {str(e)}")
+            logging.error(f"Error in on_data_received for {model_name}: {str(e)}")
+            self.console.append_to_console(f"Error processing data for {model_name}: {str(e)}")
 
     def _update_feature(self, feature_name, model_name, channel, feature_instance, tag_name, values, sample_rate):
         try:
             feature_instance.on_data_received(tag_name, model_name, values, sample_rate)
-            logging.debug(f"Updated feature {feature_name}/{model_name}/{channel or 'No Channel'}")
+            lazy_log.debug("features", lambda: f"Updated feature {feature_name}/{model_name}/{channel or 'No Channel'}")
         except Exception as e:
             logging.error(f"Error updating feature {feature_name}/{model_name}/{channel or 'No Channel'}: {str(e)}")
 
@@ -430,7 +444,7 @@ class DashboardWindow(QWidget):
                 logging.error(f"Error deleting project: {str(e)}")
                 QMessageBox.warning(self, "Error", f"Error deleting project: {str(e)}")
 
-    def display_feature_content(self, feature_name, project_name):
+    def display_feature_content(self, feature_name, project_name, filename=None):
         try:
             logging.debug(f"Attempting to display feature: {feature_name} for project: {project_name}")
             self.current_project = project_name
@@ -466,27 +480,18 @@ class DashboardWindow(QWidget):
                 logging.warning(f"No channel selected for {feature_name} in model {selected_model}")
                 return
 
-            feature_classes = {
-                "Tabular View": TabularViewFeature,
-                "Time View": TimeViewFeature,
-                "Time Report": TimeReportFeature,
-                "FFT": FFTViewFeature,
-                "Waterfall": WaterfallFeature,
-                "Centerline": CenterLineFeature,
-                "Orbit": OrbitFeature,
-                "Trend View": TrendViewFeature,
-                "Multiple Trend View": MultiTrendFeature,
-                "Bode Plot": BodePlotFeature,
-                "History Plot": HistoryPlotFeature,
-                "Polar Plot": PolarPlotFeature,
-                "Report": ReportFeature
-            }
-
-            if feature_name not in feature_classes:
+            if feature_name not in feature_registry:
                 logging.warning(f"Unknown feature: {feature_name}")
                 QMessageBox.warning(self, "Error", f"Unknown feature: {feature_name}")
                 return
 
+            try:
+                feature_class = feature_registry.get(feature_name)
+            except Exception as e:
+                logging.error(f"Failed to import feature {feature_name}: {str(e)}")
+                QMessageBox.warning(self, "Error", f"Failed to load {feature_name}: {str(e)}")
+                return
+
             for channel in channels:
                 import time
                 unique_id = int(time.time() * 1000)
@@ -495,10 +500,10 @@ class DashboardWindow(QWidget):
                 try:
                     if not self.db.is_connected():
                         self.db.reconnect()
-                    feature_instance = feature_classes[feature_name](
-                        self, self.db, project_name, channel=channel, 
-                        model_name=selected_model, console=self.console
-                    )
+                    feature_kwargs = {"channel": channel, "model_name": selected_model, "console": self.console}
+                    if filename and feature_name in ["Time View", "Time Report"]:
+                        feature_kwargs["filename"] = filename
+                    feature_instance = feature_class(self, self.db, project_name, **feature_kwargs)
                     self.feature_instances[key] = feature_instance
                     widget = feature_instance.get_widget()
                     if widget:
@@ -535,6 +540,20 @@ class DashboardWindow(QWidget):
             logging.error(f"Error displaying feature content: {str(e)}")
             QMessageBox.warning(self, "Error", f"Error displaying feature: {str(e)}")
 
+    def on_subwindow_visibility_changed(self, sub_window, visible):
+        """Pause rendering of features that are off screen and let them catch up when shown."""
+        key = next((k for k, sw in self.sub_windows.items() if sw is sub_window), None)
+        if key is None:
+            return
+        self.compute_stage.set_visible(key, visible)
+        instance = self.feature_instances.get(key)
+        if instance is not None and hasattr(instance, 'set_visible'):
+            try:
+                instance.set_visible(visible)
+            except Exception as e:
+                logging.error(f"Error changing visibility of {key}: {str(e)}")
+        logging.debug(f"Feature {key} {'visible' if visible else 'hidden'}")
+
     def on_subwindow_closed(self, event, key):
         try:
             feature_name, model_name, channel_name, unique_id = key
@@ -557,6 +576,7 @@ class DashboardWindow(QWidget):
                         instance.cleanup()
                     except Exception as e:
                         logging.error(f"Error in cleanup for {key}: {str(e)}")
+                self.compute_stage.remove(key)
                 widget = instance.get_widget()
                 if widget:
                     try:
@@ -657,6 +677,7 @@ class DashboardWindow(QWidget):
                     instance = self.feature_instances[key]
                     if hasattr(instance, 'cleanup'):
                         instance.cleanup()
+                    self.compute_stage.remove(key)
                     widget = instance.get_widget()
                     if widget:
                         widget.hide()
@@ -697,6 +718,8 @@ class DashboardWindow(QWidget):
                 self.timer.stop()
             self.cleanup_mqtt()
             self.clear_content_layout()
+            logging.info(f"Compute stage metrics: {self.compute_stage.stats()}")
+            self.compute_stage.shutdown()
             if self.db and self.db.is_connected():
                 self.db.close_connection()
             app = QApplication.instance()
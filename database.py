@@ -3,6 +3,7 @@ import datetime
 from bson.objectid import ObjectId
 import logging
 import re
+from startup_timeline import startup_timeline
 
 class Database:
     def __init__(self, connection_string="mongodb://localhost:27017/", email="user@example.com"):
@@ -14,17 +15,22 @@ class Database:
         self.projects_collection = None
         self.messages_collection = None
         self.feature_collection = None
+        self.projects = []
+        self.projects_loaded = False  # load_projects() has run; the dashboard reuses its list
         self.connect()
 
     def connect(self):
         try:
             self.client = MongoClient(self.connection_string, serverSelectionTimeoutMS=5000)
-            self.client.server_info()
+            with startup_timeline.span("mongo_server_info"):
+                self.client.server_info()
             self.db = self.client["changed_db"]
             self.projects_collection = self.db["projects"]
             self.messages_collection = self.db["mqttmessage"]
             self.feature_collection = self.db["feature_messages"]
-            self._create_feature_indexes()
+            with startup_timeline.span("create_indexes"):
+                self._create_feature_indexes()
+                self._create_message_indexes()
             logging.info(f"Database initialized for {self.email}")
         except Exception as e:
             logging.error(f"Failed to connect to MongoDB: {str(e)}")
@@ -60,6 +66,19 @@ class Database:
         except Exception as e:
             logging.error(f"Failed to create indexes for feature_messages: {str(e)}")
 
+    def _create_message_indexes(self):
+        try:
+            self.messages_collection.create_index([
+                ("email", ASCENDING),
+                ("project_name", ASCENDING),
+                ("model_name", ASCENDING),
+                ("tag_name", ASCENDING),
+                ("timestamp", ASCENDING)
+            ])
+            logging.info("Indexes created for mqttmessage collection")
+        except Exception as e:
+            logging.error(f"Failed to create indexes for mqttmessage: {str(e)}")
+
     def close_connection(self):
         if self.client:
             try:
@@ -80,6 +99,7 @@ class Database:
                 project_name = project.get("project_name")
                 if project_name and project_name not in self.projects:
                     self.projects.append(project_name)
+            self.projects_loaded = True
             logging.info(f"Loaded projects: {self.projects}")
             return self.projects
         except Exception as e:
@@ -339,11 +359,22 @@ class Database:
         logging.debug(f"Received {len(values)} values for {tag_name} in {project_name}/{model_name} at {timestamp_str}")
         return True, "Tag values received but not saved to mqttmessage collection"
 
-    def get_tag_values(self, project_name, model_name, tag_name):
+    def get_tag_values(self, project_name, model_name, tag_name, start=None, end=None, max_points=None):
+        """Fetch messages in [start, end]; with max_points, return at most that many min/max/avg buckets."""
+        query = {"email": self.email, "project_name": project_name, "model_name": model_name, "tag_name": tag_name}
+        time_range = {}
+        if start is not None:
+            time_range["$gte"] = start.isoformat() if isinstance(start, datetime.datetime) else start
+        if end is not None:
+            time_range["$lte"] = end.isoformat() if isinstance(end, datetime.datetime) else end
+        if time_range:
+            query["timestamp"] = time_range
+
+        if max_points:
+            return self._get_downsampled_tag_values(query, int(max_points))
+
         try:
-            messages = list(self.messages_collection.find(
-                {"project_name": project_name, "model_name": model_name, "tag_name": tag_name, "email": self.email}
-            ).sort("timestamp", 1))
+            messages = list(self.messages_collection.find(query).sort("timestamp", 1))
             if not messages:
                 logging.debug(f"No messages found for {tag_name} in {project_name}/{model_name}")
                 return []
@@ -360,6 +391,61 @@ class Database:
             logging.error(f"Error fetching tag values for {tag_name} in {project_name}/{model_name}: {str(e)}")
             return []
 
+    def get_latest_tag_value(self, project_name, model_name, tag_name):
+        """Newest message of a tag, or None; walks the (..., timestamp) index backwards instead of reading the history."""
+        query = {"email": self.email, "project_name": project_name, "model_name": model_name, "tag_name": tag_name}
+        try:
+            return self.messages_collection.find_one(query, sort=[("timestamp", -1)])
+        except Exception as e:
+            logging.error(f"Error fetching latest value of {tag_name} in {project_name}/{model_name}: {str(e)}")
+            return None
+
+    def _get_downsampled_tag_values(self, query, max_points):
+        pipeline = [
+            {"$match": query},
+            # $bucketAuto sorts by its groupBy itself, so no $sort stage is needed
+            {"$project": {
+                "timestamp": 1,
+                "min": {"$min": "$values"},
+                "max": {"$max": "$values"},
+                "sum": {"$sum": "$values"},
+                "count": {"$size": {"$ifNull": ["$values", []]}}
+            }},
+            {"$bucketAuto": {
+                "groupBy": "$timestamp",
+                "buckets": max_points,
+                "output": {
+                    "min": {"$min": "$min"},
+                    "max": {"$max": "$max"},
+                    "sum": {"$sum": "$sum"},
+                    "count": {"$sum": "$count"},
+                    "messages": {"$sum": 1}
+                }
+            }},
+            # Mean over every sample of the bucket, so longer messages weigh more than short ones
+            {"$addFields": {
+                "avg": {"$cond": [{"$gt": ["$count", 0]}, {"$divide": ["$sum", "$count"]}, None]}
+            }},
+            {"$project": {
+                "_id": 0,
+                "timestamp": "$_id.min",
+                "end_timestamp": "$_id.max",
+                "min": 1,
+                "max": 1,
+                "avg": 1,
+                "count": 1,
+                "messages": 1,
+                "values": ["$avg"]
+            }}
+        ]
+        try:
+            buckets = list(self.messages_collection.aggregate(pipeline, allowDiskUse=True))
+            logging.debug(f"Retrieved {len(buckets)} buckets for {query['tag_name']} in {query['project_name']}/{query['model_name']}")
+            return buckets
+        except Exception as e:
+            logging.error(f"Error fetching downsampled tag values for {query['tag_name']}: {str(e)}")
+            return []
+
     def save_tag_values(self, project_name, model_name, tag_name, data):
         if not self.get_project_data(project_name):
             logging.error(f"Project {project_name} not found!")
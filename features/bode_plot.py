@@ -1,29 +1,58 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 import pyqtgraph as pg
 import numpy as np
+import logging
+import threading
+from collections import deque
+from features.order_tracking import track_frame
+from features.compute_stage import Frame
+from lazy_log import lazy_log
 
 class BodePlotFeature:
+    """Run-up / coast-down Bode plot: 1X amplitude and phase against shaft speed.
+
+    Every frame yields one (RPM, amplitude, phase) point taken from the order-tracked
+    revolutions of the frame, so the cost is O(N) per frame and the history is bounded
+    by max_points.
+    """
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None):
         self.parent = parent
         self.db = db
         self.project_name = project_name
-        # self.channel = int(channel) if channel is not None else None  # Convert channel to int
-        self.channel=channel
+        self.channel = channel
         self.model_name = model_name
         self.console = console
         self.widget = None
         self.plot_widget = None
         self.mag_plot = None
         self.phase_plot = None
+        self.mag_curve = None
+        self.phase_curve = None
+        self.status_label = None
+        self.channel_index = None
+        self.scaling_factor = 3.3 / 65535.0  # ADC counts to volts
+        self.max_points = 2000
+        self.rpm_resolution = 5.0  # Points closer than this in RPM replace the previous one
+        self.points = deque(maxlen=self.max_points)
+        self.points_lock = threading.Lock()  # compute() adds points on a worker, clear_points() runs on the GUI thread
         self.initUI()
+        self.resolve_channel_index()
 
     def initUI(self):
         self.widget = QWidget()
         layout = QVBoxLayout()
         self.widget.setLayout(layout)
 
+        header_layout = QHBoxLayout()
         label = QLabel(f"Bode Plot for Model: {self.model_name}, Channel: {self.channel}")
-        layout.addWidget(label)
+        header_layout.addWidget(label)
+        self.status_label = QLabel("Waiting for tacho triggers...")
+        header_layout.addWidget(self.status_label)
+        header_layout.addStretch()
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear_points)
+        header_layout.addWidget(clear_button)
+        layout.addLayout(header_layout)
 
         # Create and add the pyqtgraph PlotWidget
         self.plot_widget = pg.PlotWidget()
@@ -38,20 +67,22 @@ class BodePlotFeature:
 
         # Magnitude plot
         self.mag_plot = self.layout.addPlot(row=0, col=0)
-        self.mag_plot.setTitle("Bode Plot - Magnitude")
-        self.mag_plot.setLabel('left', "Magnitude (dB)")
-        self.mag_plot.setLabel('bottom', "Frequency (Hz)")
-        self.mag_plot.setLogMode(x=True, y=False)
+        self.mag_plot.setTitle("Bode Plot - 1X Amplitude")
+        self.mag_plot.setLabel('left', "Amplitude (V pk-pk)")
+        self.mag_plot.setLabel('bottom', "Speed (RPM)")
         self.mag_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.mag_curve = self.mag_plot.plot(pen='b', symbol='o', symbolSize=4, symbolBrush='b')
 
         # Phase plot
         self.layout.nextRow()
         self.phase_plot = self.layout.addPlot(row=1, col=0)
-        self.phase_plot.setTitle("Bode Plot - Phase")
+        self.phase_plot.setTitle("Bode Plot - 1X Phase")
         self.phase_plot.setLabel('left', "Phase (degrees)")
-        self.phase_plot.setLabel('bottom', "Frequency (Hz)")
-        self.phase_plot.setLogMode(x=True, y=False)
+        self.phase_plot.setLabel('bottom', "Speed (RPM)")
+        self.phase_plot.setYRange(0, 360)
         self.phase_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.phase_plot.setXLink(self.mag_plot)
+        self.phase_curve = self.phase_plot.plot(pen='b', symbol='o', symbolSize=4, symbolBrush='b')
 
         if not self.model_name and self.console:
             self.console.append_to_console("No model selected in BodePlotFeature.")
@@ -61,74 +92,81 @@ class BodePlotFeature:
     def get_widget(self):
         return self.widget
 
+    def resolve_channel_index(self):
+        """Map the selected channel name to its index in the model; numeric channels are used as-is."""
+        try:
+            project_data = self.db.get_project_data(self.project_name) if self.db else None
+            if project_data and "models" in project_data:
+                for model in project_data["models"]:
+                    if model.get("name") == self.model_name:
+                        for idx, ch in enumerate(model.get("channels", [])):
+                            if ch.get("channelName") == self.channel:
+                                self.channel_index = idx
+                                return
+        except Exception as e:
+            logging.error(f"Error resolving Bode channel {self.channel}: {str(e)}")
+        try:
+            self.channel_index = int(self.channel)
+        except (TypeError, ValueError):
+            self.channel_index = 0
+            if self.console:
+                self.console.append_to_console(f"Channel {self.channel} not found for model {self.model_name}, defaulting to index 0")
+
     def on_data_received(self, tag_name, model_name, values, sample_rate=1000):
-        if self.model_name != model_name:
-            return  # Ignore data for other models
+        result = self.compute(Frame(tag_name, model_name, values, sample_rate))
+        if result is not None:
+            self.render(result)
 
-        if self.console:
-            self.console.append_to_console(
-                f"Bode Plot ({self.model_name} - {self.channel}): Received data for {tag_name}"
-            )
+    def compute(self, frame):
+        """Add this frame's 1X point; runs on a compute-stage worker, so no widget access."""
+        if self.model_name != frame.model_name:
+            return None  # Ignore data for other models
 
+        values = frame.values
+        sample_rate = frame.sample_rate
         try:
-            # Validate channel and values
-            if self.channel is None:
-                if self.console:
-                    self.console.append_to_console(f"No channel specified for {tag_name}")
-                return
-
-            # Convert channel to int if it isn't already
-            channel_idx = int(self.channel)
-
-            # Select the appropriate channel data
-            if isinstance(values, list) and len(values) > channel_idx >= 0:
-                x = np.array(values[channel_idx])
-            else:
-                x = np.array(values)
-                if self.console:
-                    self.console.append_to_console(f"Invalid channel index {channel_idx} for {tag_name}, using default data")
-                return
-
-            N = len(x)
-            if N == 0:
-                if self.console:
-                    self.console.append_to_console(f"No data received for {tag_name}")
-                return
-
-            # Compute FFT
-            fft_result = np.fft.fft(x)
-            frequencies = np.fft.fftfreq(N, d=1.0/sample_rate)  # Use provided sample_rate
-            frequencies = frequencies[:N//2]  # Positive frequencies only
-            fft_result = fft_result[:N//2]  # Corresponding FFT values
-
-            # Compute frequency (adjust based on sample rate)
-            frequencies = frequencies / 100.0  # Hz, following provided formula
-
-            # Compute amplitude using the formula: A = 4 * sqrt((1/N * sum(x[n] * sin(theta_n))^2 + (1/N * sum(x[n] * cos(theta_n))^2)
-            theta = 2 * np.pi * frequencies * np.arange(N)[:, None] / N
-            sin_sum = (1/N) * np.sum(x[:, None] * np.sin(theta), axis=0)
-            cos_sum = (1/N) * np.sum(x[:, None] * np.cos(theta), axis=0)
-            amplitude = 4 * np.sqrt(sin_sum**2 + cos_sum**2)
-
-            # Convert amplitude to dB for magnitude plot
-            magnitude = 20 * np.log10(np.abs(amplitude + 1e-10))  # Add small value to avoid log(0)
-
-            # Compute phase using the formula: phi = arctan2(cos_sum / sin_sum) * 180 / pi
-            phase = np.arctan2(cos_sum, sin_sum) * (180 / np.pi)
-
-            # Clear previous plots
-            self.mag_plot.clear()
-            self.phase_plot.clear()
-
-            # Plot new data
-            self.mag_plot.plot(frequencies, magnitude, pen='b')
-            self.phase_plot.plot(frequencies, phase, pen='b')
-
-            # Update plot settings
-            self.mag_plot.setTitle("Bode Plot - Magnitude")
-            self.phase_plot.setTitle("Bode Plot - Phase")
-            self.plot_widget.show()
-
+            if self.channel_index is None or self.channel_index >= len(values) - 2:
+                lazy_log.debug("bode", lambda: f"Invalid channel index {self.channel_index} for {frame.tag_name}")
+                return None
+
+            # Shared with every other view order-tracking this frame
+            tracked = track_frame(values, sample_rate if sample_rate > 0 else 1000)
+            if tracked is None or self.channel_index not in tracked.channels:
+                return ("Waiting for tacho triggers...", None)
+
+            amplitudes, phases = tracked.order_components(orders=(1,))
+            row = tracked.row(self.channel_index)
+            rpm = tracked.rpm
+            amplitude = float(amplitudes[row, 0]) * self.scaling_factor
+            phase = float(phases[row, 0])
+            point = (rpm, amplitude, phase)
+            with self.points_lock:
+                if self.points and abs(self.points[-1][0] - rpm) < self.rpm_resolution:
+                    self.points[-1] = point  # Steady speed: keep the latest reading only
+                else:
+                    self.points.append(point)
+                points = np.asarray(self.points)
+            return (f"{rpm:.0f} RPM, 1X {amplitude:.4f} V @ {phase:.1f} deg", points)
         except Exception as e:
-            if self.console:
-                self.console.append_to_console(f"Error in Bode Plot for {tag_name}: {str(e)}")
\ No newline at end of file
+            lazy_log.error("bode", lambda: f"Error in Bode Plot for {frame.tag_name}: {str(e)}")
+            return None
+
+    def render(self, result):
+        status, points = result
+        self.status_label.setText(status)
+        if points is not None:
+            self.update_plot(points)
+
+    def update_plot(self, points):
+        if len(points) == 0:
+            self.mag_curve.setData([], [])
+            self.phase_curve.setData([], [])
+            return
+        # Acquisition order, so a run-up and the following coast-down stay separate traces
+        self.mag_curve.setData(points[:, 0], points[:, 1])
+        self.phase_curve.setData(points[:, 0], points[:, 2])
+
+    def clear_points(self):
+        with self.points_lock:
+            self.points.clear()
+        self.update_plot(np.zeros((0, 3)))
@@ -4,6 +4,7 @@ from PyQt5.QtCore import QTimer
 import pyqtgraph as pg
 import numpy as np
 import logging
+from lazy_log import lazy_log
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -88,29 +89,21 @@ class CenterLineFeature:
     def on_data_received(self, tag_name, model_name, values, sample_rate):
         # Validate model match
         if self.model_name != model_name:
-            if self.console:
-                self.console.append_to_console(f"Ignoring data for model {model_name}, expected {self.model_name}")
-            logging.debug(f"Ignoring data for model {model_name}, expected {self.model_name}")
+            lazy_log.debug("centerline", lambda: f"Ignoring data for model {model_name}, expected {self.model_name}")
             return
 
-        if self.console:
-            self.console.append_to_console(
-                f"Centerline View ({self.model_name} - {self.channel}): Received data for {tag_name} - {len(values)} channels"
-            )
-            logging.debug(f"Received data for {tag_name}: {len(values)} channels, sample_rate={sample_rate}")
+        lazy_log.debug("centerline", lambda: (
+            f"Centerline View ({self.model_name} - {self.channel}): Received data for {tag_name} - {len(values)} channels"
+        ))
 
         # Validate inputs
         if self.channel is None:
-            if self.console:
-                self.console.append_to_console("No channel (tag_name) selected for plotting")
-            logging.error("No channel (tag_name) selected for plotting")
+            lazy_log.warning("centerline", "No channel (tag_name) selected for plotting")
             return
 
         # Ensure the tag_name matches
         if self.channel != tag_name:
-            if self.console:
-                self.console.append_to_console(f"Ignoring data for tag {tag_name}, expected {self.channel}")
-            logging.debug(f"Ignoring data for tag {tag_name}, expected {self.channel}")
+            lazy_log.debug("centerline", lambda: f"Ignoring data for tag {tag_name}, expected {self.channel}")
             return
 
         # Since tag_name matches, use the first main channel (as done previously)
@@ -120,26 +113,20 @@ class CenterLineFeature:
 
         # Validate channel data
         if not values or len(values) < (num_channels + num_tacho_channels):
-            if self.console:
-                self.console.append_to_console(f"Invalid data: expected at least {num_channels + num_tacho_channels} channels, got {len(values)}")
-            logging.warning(f"Invalid data: expected at least {num_channels + num_tacho_channels} channels, got {len(values)}")
+            lazy_log.warning("centerline", lambda: f"Invalid data: expected at least {num_channels + num_tacho_channels} channels, got {len(values)}")
             return
 
         try:
             if channel_idx >= len(values):
-                if self.console:
-                    self.console.append_to_console(f"Channel index {channel_idx} out of range for {len(values)} channels")
-                logging.warning(f"Channel index {channel_idx} out of range for {len(values)} channels")
+                lazy_log.warning("centerline", lambda: f"Channel index {channel_idx} out of range for {len(values)} channels")
                 return
 
             self.sample_rate = sample_rate if sample_rate > 0 else 4096
             raw_data = np.array(values[channel_idx][:self.max_samples], dtype=np.float32)
             self.latest_data = raw_data
-            logging.debug(f"Channel {channel_idx} data (first 5 samples): {self.latest_data[:5]}")
+            lazy_log.debug("centerline", lambda: f"Channel {channel_idx} data (first 5 samples): {self.latest_data[:5]}")
         except Exception as e:
-            logging.error(f"Error in on_data_received: {e}")
-            if self.console:
-                self.console.append_to_console(f"Error in Centerline View: {e}")
+            lazy_log.error("centerline", lambda: f"Error in Centerline View: {e}")
 
     def update_plot(self):
         if self.latest_data is None:
@@ -151,9 +138,7 @@ class CenterLineFeature:
             voltage_data = np.array(voltage_data, dtype=np.float32)
             n = len(voltage_data)
             if n < 2:
-                if self.console:
-                    self.console.append_to_console(f"Data too short for plotting: {n} samples")
-                logging.warning(f"Data too short for plotting: {n} samples")
+                lazy_log.debug("centerline", lambda: f"Data too short for plotting: {n} samples")
                 return
 
             # Calculate centerline (mean) and control limits (same as original)
@@ -171,15 +156,11 @@ class CenterLineFeature:
             self.ucl_line.setValue(ucl)
             self.lcl_line.setValue(lcl)
 
-            if self.console:
-                self.console.append_to_console(
-                    f"Centerline Updated: Samples={n}, Mean={mean:.2f} V, UCL={ucl:.2f} V, LCL={lcl:.2f} V, Fs={self.sample_rate}Hz"
-                )
-                logging.debug(f"Plotted channel {self.channel_index}: Mean={mean:.2f} V, UCL={ucl:.2f} V, LCL={lcl:.2f} V")
+            lazy_log.debug("centerline", lambda: (
+                f"Centerline Updated: Samples={n}, Mean={mean:.2f} V, UCL={ucl:.2f} V, LCL={lcl:.2f} V, Fs={self.sample_rate}Hz"
+            ))
         except Exception as e:
-            logging.error(f"Error updating Centerline plot: {e}")
-            if self.console:
-                self.console.append_to_console(f"Error updating Centerline plot: {e}")
+            lazy_log.error("centerline", lambda: f"Error updating Centerline plot: {e}")
 
     def close(self):
         self.update_timer.stop()
\ No newline at end of file
@@ -0,0 +1,234 @@
+import os
+import time
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from startup_timeline import startup_timeline
+
+
+class Frame:
+    """One MQTT payload as handed to feature compute stages.
+
+    values is the object MQTTHandler emitted, so features.frame_cache products are
+    still shared between every feature that computes on this frame.
+    """
+
+    def __init__(self, tag_name, model_name, values, sample_rate):
+        self.tag_name = tag_name
+        self.model_name = model_name
+        self.values = values
+        self.sample_rate = sample_rate
+        self.received_at = time.perf_counter()
+
+
+class LaneMetrics:
+    def __init__(self):
+        self.frames = 0
+        self.warmed = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.errors = 0
+        self.renders = 0
+        self.compute_time = 0.0
+        self.max_compute_time = 0.0
+        self.queue_time = 0.0
+        self.max_queue_time = 0.0
+        self.render_time = 0.0
+
+    def as_dict(self):
+        frames = max(self.frames, 1)
+        renders = max(self.renders, 1)
+        return {
+            "frames": self.frames,
+            "warmed": self.warmed,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "renders": self.renders,
+            "avgComputeMs": 1000.0 * self.compute_time / frames,
+            "maxComputeMs": 1000.0 * self.max_compute_time,
+            "avgQueueMs": 1000.0 * self.queue_time / frames,
+            "maxQueueMs": 1000.0 * self.max_queue_time,
+            "avgRenderMs": 1000.0 * self.render_time / renders
+        }
+
+
+class Lane:
+    """Serial queue for one feature instance: at most one compute in flight, in frame order."""
+
+    def __init__(self, key, feature, max_pending):
+        self.key = key
+        self.feature = feature
+        self.pending = deque()
+        self.max_pending = max_pending
+        self.busy = False
+        self.closed = False
+        self.latest = None
+        self.has_result = False
+        self.visible = True
+        self.metrics = LaneMetrics()
+
+
+class ComputeStage(QObject):
+    """Runs feature compute(frame) calls on a worker pool and render(result) on the GUI thread.
+
+    A feature opts in by defining compute(frame) -> result, which must not touch widgets,
+    and render(result), which only updates widgets. Each feature has its own lane so its
+    frames are computed one at a time and in order, while different features run in
+    parallel (NumPy and SciPy release the GIL in their kernels). Results are coalesced:
+    the render timer draws only the newest result of each lane, at most once per tick.
+
+    A lane whose window is hidden (see set_visible) is not rendered; its newest result is
+    kept and drawn when the window is shown again. If the feature defines warm(frame),
+    that cheaper call replaces compute while hidden and only keeps its state current;
+    otherwise frames for a hidden lane are skipped and the next frame after it is shown
+    is computed as usual.
+    """
+
+    computed = pyqtSignal(object, object)
+
+    def __init__(self, parent=None, workers=None, max_pending=4, render_interval=16):
+        super().__init__(parent)
+        self.workers = workers or max(2, min(4, (os.cpu_count() or 2) - 1))
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="compute")
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.lanes = {}
+        self.hidden = set()  # Keys of lanes whose windows are not on screen
+        self.dirty = []
+        self.closed = False
+        self.computed.connect(self.on_computed)
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(render_interval)  # ~60 fps
+        self.render_timer.timeout.connect(self.render_pending)
+
+    def submit(self, key, feature, frame):
+        """Queue frame for feature; the oldest pending frame is dropped when the lane is full."""
+        with self.lock:
+            lane = self.lanes.get(key)
+            if lane is None or lane.feature is not feature:
+                lane = Lane(key, feature, self.max_pending)
+                lane.visible = key not in self.hidden
+                self.lanes[key] = lane
+            if not lane.visible and not hasattr(feature, 'warm'):
+                lane.metrics.skipped += 1
+                return
+            if len(lane.pending) >= lane.max_pending:
+                lane.pending.popleft()
+                lane.metrics.dropped += 1
+            lane.pending.append(frame)
+            if lane.busy or self.closed:
+                return
+            lane.busy = True
+        self.executor.submit(self.run_lane, lane)
+
+    def run_lane(self, lane):
+        with self.lock:
+            if lane.closed or not lane.pending:
+                lane.busy = False
+                return
+            frame = lane.pending.popleft()
+            hidden = not lane.visible
+        warm = hidden and hasattr(lane.feature, 'warm')
+        if hidden and not warm:
+            lane.metrics.skipped += 1  # Queued before the window was hidden
+        else:
+            self.compute_frame(lane, frame, warm)
+        with self.lock:
+            if lane.closed or not lane.pending:
+                lane.busy = False
+                return
+        # Requeue instead of looping so other lanes get a worker between frames
+        try:
+            self.executor.submit(self.run_lane, lane)
+        except RuntimeError:
+            lane.busy = False  # Stage shut down meanwhile
+
+    def compute_frame(self, lane, frame, warm):
+        started = time.perf_counter()
+        try:
+            result = lane.feature.warm(frame) if warm else lane.feature.compute(frame)
+        except Exception as e:
+            result = None
+            lane.metrics.errors += 1
+            logging.error(f"Error computing {lane.key}: {str(e)}")
+        finished = time.perf_counter()
+        metrics = lane.metrics
+        metrics.frames += 1
+        if warm:
+            metrics.warmed += 1
+            result = None
+        metrics.queue_time += started - frame.received_at
+        metrics.max_queue_time = max(metrics.max_queue_time, started - frame.received_at)
+        metrics.compute_time += finished - started
+        metrics.max_compute_time = max(metrics.max_compute_time, finished - started)
+        if result is not None:
+            self.computed.emit(lane, result)
+
+    def on_computed(self, lane, result):
+        if lane.closed:
+            return
+        lane.latest = result
+        if not lane.has_result:
+            lane.has_result = True
+            if lane.visible:
+                self.dirty.append(lane)
+        if lane.visible and not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def render_pending(self):
+        lanes, self.dirty = self.dirty, []
+        for lane in lanes:
+            if lane.closed or not lane.has_result or not lane.visible:
+                continue  # A hidden lane keeps its result until set_visible shows it
+            result, lane.latest, lane.has_result = lane.latest, None, False
+            started = time.perf_counter()
+            try:
+                lane.feature.render(result)
+            except Exception as e:
+                logging.error(f"Error rendering {lane.key}: {str(e)}")
+            lane.metrics.render_time += time.perf_counter() - started
+            lane.metrics.renders += 1
+            startup_timeline.mark("first_render", feature=lane.key[0] if isinstance(lane.key, tuple) else str(lane.key))
+
+    def set_visible(self, key, visible):
+        """Pause or resume rendering of a feature; showing it draws its newest result."""
+        with self.lock:
+            if visible:
+                self.hidden.discard(key)
+            else:
+                self.hidden.add(key)
+            lane = self.lanes.get(key)
+            if lane is None or lane.visible == visible:
+                return
+            lane.visible = visible
+        if visible and lane.has_result and lane not in self.dirty:
+            self.dirty.append(lane)
+            if not self.render_timer.isActive():
+                self.render_timer.start()
+
+    def remove(self, key):
+        """Forget a closed feature; its in-flight result is discarded."""
+        with self.lock:
+            lane = self.lanes.pop(key, None)
+            self.hidden.discard(key)
+            if lane is not None:
+                lane.closed = True
+                lane.pending.clear()
+
+    def stats(self):
+        with self.lock:
+            return {str(key): lane.metrics.as_dict() for key, lane in self.lanes.items()}
+
+    def shutdown(self):
+        with self.lock:
+            self.closed = True
+            for lane in self.lanes.values():
+                lane.closed = True
+                lane.pending.clear()
+            self.lanes.clear()
+        self.render_timer.stop()
+        self.executor.shutdown(wait=False)
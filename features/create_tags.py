@@ -105,8 +105,8 @@ class CreateTagsFeature:
             self.tags_table.setRowCount(len(tags_data))
             for row, tag in enumerate(tags_data):
                 self.tags_table.setItem(row, 0, QTableWidgetItem(tag["tag_name"]))
-                latest_data = self.db.get_tag_values(self.project_name, tag["model_name"], tag["tag_name"])
-                value = latest_data[-1]["values"][-1] if latest_data else "N/A"
+                latest = self.db.get_latest_tag_value(self.project_name, tag["model_name"], tag["tag_name"])
+                value = latest["values"][-1] if latest and latest.get("values") else "N/A"
                 self.tags_table.setItem(row, 1, QTableWidgetItem(str(value)))
 
                 actions_widget = QWidget()
@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def minmax_envelope(data, start, stop, columns):
+    """Sample indices and values that draw data[start:stop] on a plot `columns` pixels wide.
+
+    The samples are split into one bucket per pixel column and each bucket is reduced to
+    its minimum and maximum, so every peak stays visible while the curve has at most
+    2 * columns points. When the range already fits, it is returned at full resolution.
+    """
+    start = max(int(start), 0)
+    stop = min(int(stop), len(data))
+    columns = max(int(columns), 1)
+    count = stop - start
+    if count <= 2 * columns:
+        return np.arange(start, max(stop, start)), data[start:stop]
+    visible = data[start:stop]
+    offsets = (np.arange(columns) * count) // columns
+    values = np.empty(2 * columns, dtype=visible.dtype)
+    values[0::2] = np.minimum.reduceat(visible, offsets)
+    values[1::2] = np.maximum.reduceat(visible, offsets)
+    # Both points of a bucket sit at its first sample, drawing one vertical stroke per column
+    return np.repeat(start + offsets, 2), values
+
+
+def visible_range(times, x_min, x_max):
+    """[start, stop) of the sorted times inside [x_min, x_max], one sample wider on each side
+    so the curve reaches the plot edges."""
+    start = int(np.searchsorted(times, x_min, side='left')) - 1
+    stop = int(np.searchsorted(times, x_max, side='right')) + 1
+    return max(start, 0), min(stop, len(times))
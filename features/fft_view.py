@@ -1,17 +1,18 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit, QGridLayout
 from PyQt5.QtGui import QDoubleValidator
 from PyQt5.QtGui import QIntValidator
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
 import pyqtgraph as pg
 import numpy as np
 import logging
-from scipy.fft import fft
-from scipy.signal import get_window
+from features.spectral_averaging import SpectralAverager, ZoomAverager, SynchronousAverager
+from features.compute_stage import Frame
 from pymongo import MongoClient
 from bson.objectid import ObjectId
 from datetime import datetime
 import time
+from lazy_log import lazy_log
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -27,6 +28,7 @@ class FFTSettings:
         self.number_of_averages = 10
         self.weighting_mode = "Linear"
         self.linear_mode = "Continuous"
+        self.fft_mode = "Baseband"  # "Zoom" transforms only the start-stop band
         self.updated_at = datetime.utcnow()
 
 class FFTViewFeature:
@@ -44,16 +46,14 @@ class FFTViewFeature:
         self.phase_plot_item = None
         self.sample_rate = 1000  # Hz
         self.channel_index = None
-        self.latest_data = None
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_plot)
-        self.update_interval = 200  # ms
         self.max_samples = 4096
         self.layout_type = layout
         self.mongo_client = MongoClient("mongodb://localhost:27017")
         self.project_id = None
         self.settings = FFTSettings(None)
-        self.data_buffer = []  # For averaging
+        self.averager = SpectralAverager()
+        self.averager_linear_mode = self.settings.linear_mode
+        self.sample_count = 0
         self.settings_panel = None
         self.settings_button = None
         self.initUI()
@@ -154,13 +154,21 @@ class FFTViewFeature:
         settings_layout.addWidget(linear_combo, 8, 1)
         self.settings_widgets["LinearMode"] = linear_combo
 
+        # FFT Mode
+        settings_layout.addWidget(QLabel("FFT Mode"), 9, 0)
+        fft_mode_combo = QComboBox()
+        fft_mode_combo.addItems(["Baseband", "Zoom"])
+        fft_mode_combo.setCurrentText(self.settings.fft_mode)
+        settings_layout.addWidget(fft_mode_combo, 9, 1)
+        self.settings_widgets["FFTMode"] = fft_mode_combo
+
         # Save and Close buttons
         save_button = QPushButton("Save")
         save_button.clicked.connect(self.save_settings)
         close_button = QPushButton("Close")
         close_button.clicked.connect(self.close_settings)
-        settings_layout.addWidget(save_button, 9, 0)
-        settings_layout.addWidget(close_button, 9, 1)
+        settings_layout.addWidget(save_button, 10, 0)
+        settings_layout.addWidget(close_button, 10, 1)
 
         main_layout.addWidget(self.settings_panel)
 
@@ -189,7 +197,6 @@ class FFTViewFeature:
         plot_layout.addWidget(self.phase_plot_widget)
 
         main_layout.addLayout(plot_layout)
-        self.update_timer.start(self.update_interval)
 
         if self.console:
             self.console.append_to_console(f"Initialized FFTViewFeature with channel: {self.channel}, model: {self.model_name}")
@@ -240,6 +247,7 @@ class FFTViewFeature:
                 self.settings.number_of_averages = int(setting.get("numberOfAverages", 10))
                 self.settings.weighting_mode = setting.get("weightingMode", "Linear")
                 self.settings.linear_mode = setting.get("linearMode", "Continuous")
+                self.settings.fft_mode = setting.get("fftMode", "Baseband")
                 
                 self.settings_widgets["WindowType"].setCurrentText(self.settings.window_type)
                 self.settings_widgets["StartFrequency"].setText(str(self.settings.start_frequency))
@@ -250,6 +258,7 @@ class FFTViewFeature:
                 self.settings_widgets["NumberOfAverages"].setText(str(self.settings.number_of_averages))
                 self.settings_widgets["WeightingMode"].setCurrentText(self.settings.weighting_mode)
                 self.settings_widgets["LinearMode"].setCurrentText(self.settings.linear_mode)
+                self.settings_widgets["FFTMode"].setCurrentText(self.settings.fft_mode)
                 
                 if self.console:
                     self.console.append_to_console(f"Loaded FFT settings for project ID: {self.project_id}")
@@ -274,6 +283,7 @@ class FFTViewFeature:
                 "numberOfAverages": self.settings.number_of_averages,
                 "weightingMode": self.settings.weighting_mode,
                 "linearMode": self.settings.linear_mode,
+                "fftMode": self.settings.fft_mode,
                 "updatedAt": datetime.utcnow()
             }
             settings_collection.update_one(
@@ -301,6 +311,7 @@ class FFTViewFeature:
             self.settings.number_of_averages = int(self.settings_widgets["NumberOfAverages"].text() or 10)
             self.settings.weighting_mode = self.settings_widgets["WeightingMode"].currentText()
             self.settings.linear_mode = self.settings_widgets["LinearMode"].currentText()
+            self.settings.fft_mode = self.settings_widgets["FFTMode"].currentText()
 
             # Validate settings
             if self.settings.start_frequency >= self.settings.stop_frequency:
@@ -327,7 +338,7 @@ class FFTViewFeature:
             self.settings_button.setVisible(True)
             if self.console:
                 self.console.append_to_console("FFT settings updated and saved.")
-            self.update_plot()  # Apply new settings immediately
+            # The averager belongs to the compute stage; it picks the new settings up with the next frame
         except Exception as e:
             self.log_and_set_status(f"Error saving FFT settings: {str(e)}")
 
@@ -341,6 +352,7 @@ class FFTViewFeature:
         self.settings_widgets["NumberOfAverages"].setText(str(self.settings.number_of_averages))
         self.settings_widgets["WeightingMode"].setCurrentText(self.settings.weighting_mode)
         self.settings_widgets["LinearMode"].setCurrentText(self.settings.linear_mode)
+        self.settings_widgets["FFTMode"].setCurrentText(self.settings.fft_mode)
         self.settings_panel.setVisible(False)
         self.settings_button.setVisible(True)
 
@@ -367,120 +379,106 @@ class FFTViewFeature:
             self.channel_index = 0
 
     def on_data_received(self, tag_name, model_name, values, sample_rate):
-        if self.model_name != model_name or self.channel_index is None:
-            if self.console:
-                self.console.append_to_console(
-                    f"FFT View: Skipped data - model_name={model_name} (expected {self.model_name}), "
-                    f"channel_index={self.channel_index}"
-                )
-            return
-
+        result = self.compute(Frame(tag_name, model_name, values, sample_rate))
+        if result is not None:
+            self.render(result)
+
+    def compute(self, frame):
+        """Average this frame and return the plot arrays; runs on a compute-stage worker."""
+        if self.model_name != frame.model_name or self.channel_index is None:
+            lazy_log.debug("fft", lambda: (
+                f"FFT View: Skipped data - model_name={frame.model_name} (expected {self.model_name}), "
+                f"channel_index={self.channel_index}"
+            ))
+            return None
+
+        values = frame.values
         try:
             if self.channel_index >= len(values):
                 self.log_and_set_status(f"Channel index {self.channel_index} out of range for {len(values)} channels")
-                return
-
-            self.sample_rate = sample_rate if sample_rate > 0 else 1000
-            scaling_factor = 3.3 / 65535.0
-            raw_data = np.array(values[self.channel_index][:self.max_samples], dtype=np.float32)
-            self.latest_data = raw_data * scaling_factor
-            self.data_buffer.append(self.latest_data.copy())
+                return None
 
-            # Trim buffer to number_of_averages
-            if len(self.data_buffer) > self.settings.number_of_averages:
-                self.data_buffer = self.data_buffer[-self.settings.number_of_averages:]
-
-            if self.console:
-                self.console.append_to_console(
-                    f"FFT View: Received data for channel {self.channel}, "
-                    f"samples={len(self.latest_data)}, Fs={self.sample_rate}Hz"
-                )
+            self.sample_rate = frame.sample_rate if frame.sample_rate > 0 else 1000
+            n = min(len(values[self.channel_index]), self.max_samples)
+            if n < 2:
+                self.log_and_set_status(f"Insufficient data length: {n}")
+                return None
+            self.sample_count = n
+            self.configure_averager()
+            self.averager.feed(values, self.channel_index, n)
+
+            lazy_log.debug("fft", lambda: (
+                f"FFT View: Received data for channel {self.channel}, "
+                f"samples={n}, Fs={self.sample_rate}Hz"
+            ))
+            return self.plot_data()
         except Exception as e:
             self.log_and_set_status(f"Error in on_data_received: {str(e)}")
-
-    def update_plot(self):
-        if not self.data_buffer:
-            return
-
+            return None
+
+    def configure_averager(self):
+        if self.settings.linear_mode == "Time Synchronous":
+            averager_class = SynchronousAverager
+        elif self.settings.fft_mode == "Zoom":
+            averager_class = ZoomAverager
+        else:
+            averager_class = SpectralAverager
+        if type(self.averager) is not averager_class:
+            self.averager = averager_class()
+        elif self.averager_linear_mode != self.settings.linear_mode:
+            self.averager.reset()  # Peak hold restarts whenever the mode is switched
+        self.averager_linear_mode = self.settings.linear_mode
+        self.averager.configure(
+            self.sample_rate, self.settings.window_type, self.settings.start_frequency, self.settings.stop_frequency,
+            self.settings.number_of_lines, self.settings.overlap_percentage,
+            self.settings.averaging_mode, self.settings.number_of_averages
+        )
+
+    def plot_data(self):
+        """(frequencies, magnitudes, phases) to draw, or None when nothing changed since the last call."""
+        # Nothing to redraw until a new segment has been averaged or settings changed
+        if not self.averager.dirty:
+            return None
+
+        # Peak hold and synchronous averages are accumulated per frame by the averager
+        result = self.averager.result(peak_hold=self.settings.linear_mode == "Peak Hold")
+        if result is None:
+            return None
+        frequencies, magnitudes, phases = result
+
+        # The FFT size is derived from lines and span, so every bin in range is shown
+        freq_mask = (frequencies >= self.settings.start_frequency) & (frequencies <= self.settings.stop_frequency)
+        filtered_frequencies = frequencies[freq_mask]
+        filtered_magnitudes = magnitudes[freq_mask] * (3.3 / 65535.0)
+        filtered_phases = phases[freq_mask]
+
+        # Apply weighting
+        if self.settings.weighting_mode != "Linear":
+            # Simplified weighting (A, B, C-weighting curves are approximated)
+            weights = np.ones_like(filtered_frequencies)
+            if self.settings.weighting_mode == "A-Weighting":
+                weights = 1.0 / (1.0 + (filtered_frequencies / 1000) ** 2)  # Simplified A-weighting
+            elif self.settings.weighting_mode == "B-Weighting":
+                weights = 1.0 / (1.0 + (filtered_frequencies / 500) ** 2)  # Simplified B-weighting
+            elif self.settings.weighting_mode == "C-Weighting":
+                weights = 1.0 / (1.0 + (filtered_frequencies / 200) ** 2)  # Simplified C-weighting
+            filtered_magnitudes = filtered_magnitudes * weights
+        self.averager.dirty = False
+
+        lazy_log.debug("fft", lambda: (
+            f"FFT Updated: Mode={self.settings.linear_mode}, Segments={self.averager.segments}, FFT Size={self.averager.nfft}, "
+            f"Fs={self.sample_rate}Hz, Lines={len(filtered_frequencies)}, "
+            f"Range={self.settings.start_frequency}-{self.settings.stop_frequency}Hz"
+        ))
+        return filtered_frequencies, filtered_magnitudes, filtered_phases
+
+    def render(self, result):
         try:
-            # Prepare data
-            data = self.data_buffer[-1] if self.settings.averaging_mode == "No Averaging" else np.mean(self.data_buffer, axis=0)
-            n = len(data)
-            if n < 2:
-                self.log_and_set_status(f"Insufficient data length: {n}")
-                return
-
-            # Apply window
-            window_name = self.settings.window_type.lower() if self.settings.window_type != "None" else "rectangular"
-            window = get_window(window_name, n)
-            windowed_data = data * window
-
-            # Compute FFT
-            target_length = 2 ** int(np.ceil(np.log2(n)))
-            padded_data = np.zeros(target_length)
-            padded_data[:n] = windowed_data
-            fft_result = fft(padded_data)
-            half = target_length // 2
-
-            # Frequency axis
-            frequencies = np.linspace(0, self.sample_rate / 2, half)
-            freq_mask = (frequencies >= self.settings.start_frequency) & (frequencies <= self.settings.stop_frequency)
-            filtered_frequencies = frequencies[freq_mask]
-
-            # Magnitude and phase
-            magnitudes = np.abs(fft_result[:half]) / target_length
-            phases = np.degrees(np.angle(fft_result[:half]))
-            filtered_magnitudes = magnitudes[freq_mask]
-            filtered_phases = phases[freq_mask]
-
-            # Apply weighting
-            if self.settings.weighting_mode != "Linear":
-                # Simplified weighting (A, B, C-weighting curves are approximated)
-                weights = np.ones_like(filtered_frequencies)
-                if self.settings.weighting_mode == "A-Weighting":
-                    weights = 1.0 / (1.0 + (filtered_frequencies / 1000) ** 2)  # Simplified A-weighting
-                elif self.settings.weighting_mode == "B-Weighting":
-                    weights = 1.0 / (1.0 + (filtered_frequencies / 500) ** 2)  # Simplified B-weighting
-                elif self.settings.weighting_mode == "C-Weighting":
-                    weights = 1.0 / (1.0 + (filtered_frequencies / 200) ** 2)  # Simplified C-weighting
-                filtered_magnitudes *= weights
-
-            # Apply averaging
-            if self.settings.averaging_mode == "Linear" and len(self.data_buffer) > 1:
-                avg_magnitudes = np.mean([np.abs(fft(np.zeros(target_length)[:n] + d * window)[:half]) / target_length for d in self.data_buffer], axis=0)
-                avg_phases = np.mean([np.degrees(np.angle(fft(np.zeros(target_length)[:n] + d * window)[:half])) for d in self.data_buffer], axis=0)
-                filtered_magnitudes = avg_magnitudes[freq_mask]
-                filtered_phases = avg_phases[freq_mask]
-            elif self.settings.averaging_mode == "Exponential" and len(self.data_buffer) > 1:
-                alpha = 2.0 / (self.settings.number_of_averages + 1)
-                avg_magnitudes = np.zeros(half)
-                avg_phases = np.zeros(half)
-                for d in self.data_buffer:
-                    fft_d = fft(np.zeros(target_length)[:n] + d * window)
-                    avg_magnitudes = alpha * (np.abs(fft_d[:half]) / target_length) + (1 - alpha) * avg_magnitudes
-                    avg_phases = alpha * np.degrees(np.angle(fft_d[:half])) + (1 - alpha) * avg_phases
-                filtered_magnitudes = avg_magnitudes[freq_mask]
-                filtered_phases = avg_phases[freq_mask]
-
-            # Adjust for number of lines
-            if len(filtered_frequencies) > self.settings.number_of_lines:
-                indices = np.linspace(0, len(filtered_frequencies) - 1, self.settings.number_of_lines, dtype=int)
-                filtered_frequencies = filtered_frequencies[indices]
-                filtered_magnitudes = filtered_magnitudes[indices]
-                filtered_phases = filtered_phases[indices]
-
-            # Update plots
-            self.magnitude_plot_item.setData(filtered_frequencies, filtered_magnitudes)
-            self.phase_plot_item.setData(filtered_frequencies, filtered_phases)
+            frequencies, magnitudes, phases = result
+            self.magnitude_plot_item.setData(frequencies, magnitudes)
+            self.phase_plot_item.setData(frequencies, phases)
             self.magnitude_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency)
             self.phase_plot_widget.setXRange(self.settings.start_frequency, self.settings.stop_frequency)
-
-            if self.console:
-                self.console.append_to_console(
-                    f"FFT Updated: Samples={n}, FFT Size={target_length}, "
-                    f"Fs={self.sample_rate}Hz, Lines={len(filtered_frequencies)}, "
-                    f"Range={self.settings.start_frequency}-{self.settings.stop_frequency}Hz"
-                )
         except Exception as e:
             self.log_and_set_status(f"Error updating FFT: {str(e)}")
 
@@ -490,5 +488,4 @@ class FFTViewFeature:
             self.console.append_to_console(message)
 
     def close(self):
-        self.update_timer.stop()
         self.mongo_client.close()
\ No newline at end of file
@@ -0,0 +1,131 @@
+import numpy as np
+import scipy.signal as signal
+from functools import lru_cache
+
+DEFAULT_TAPS = 31
+DEFAULT_WINDOW = "hamming"
+
+# Band-pass choices offered in the Tabular View settings; "None" keeps the default band.
+BANDPASS_OPTIONS = {
+    "None": (50.0, 200.0),
+    "50-200 Hz": (50.0, 200.0),
+    "100-300 Hz": (100.0, 300.0)
+}
+
+
+@lru_cache(maxsize=64)
+def _design_fir(sample_rate, cutoff, taps, window, pass_zero):
+    nyquist = sample_rate / 2.0
+    if isinstance(cutoff, tuple):
+        normalized = [c / nyquist for c in cutoff]
+    else:
+        normalized = cutoff / nyquist
+    coeffs = signal.firwin(taps, normalized, window=window, pass_zero=pass_zero)
+    zi = signal.lfilter_zi(coeffs, 1.0)
+    coeffs.setflags(write=False)
+    zi.setflags(write=False)
+    return coeffs, zi
+
+
+def design_fir(sample_rate, cutoff, taps=DEFAULT_TAPS, window=DEFAULT_WINDOW, pass_zero=True):
+    """Cached firwin design keyed by (sample_rate, cutoffs, taps, window, pass_zero).
+
+    cutoff is a frequency in Hz or a (low, high) pair for band filters. Returns the
+    read-only (coeffs, unit-step zi) pair; raises ValueError for cutoffs at or above Nyquist.
+    """
+    if isinstance(cutoff, (list, tuple)):
+        cutoff = tuple(float(c) for c in cutoff)
+        if cutoff[0] >= cutoff[1]:
+            raise ValueError(f"Invalid band {cutoff}")
+    else:
+        cutoff = float(cutoff)
+    if max(np.atleast_1d(cutoff)) >= sample_rate / 2.0:
+        raise ValueError(f"Cutoff {cutoff} Hz must be below Nyquist ({sample_rate / 2.0} Hz)")
+    return _design_fir(float(sample_rate), cutoff, int(taps), window, pass_zero)
+
+
+class StreamingFIR:
+    """FIR filter that carries lfilter state between frames for each channel."""
+
+    def __init__(self, coeffs, step_zi):
+        self.coeffs = coeffs
+        self.step_zi = step_zi
+        # Single-precision copies so float32 / complex64 streams stay single precision
+        self.coeffs32 = coeffs.astype(np.float32)
+        self.step_zi32 = step_zi.astype(np.float32)
+        self.denominator = np.ones(1)
+        self.denominator32 = np.ones(1, dtype=np.float32)
+        self.zi = {}
+
+    def process(self, channel, data):
+        data = np.asarray(data)
+        if data.dtype not in (np.float32, np.complex64, np.complex128):
+            data = data.astype(float)
+        single = data.dtype in (np.float32, np.complex64)
+        coeffs, denominator = (self.coeffs32, self.denominator32) if single else (self.coeffs, self.denominator)
+        zi = self.zi.get(channel)
+        if zi is None:
+            # Start from the steady state for the first sample instead of zero.
+            zi = (self.step_zi32 if single else self.step_zi) * (data[0] if data.size else 0.0)
+        out, self.zi[channel] = signal.lfilter(coeffs, denominator, data, zi=zi.astype(data.dtype, copy=False))
+        return out
+
+    def process_block(self, key, block):
+        """Filter a (channels x samples) block along axis 1 in one lfilter call.
+
+        State is kept per key as a (channels x taps-1) array and restarts if the channel count changes.
+        """
+        block = np.asarray(block)
+        if block.dtype not in (np.float32, np.complex64, np.complex128):
+            block = block.astype(float)
+        single = block.dtype in (np.float32, np.complex64)
+        coeffs, denominator = (self.coeffs32, self.denominator32) if single else (self.coeffs, self.denominator)
+        zi = self.zi.get(key)
+        if zi is None or zi.shape[0] != block.shape[0]:
+            step_zi = self.step_zi32 if single else self.step_zi
+            zi = step_zi[None, :] * (block[:, :1] if block.shape[1] else np.zeros((block.shape[0], 1), dtype=block.dtype))
+        out, self.zi[key] = signal.lfilter(coeffs, denominator, block, axis=1, zi=zi.astype(block.dtype, copy=False))
+        return out
+
+    def reset(self, channel=None):
+        if channel is None:
+            self.zi.clear()
+        else:
+            self.zi.pop(channel, None)
+
+
+class FilterBank:
+    """Named streaming filters sharing one sample rate; designs come from design_fir."""
+
+    def __init__(self, taps=DEFAULT_TAPS, window=DEFAULT_WINDOW):
+        self.taps = taps
+        self.window = window
+        self.sample_rate = None
+        self.bands = {}
+        self.filters = {}
+
+    def configure(self, sample_rate, bands):
+        """Set the bands as {name: (cutoff, pass_zero)}. State is kept unless a design changes."""
+        if sample_rate == self.sample_rate and bands == self.bands:
+            return
+        filters = {}
+        for name, (cutoff, pass_zero) in bands.items():
+            coeffs, step_zi = design_fir(sample_rate, cutoff, self.taps, self.window, pass_zero)
+            existing = self.filters.get(name)
+            if existing is not None and existing.coeffs is coeffs:
+                filters[name] = existing
+            else:
+                filters[name] = StreamingFIR(coeffs, step_zi)
+        self.sample_rate = sample_rate
+        self.bands = dict(bands)
+        self.filters = filters
+
+    def process(self, name, channel, data):
+        return self.filters[name].process(channel, data)
+
+    def process_block(self, name, key, block):
+        return self.filters[name].process_block(key, block)
+
+    def reset(self):
+        for fir in self.filters.values():
+            fir.reset()
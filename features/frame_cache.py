@@ -0,0 +1,146 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from scipy.fft import rfft
+from scipy.signal import get_window
+
+
+# Window names used in the view settings, mapped to scipy.signal.get_window names.
+WINDOW_NAMES = {
+    "Hamming": "hamming",
+    "Hanning": "hann",
+    "Blackman": "blackman",
+    "Flat-top": "flattop",
+    "None": None
+}
+
+
+@lru_cache(maxsize=32)
+def cached_window(name, length):
+    """Read-only float32 analysis window; None, "None" and "rectangular" all mean no window."""
+    name = WINDOW_NAMES.get(name, name)
+    if name in (None, "none", "rectangular", "boxcar"):
+        return None
+    window = get_window(name.lower(), length).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+
+class FrameCache:
+    """Products derived from one incoming frame, shared by every view that receives it.
+
+    A frame is identified by the `values` object MQTTHandler emits, which is the same
+    object for every feature instance. The cache keeps a reference to the last few frames
+    so their ids cannot be reused while their products are cached.
+    """
+
+    def __init__(self, max_frames=8):
+        self.max_frames = max_frames
+        self.lock = threading.Lock()
+        self.frames = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _products(self, frame):
+        key = id(frame)
+        entry = self.frames.get(key)
+        if entry is None or entry[0] is not frame:
+            entry = (frame, {})
+            self.frames[key] = entry
+            while len(self.frames) > self.max_frames:
+                self.frames.popitem(last=False)
+        else:
+            self.frames.move_to_end(key)
+        return entry[1]
+
+    def get(self, frame, key, compute):
+        """Return the product stored under key for this frame, computing it on first use."""
+        with self.lock:
+            products = self._products(frame)
+            if key in products:
+                self.hits += 1
+                return products[key]
+        value = compute()
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        with self.lock:
+            self.misses += 1
+            return self._products(frame).setdefault(key, value)
+
+    def spectrum(self, frame, channel, window=None, nfft=None, start=0, stop=None):
+        """One-sided rfft of frame[channel][start:stop], windowed and zero-padded to nfft.
+
+        The transform is of the raw ADC counts in float32 (exact for 16-bit samples), so the
+        result is complex64; callers apply their own (linear) scaling.
+        """
+        def compute():
+            data = np.asarray(frame[channel][start:stop], dtype=np.float32)
+            n = len(data)
+            win = cached_window(window, n) if n else None
+            if win is not None:
+                data = data * win
+            return rfft(data, n=nfft or n)
+        return self.get(frame, ("spectrum", channel, window, nfft, start, stop), compute)
+
+    def block(self, frame, channels):
+        """frame[:channels] as one read-only float32 (channels x samples) array.
+
+        MQTTHandler frames are rows of one contiguous block, which is returned as a view;
+        other frames are stacked once and the copy is shared. Rows must have equal length.
+        """
+        def compute():
+            rows = frame[:channels]
+            base = getattr(rows[0], "base", None) if len(rows) else None
+            if (isinstance(base, np.ndarray) and base.ndim == 2 and base.dtype == np.float32
+                    and base.shape[0] >= len(rows)
+                    and all(row.base is base and row.ctypes.data == base[i].ctypes.data for i, row in enumerate(rows))):
+                return base[:len(rows)]
+            return np.asarray([np.asarray(row, dtype=np.float32) for row in rows])
+        return self.get(frame, ("block", channels), compute)
+
+    def spectra(self, frame, channels, window=None, nfft=None, start=0, stop=None):
+        """rfft of frame[:channels][:, start:stop], shape (channels, bins).
+
+        Rows are cached under the same keys as spectrum(), so a view asking for one channel
+        and a view asking for the whole block share the transforms; whichever runs first
+        computes them, the channels still missing in one batched call.
+        """
+        keys = [("spectrum", channel, window, nfft, start, stop) for channel in range(channels)]
+        with self.lock:
+            products = self._products(frame)
+            rows = [products.get(key) for key in keys]
+        missing = [channel for channel, row in enumerate(rows) if row is None]
+        if not missing:
+            with self.lock:
+                self.hits += 1
+            return np.stack(rows)
+        data = self.block(frame, channels)[missing, start:stop]
+        win = cached_window(window, data.shape[1]) if data.shape[1] else None
+        if win is not None:
+            data = data * win
+        computed = rfft(data, n=nfft or data.shape[1], axis=1)
+        computed.setflags(write=False)
+        with self.lock:
+            self.misses += 1
+            products = self._products(frame)
+            for channel, row in zip(missing, computed):
+                rows[channel] = products.setdefault(keys[channel], row)
+        return np.stack(rows)
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / total if total else 0.0,
+                "frames": len(self.frames)
+            }
+
+    def clear(self):
+        with self.lock:
+            self.frames.clear()
+
+
+frame_cache = FrameCache()
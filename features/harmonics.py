@@ -0,0 +1,42 @@
+import numpy as np
+from functools import lru_cache
+
+DEFAULT_ORDERS = (1, 2, 3)  # 1x, 2x and nx as shown in the Tabular View
+
+
+# lru_cache is thread-safe, so compute-stage workers can share the bases
+@lru_cache(maxsize=16)
+def _harmonic_basis(segment_length, orders):
+    n = np.arange(segment_length)
+    theta = (2 * np.pi * np.asarray(orders, dtype=float)[:, None] * n) / segment_length
+    basis = (np.sin(theta), np.cos(theta))
+    for arr in basis:
+        arr.setflags(write=False)
+    return basis
+
+
+def harmonic_basis(segment_length, orders=DEFAULT_ORDERS):
+    """Return cached (sin, cos) matrices of shape (len(orders), segment_length)."""
+    return _harmonic_basis(int(segment_length), tuple(orders))
+
+
+def harmonic_components(data, start_idx, end_idx, orders=DEFAULT_ORDERS):
+    """Amplitude and phase (degrees, 0-360) of each order over data[..., start_idx:end_idx].
+
+    data may be a single channel or a (channels x samples) array; the result has
+    shape (..., len(orders)). The definitions match the original per-sample loop:
+    amp = 4 * sqrt((S/N)^2 + (C/N)^2) and phase = atan2(C, S).
+    """
+    segment_length = end_idx - start_idx
+    data = np.asarray(data)
+    out_shape = data.shape[:-1] + (len(orders),)
+    if segment_length <= 0:
+        return np.zeros(out_shape), np.zeros(out_shape)
+    segment = data[..., start_idx:end_idx]
+    sin_basis, cos_basis = harmonic_basis(segment_length, orders)
+    sine_sum = segment @ sin_basis.T
+    cosine_sum = segment @ cos_basis.T
+    amplitudes = np.sqrt((sine_sum / segment_length) ** 2 + (cosine_sum / segment_length) ** 2) * 4
+    phases = np.arctan2(cosine_sum, sine_sum) * (180.0 / np.pi)
+    phases = np.where(phases < 0, phases + 360, phases)
+    return amplitudes, phases
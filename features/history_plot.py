@@ -1,4 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from lazy_log import lazy_log
 
 class HistoryPlotFeature:
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None):
@@ -29,5 +30,4 @@ class HistoryPlotFeature:
     def on_data_received(self, tag_name, model_name, values):
         if self.model_name != model_name:
             return  # Ignore data for other models
-        if self.console:
-            self.console.append_to_console(f"FFT View ({self.model_name} - {self.channel}): Received data for {tag_name} - {values}")
\ No newline at end of file
+        lazy_log.debug("history_plot", lambda: f"FFT View ({self.model_name} - {self.channel}): Received data for {tag_name} - {values}")
\ No newline at end of file
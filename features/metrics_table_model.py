@@ -0,0 +1,86 @@
+import time
+import numpy as np
+from datetime import datetime
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+TABLE_HEADERS = [
+    "RPM", "Gap", "Channel Name", "DateTime", "Direct",
+    "1x Amp", "1x Phase", "2x Amp", "2x Phase", "nx Amp", "nx Phase",
+    "Vpp", "Vrms", "Twiddle Factor"
+]
+
+# Metric behind each column; Channel Name and DateTime are not stored as numbers
+METRIC_KEYS = [
+    "rpm", "gap", None, None, "direct",
+    "1x Amp", "1x Phase", "2x Amp", "2x Phase", "nx Amp", "nx Phase",
+    "vpp", "vrms", "twiddle_factor"
+]
+METRIC_COLUMNS = {key: col for col, key in enumerate(METRIC_KEYS) if key is not None}
+
+
+class MetricsTableModel(QAbstractTableModel):
+    """Tabular View rows over a (channels x columns) float64 metrics array.
+
+    Cells are kept as numbers and only turned into text in data(), which the view calls
+    for visible cells. update_rows() writes a frame's whole block and emits a single
+    dataChanged for it, so the cost of a frame does not grow with formatting per cell.
+    """
+
+    def __init__(self, channel_names=None, parent=None):
+        super().__init__(parent)
+        self.headers = TABLE_HEADERS
+        self.channel_names = []
+        self.values = np.zeros((0, len(self.headers)))
+        self.timestamps = np.zeros(0)
+        self.formatted_time = (None, "")
+        self.set_channels(channel_names or [])
+
+    def set_channels(self, channel_names):
+        """One zeroed row per channel, stamped now."""
+        self.beginResetModel()
+        self.channel_names = list(channel_names)
+        self.values = np.zeros((len(self.channel_names), len(self.headers)))
+        self.timestamps = np.full(len(self.channel_names), time.time())
+        self.endResetModel()
+
+    def update_rows(self, values, timestamp=None, first_row=0):
+        """Write a (rows x columns) metrics block starting at first_row."""
+        values = np.atleast_2d(values)
+        rows = min(values.shape[0], len(self.channel_names) - first_row)
+        if rows <= 0:
+            return
+        last_row = first_row + rows - 1
+        self.values[first_row:last_row + 1] = values[:rows]
+        self.timestamps[first_row:last_row + 1] = time.time() if timestamp is None else timestamp
+        self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(self.headers) - 1), [Qt.DisplayRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.channel_names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        key = METRIC_KEYS[col]
+        if key is not None:
+            return f"{self.values[row, col]:.2f}"
+        if self.headers[col] == "Channel Name":
+            return self.channel_names[row]
+        return self.format_time(self.timestamps[row])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def format_time(self, timestamp):
+        # Every row of a frame shares its second, so strftime runs about once per second
+        second = int(timestamp)
+        if self.formatted_time[0] != second:
+            self.formatted_time = (second, datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S"))
+        return self.formatted_time[1]
@@ -1,8 +1,11 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QHBoxLayout
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QComboBox, QHBoxLayout, QCheckBox
 import pyqtgraph as pg
 import numpy as np
 import math
 import logging
+from features.order_tracking import track_frame
+from features.frame_cache import frame_cache
+from lazy_log import lazy_log
 
 
 class OrbitFeature:
@@ -53,6 +56,10 @@ class OrbitFeature:
         self.combo.currentIndexChanged.connect(self.on_combo_changed)
         main_layout.addWidget(self.combo)
 
+        # Synchronous orbit: one order-tracked revolution averaged over the frame
+        self.sync_checkbox = QCheckBox("Synchronous orbit (averaged revolution)")
+        main_layout.addWidget(self.sync_checkbox)
+
         # Layout for plots
         self.plot_layout = QHBoxLayout()
         main_layout.addLayout(self.plot_layout)
@@ -239,32 +246,37 @@ class OrbitFeature:
         if self.model_name != model_name:
             return
 
-        if self.console:
-            self.console.append_to_console(
-                f"Orbit View ({self.model_name}): Received data for {tag_name} - {len(values)} channels"
-            )
+        lazy_log.debug("orbit", lambda: (
+            f"Orbit View ({self.model_name}): Received data for {tag_name} - {len(values)} channels"
+        ))
 
         if not values or len(values) < 4:
-            if self.console:
-                self.console.append_to_console("Need at least 4 channels for orbit plot.")
+            lazy_log.debug("orbit", "Need at least 4 channels for orbit plot.")
             self.update_plots_with_sine_data()
             return
 
-        for i in range(min(4, len(values))):
-            self.channel_data[i] = np.array(values[i][:self.samples_per_channel])
-
-        data_lengths = [len(self.channel_data[i]) for i in range(4)]
+        data_lengths = [len(values[i]) for i in range(4)]
         if len(set(data_lengths)) != 1:
-            if self.console:
-                self.console.append_to_console(f"Mismatched data lengths: {data_lengths}")
+            lazy_log.debug("orbit", lambda: f"Mismatched data lengths: {data_lengths}")
             self.update_plots_with_sine_data()
             return
 
+        # One (4 x samples) block, shared with the other views of this frame
+        block = frame_cache.block(values, 4)[:, :self.samples_per_channel]
+        for i in range(4):
+            self.channel_data[i] = block[i]
+
         # Update orbit plot
         if self.selected_pair:
             ch_x, ch_y = self.selected_pair
             x_data = self.channel_data[ch_x]
             y_data = self.channel_data[ch_y]
+            tracked = track_frame(values, sample_rate) if self.sync_checkbox.isChecked() else None
+            if tracked is not None and ch_x in tracked.channels and ch_y in tracked.channels:
+                average = tracked.synchronous_average()
+                # Close the loop by repeating the first angle sample
+                x_data = np.append(average[tracked.row(ch_x)], average[tracked.row(ch_x)][0])
+                y_data = np.append(average[tracked.row(ch_y)], average[tracked.row(ch_y)][0])
             if self.data_plots:
                 self.data_plots[0].setData(x_data, y_data)
 
@@ -273,11 +285,9 @@ class OrbitFeature:
                 mean_radius = np.mean(radius)
                 std_radius = np.std(radius)
                 if std_radius / mean_radius < 0.01:
-                    if self.console:
-                        self.console.append_to_console(f"Orbit (Ch {ch_x+1}, Ch {ch_y+1}) is circular, radius: {mean_radius:.2f}")
+                    lazy_log.debug("orbit", lambda: f"Orbit (Ch {ch_x+1}, Ch {ch_y+1}) is circular, radius: {mean_radius:.2f}")
                 else:
-                    if self.console:
-                        self.console.append_to_console(f"Orbit (Ch {ch_x+1}, Ch {ch_y+1}) is not circular, std/mean: {std_radius/mean_radius:.4f}")
+                    lazy_log.debug("orbit", lambda: f"Orbit (Ch {ch_x+1}, Ch {ch_y+1}) is not circular, std/mean: {std_radius/mean_radius:.4f}")
 
         # Update time-domain plots
         channels_to_plot = set(self.selected_pair) if self.selected_pair else set()
@@ -0,0 +1,92 @@
+import numpy as np
+from features.frame_cache import frame_cache
+from features.harmonics import harmonic_components
+from features.trigger_detection import frame_triggers
+
+DEFAULT_SAMPLES_PER_REV = 256
+
+
+def resample_revolutions(data, triggers, samples_per_rev=DEFAULT_SAMPLES_PER_REV):
+    """Resample (channels x samples) data to (channels x revolutions x samples_per_rev).
+
+    Each revolution between consecutive triggers is sampled at samples_per_rev equally
+    spaced shaft angles by linear interpolation, for all channels in one gather.
+    """
+    data = np.atleast_2d(np.asarray(data, dtype=np.float32))
+    triggers = np.asarray(triggers, dtype=float)
+    revolutions = len(triggers) - 1
+    if revolutions < 1:
+        return np.zeros((data.shape[0], 0, samples_per_rev), dtype=np.float32)
+    fractions = np.arange(samples_per_rev) / samples_per_rev
+    positions = triggers[:-1, None] + np.diff(triggers)[:, None] * fractions[None, :]
+    positions = positions.ravel()
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, data.shape[1] - 1)
+    # Positions need float64 to address long records; the samples and weights do not
+    weight = (positions - lower).astype(np.float32)
+    resampled = data[:, lower] * (1.0 - weight) + data[:, upper] * weight
+    return resampled.reshape(data.shape[0], revolutions, samples_per_rev)
+
+
+class OrderTrackedFrame:
+    """Angle-domain view of one frame: channels x revolutions x samples_per_rev."""
+
+    def __init__(self, channels, triggers, angle_data, sample_rate):
+        self.channels = channels
+        self.triggers = triggers
+        self.angle_data = angle_data
+        self.sample_rate = sample_rate
+        self.revolutions = angle_data.shape[1]
+        self.samples_per_rev = angle_data.shape[2]
+        self.revolution_rpm = 60.0 * sample_rate / np.diff(triggers) if len(triggers) > 1 else np.zeros(0)
+        self.rpm = float(np.mean(self.revolution_rpm)) if self.revolution_rpm.size else 0.0
+        self._synchronous = None
+
+    def row(self, channel):
+        return self.channels.index(channel)
+
+    def synchronous_average(self):
+        """Mean revolution per channel, shape (channels, samples_per_rev)."""
+        if self._synchronous is None:
+            self._synchronous = self.angle_data.mean(axis=1)
+            self._synchronous.setflags(write=False)
+        return self._synchronous
+
+    def order_components(self, orders=(1, 2, 3)):
+        """Amplitude (pk-pk, same convention as harmonic_components) and phase of each shaft order."""
+        average = self.synchronous_average()
+        return harmonic_components(average, 0, self.samples_per_rev, orders)
+
+    def order_spectrum(self, channel):
+        """(orders, amplitude) over all revolutions of one channel; order resolution is 1 / revolutions."""
+        record = self.angle_data[self.row(channel)].ravel()
+        spectrum = np.abs(np.fft.rfft(record)) * (4.0 / record.size)
+        spectrum[0] /= 4.0  # DC is a mean, not a pk-pk amplitude
+        orders = np.arange(spectrum.size) / self.revolutions
+        return orders, spectrum
+
+
+def track_frame(frame, sample_rate, channels=None, samples_per_rev=DEFAULT_SAMPLES_PER_REV):
+    """Order-track a frame, cached per frame; None when fewer than two triggers are found.
+
+    The trigger is the last channel of the frame and the main channels precede the two
+    tacho channels, so by default every channel except the last two is resampled.
+    """
+    if channels is None:
+        channels = tuple(range(max(len(frame) - 2, 1)))
+    channels = tuple(channels)
+
+    def compute():
+        triggers = frame_triggers(frame, sample_rate).indices
+        if len(triggers) < 2:
+            return None
+        length = min(len(frame[ch]) for ch in channels)
+        triggers = triggers[triggers < length]
+        data = np.asarray([np.asarray(frame[ch][:length], dtype=np.float32) for ch in channels])
+        angle_data = resample_revolutions(data, triggers, samples_per_rev)
+        if angle_data.shape[1] < 1:
+            return None
+        angle_data.setflags(write=False)
+        return OrderTrackedFrame(list(channels), triggers, angle_data, sample_rate)
+
+    return frame_cache.get(frame, ("order_track", channels, samples_per_rev, sample_rate), compute)
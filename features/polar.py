@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
 import pyqtgraph as pg
 import numpy as np
 from PyQt5.QtCore import QTimer
+from features.order_tracking import track_frame
+from lazy_log import lazy_log
 
 class PolarPlotFeature:
     def __init__(self, parent=None, db=None, project_name='', channel=0, model_name=None, console=None):
@@ -69,27 +71,32 @@ class PolarPlotFeature:
 
     def on_data_received(self, tag_name, model_name, values, sample_rate):
         if self.model_name != model_name:
-            if self.console:
-                self.console.append_to_console(f"Ignoring data for model {model_name}, expected {self.model_name}")
+            lazy_log.debug("polar", lambda: f"Ignoring data for model {model_name}, expected {self.model_name}")
             return
 
-        if self.console:
-            self.console.append_to_console(
-                f"Polar Plot View ({self.model_name} - Channel {self.channel}): Received data for {tag_name}, {len(values)} channels"
-            )
+        lazy_log.debug("polar", lambda: (
+            f"Polar Plot View ({self.model_name} - Channel {self.channel}): Received data for {tag_name}, {len(values)} channels"
+        ))
 
         # Validate and extract data
         if not isinstance(values, list) or self.channel >= len(values):
-            if self.console:
-                self.console.append_to_console(f"Invalid channel {self.channel} or values for {tag_name}")
+            lazy_log.debug("polar", lambda: f"Invalid channel {self.channel} or values for {tag_name}")
             return
 
-        data = np.asarray(values[self.channel], dtype=float)
+        data = np.asarray(values[self.channel], dtype=np.float32)
         if data.size == 0:
-            if self.console:
-                self.console.append_to_console(f"No data for channel {self.channel} in {tag_name}")
+            lazy_log.debug("polar", lambda: f"No data for channel {self.channel} in {tag_name}")
             return
 
+        # With tacho triggers, plot the synchronously averaged revolution against shaft angle
+        tracked = track_frame(values, sample_rate)
+        if tracked is not None and self.channel in tracked.channels:
+            data = tracked.synchronous_average()[tracked.row(self.channel)]
+            data = data - np.mean(data)
+            title = f"Polar Plot - {tag_name} (Channel {self.channel}, {tracked.revolutions} rev avg, {tracked.rpm:.0f} RPM)"
+        else:
+            title = f"Polar Plot - {tag_name} (Channel {self.channel})"
+
         # Prepare polar plot data
         theta = np.linspace(0, 2 * np.pi, len(data), endpoint=False)
         r = data / (np.max(np.abs(data)) + 1e-12)  # Normalize to avoid division by zero
@@ -102,6 +109,5 @@ class PolarPlotFeature:
         self.curve.clear()
         self.curve = self.plot_widget.plot(x, y, pen=pg.mkPen('b', width=2), symbol='o', symbolSize=5, symbolPen='b', symbolBrush='b')
         self.plot_widget.setRange(xRange=[-1.5, 1.5], yRange=[-1.5, 1.5])  # Reset range to prevent zoom issues
-        self.plot_widget.setTitle(f"Polar Plot - {tag_name} (Channel {self.channel})")
-        if self.console:
-            self.console.append_to_console(f"Plotted {len(data)} points for channel {self.channel}")
\ No newline at end of file
+        self.plot_widget.setTitle(title)
+        lazy_log.debug("polar", lambda: f"Plotted {len(data)} points for channel {self.channel}")
\ No newline at end of file
@@ -0,0 +1,92 @@
+import sys
+import time
+import logging
+import importlib
+import threading
+
+# Display name -> (module, class). Modules are imported the first time a feature is opened.
+FEATURE_MODULES = {
+    "Tabular View": ("features.tabular_view", "TabularViewFeature"),
+    "Time View": ("features.time_view", "TimeViewFeature"),
+    "Time Report": ("features.time_report", "TimeReportFeature"),
+    "FFT": ("features.fft_view", "FFTViewFeature"),
+    "Waterfall": ("features.waterfall", "WaterfallFeature"),
+    "Centerline": ("features.centerline", "CenterLineFeature"),
+    "Orbit": ("features.orbit", "OrbitFeature"),
+    "Trend View": ("features.trend_view", "TrendViewFeature"),
+    "Multiple Trend View": ("features.multi_trend", "MultiTrendFeature"),
+    "Bode Plot": ("features.bode_plot", "BodePlotFeature"),
+    "History Plot": ("features.history_plot", "HistoryPlotFeature"),
+    "Polar Plot": ("features.polar", "PolarPlotFeature"),
+    "Report": ("features.report", "ReportFeature"),
+}
+
+# Shared dependencies of the feature modules, slowest first
+WARMUP_MODULES = ["scipy.signal", "scipy.fft", "pyqtgraph"]
+
+
+class FeatureRegistry:
+    """Feature classes by display name, imported on first use.
+
+    Nothing heavy is imported until get() or the warm-up thread asks for it, so the login
+    window does not wait for scipy and pyqtgraph. Python's per-module import locks make
+    get() safe while the warm-up is running: it simply waits for that module to finish.
+    """
+
+    def __init__(self, modules=FEATURE_MODULES):
+        self.modules = dict(modules)
+        self.classes = {}
+        self.import_times = {}
+        self.warmup_thread = None
+
+    def __contains__(self, name):
+        return name in self.modules
+
+    def names(self):
+        return list(self.modules)
+
+    def get(self, name):
+        """Class of a feature; raises KeyError for unknown names and ImportError if it cannot load."""
+        feature_class = self.classes.get(name)
+        if feature_class is None:
+            module_name, class_name = self.modules[name]
+            feature_class = getattr(self.import_module(module_name), class_name)
+            self.classes[name] = feature_class
+        return feature_class
+
+    def import_module(self, module_name):
+        # A module is in sys.modules while another thread is still running its body, so
+        # always go through import_module, which waits for that import to finish
+        already_loaded = module_name in sys.modules
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        if not already_loaded:
+            elapsed = time.perf_counter() - start
+            self.import_times[module_name] = elapsed
+            logging.info(f"Imported {module_name} in {elapsed * 1000:.0f} ms")
+        return module
+
+    def start_warmup(self, extra_modules=()):
+        """Import extra_modules, the shared dependencies and every feature module on a daemon thread.
+
+        Call it once the first window has painted; later calls return the running thread.
+        """
+        if self.warmup_thread is not None:
+            return self.warmup_thread
+        module_names = list(extra_modules) + WARMUP_MODULES + [module for module, _ in self.modules.values()]
+        self.warmup_thread = threading.Thread(target=self.warm_up, args=(module_names,), name="feature-warmup", daemon=True)
+        self.warmup_thread.start()
+        return self.warmup_thread
+
+    def warm_up(self, module_names):
+        start = time.perf_counter()
+        for module_name in module_names:
+            try:
+                self.import_module(module_name)
+            except Exception as e:
+                # The feature reports the error itself when it is opened
+                logging.warning(f"Warm-up could not import {module_name}: {str(e)}")
+        logging.info(f"Feature warm-up finished in {time.perf_counter() - start:.2f} s")
+
+
+feature_registry = FeatureRegistry()
@@ -0,0 +1,88 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity (channels x capacity) sample ring with an implied time axis.
+
+    write() copies only the new samples, so its cost does not depend on the capacity.
+    Sample times are not stored: absolute sample n was taken at start_time + n * sample_period.
+    With double_mapped every sample is also written capacity slots further on, so the
+    latest window is always one contiguous view of the backing array; otherwise read()
+    returns a view unless the window wraps, in which case it returns a copy.
+    """
+
+    def __init__(self, channels, capacity, sample_period=1.0, start_time=0.0, dtype=np.float32, double_mapped=True):
+        self.channels = channels
+        self.capacity = int(capacity)
+        self.sample_period = sample_period
+        self.start_time = start_time
+        self.double_mapped = double_mapped
+        self.buffer = np.zeros((channels, 2 * self.capacity if double_mapped else self.capacity), dtype=dtype)
+        self.write_index = 0
+        # Absolute index one past the newest sample. The ring starts full of zeros,
+        # so the first window covers [start_time, start_time + capacity * sample_period).
+        self.count = self.capacity
+
+    def _store(self, index, part):
+        width = part.shape[1]
+        self.buffer[:, index:index + width] = part
+        if self.double_mapped:
+            self.buffer[:, self.capacity + index:self.capacity + index + width] = part
+
+    def write(self, block):
+        """Append a (channels x n) block; returns the absolute index of its first sample."""
+        block = np.asarray(block, dtype=self.buffer.dtype)
+        if block.ndim == 1:
+            block = block[None, :]
+        n = block.shape[1]
+        first_index = self.count
+        if n >= self.capacity:
+            # Only the last capacity samples can survive
+            self.count += n - self.capacity
+            block = block[:, -self.capacity:]
+            n = self.capacity
+        first = min(n, self.capacity - self.write_index)
+        self._store(self.write_index, block[:, :first])
+        if first < n:
+            self._store(0, block[:, first:])
+        self.write_index = (self.write_index + n) % self.capacity
+        self.count += n
+        return first_index
+
+    def read(self, channel=None):
+        """Window in chronological order, shape (channels, capacity), or (capacity,) for one channel."""
+        rows = slice(None) if channel is None else channel
+        start = self.write_index
+        if self.double_mapped:
+            return self.buffer[rows, start:start + self.capacity]
+        if start == 0:
+            return self.buffer[rows, :self.capacity]
+        return np.concatenate((self.buffer[rows, start:self.capacity], self.buffer[rows, :start]), axis=-1)
+
+    def first_index(self):
+        return self.count - self.capacity
+
+    def times(self):
+        """float64 times of the window's samples."""
+        return self.start_time + np.arange(self.first_index(), self.count) * self.sample_period
+
+    def time_of(self, index):
+        return self.start_time + np.asarray(index) * self.sample_period
+
+    def window_start(self):
+        return self.time_of(self.first_index())
+
+    def window_end(self):
+        return self.time_of(self.count - 1)
+
+    def resize(self, capacity):
+        """Change capacity keeping the newest samples; a grown window is zero-filled at the old end."""
+        capacity = int(capacity)
+        if capacity == self.capacity:
+            return
+        window = self.read()
+        keep = min(capacity, self.capacity)
+        self.capacity = capacity
+        self.buffer = np.zeros((self.channels, 2 * capacity if self.double_mapped else capacity), dtype=self.buffer.dtype)
+        self.write_index = 0
+        self._store(capacity - keep, window[:, -keep:])
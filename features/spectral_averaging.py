@@ -0,0 +1,322 @@
+import numpy as np
+from scipy.fft import rfft
+from features.frame_cache import frame_cache, cached_window
+from features.filter_bank import design_fir, StreamingFIR
+from features.order_tracking import track_frame, DEFAULT_SAMPLES_PER_REV
+
+MIN_FFT_SIZE = 64
+MAX_FFT_SIZE = 65536
+
+
+def fft_size_for(sample_rate, stop_frequency, number_of_lines):
+    """Smallest power-of-two FFT whose bin width is at most stop_frequency / number_of_lines."""
+    resolution = stop_frequency / max(number_of_lines, 1)
+    required = sample_rate / resolution if resolution > 0 else MAX_FFT_SIZE
+    size = 2 ** int(np.ceil(np.log2(max(required, MIN_FFT_SIZE))))
+    return int(min(max(size, MIN_FFT_SIZE), MAX_FFT_SIZE))
+
+
+class SpectralAverager:
+    """Welch-style averaging of one channel's stream.
+
+    Incoming samples are cut into nfft-long segments advanced by the overlap hop. Each
+    segment is transformed exactly once and folded into running accumulators, so the
+    cost per segment is O(nfft log nfft + bins) whatever number_of_averages is.
+    """
+
+    def __init__(self):
+        self.sample_rate = None
+        self.window = None
+        self.nfft = 0
+        self.hop = 0
+        self.mode = "No Averaging"
+        self.number_of_averages = 1
+        self.config = None
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.dirty = False
+        self.reset()
+
+    def configure(self, sample_rate, window, start_frequency, stop_frequency, number_of_lines, overlap_percentage, averaging_mode, number_of_averages):
+        """Apply settings; accumulated averages are dropped only if something changed.
+
+        Baseband transforms always start at 0 Hz, so start_frequency only matters for zoom.
+        """
+        nfft = fft_size_for(sample_rate, stop_frequency, number_of_lines)
+        overlap = min(max(overlap_percentage, 0.0), 99.9) / 100.0
+        hop = max(1, int(round(nfft * (1.0 - overlap))))
+        config = (sample_rate, window, nfft, hop, averaging_mode, number_of_averages)
+        if config == self.config:
+            return
+        self.config = config
+        self.sample_rate = sample_rate
+        self.window = window
+        self.nfft = nfft
+        self.hop = hop
+        self.mode = averaging_mode
+        self.number_of_averages = max(1, int(number_of_averages))
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.reset()
+
+    def bin_count(self):
+        return self.nfft // 2 + 1 if self.nfft else 0
+
+    def reset(self):
+        bins = self.bin_count()
+        self.latest_magnitude = None
+        self.latest_phase = None
+        self.segments = 0
+        # Linear: ring of the last number_of_averages segments plus running sums
+        self.ring_magnitude = np.zeros((self.number_of_averages, bins))
+        self.ring_phase = np.zeros((self.number_of_averages, bins))
+        self.sum_magnitude = np.zeros(bins)
+        self.sum_phase = np.zeros(bins)
+        self.ring_index = 0
+        # Exponential and peak hold
+        self.exp_magnitude = None
+        self.exp_phase = None
+        self.peak_magnitude = None
+        self.dirty = True
+
+    def feed(self, frame, channel, n):
+        """Consume frame[channel][:n]; returns the number of segments added."""
+        if not self.nfft:
+            return 0
+        if self.hop == self.nfft and n == self.nfft and self.pending.size == 0:
+            # Segment is exactly this frame, so the transform can be shared with other views
+            self.add_spectrum(frame_cache.spectrum(frame, channel, self.window, self.nfft, 0, n))
+            return 1
+
+        return self.feed_samples(np.asarray(frame[channel][:n], dtype=np.float32))
+
+    def feed_samples(self, samples):
+        """Append samples to the stream and average every complete segment."""
+        self.pending = np.concatenate((self.pending, samples)) if self.pending.size else samples
+        window = cached_window(self.window, self.nfft)
+        added = 0
+        start = 0
+        while start + self.nfft <= self.pending.size:
+            segment = self.pending[start:start + self.nfft]
+            self.add_spectrum(self.transform(segment * window if window is not None else segment))
+            start += self.hop
+            added += 1
+        self.pending = self.pending[start:] if start < self.pending.size else self.pending[:0]
+        return added
+
+    def transform(self, segment):
+        return rfft(segment)
+
+    def add_spectrum(self, spectrum):
+        magnitude = np.abs(spectrum) / self.nfft
+        phase = np.angle(spectrum, deg=True)
+        self.latest_magnitude = magnitude
+        self.latest_phase = phase
+
+        if self.mode == "Linear":
+            i = self.ring_index
+            self.sum_magnitude += magnitude - self.ring_magnitude[i]
+            self.sum_phase += phase - self.ring_phase[i]
+            self.ring_magnitude[i] = magnitude
+            self.ring_phase[i] = phase
+            self.ring_index = (i + 1) % self.number_of_averages
+            if self.ring_index == 0:
+                # Re-sum once per lap so rounding in the running sums cannot build up
+                self.sum_magnitude = self.ring_magnitude.sum(axis=0)
+                self.sum_phase = self.ring_phase.sum(axis=0)
+        elif self.mode == "Exponential":
+            alpha = 2.0 / (self.number_of_averages + 1)
+            if self.exp_magnitude is None:
+                self.exp_magnitude = magnitude.copy()
+                self.exp_phase = phase.copy()
+            else:
+                self.exp_magnitude += alpha * (magnitude - self.exp_magnitude)
+                self.exp_phase += alpha * (phase - self.exp_phase)
+
+        if self.peak_magnitude is None:
+            self.peak_magnitude = magnitude.copy()
+        else:
+            np.maximum(self.peak_magnitude, magnitude, out=self.peak_magnitude)
+
+        self.segments += 1
+        self.dirty = True
+
+    def frequencies(self):
+        return np.arange(self.bin_count()) * (self.sample_rate / self.nfft)
+
+    def result(self, peak_hold=False):
+        """Return (frequencies, magnitudes, phases) for the current mode, or None before the first segment.
+
+        With peak_hold the magnitude is the per-bin maximum over every segment since the last reset.
+        """
+        if self.latest_magnitude is None:
+            return None
+        if peak_hold:
+            magnitude = self.peak_magnitude
+            phase = self.latest_phase
+        elif self.mode == "Linear":
+            count = min(self.segments, self.number_of_averages)
+            magnitude = self.sum_magnitude / count
+            phase = self.sum_phase / count
+        elif self.mode == "Exponential":
+            magnitude = self.exp_magnitude
+            phase = self.exp_phase
+        else:
+            magnitude = self.latest_magnitude
+            phase = self.latest_phase
+        return self.frequencies(), magnitude, phase
+
+
+class ZoomAverager(SpectralAverager):
+    """Zoom FFT: heterodyne the band centre to 0 Hz, low-pass and decimate, then average
+    complex FFTs of the slow stream.
+
+    Only the [start, stop] span is transformed, so number_of_lines bins cover the span
+    with an FFT sized for the span rather than for the full sample rate. The mixer phase,
+    filter state and decimation phase all carry over between frames.
+    """
+
+    def __init__(self):
+        self.decimation = 1
+        self.center_frequency = 0.0
+        self.span = 0.0
+        self.base_rate = None
+        self.mixer_phase = 0.0
+        self.decimation_offset = 0
+        self.lowpass = None
+        self.zoom_config = None
+        super().__init__()
+
+    def configure(self, sample_rate, window, start_frequency, stop_frequency, number_of_lines, overlap_percentage, averaging_mode, number_of_averages):
+        span = max(stop_frequency - start_frequency, 1e-6)
+        center = (start_frequency + stop_frequency) / 2.0
+        # Complex output rate at least 1.28 x span leaves room for the filter transition band
+        decimation = max(1, int(sample_rate // (1.28 * span)))
+        config = (sample_rate, window, center, span, number_of_lines, overlap_percentage, averaging_mode, number_of_averages)
+        if config == self.zoom_config:
+            return
+        self.zoom_config = config
+        self.base_rate = sample_rate
+        self.center_frequency = center
+        self.span = span
+        self.decimation = decimation
+        self.mixer_phase = 0.0
+        self.decimation_offset = 0
+        self.lowpass = None
+        if decimation > 1:
+            taps = min(16 * decimation + 1, 2049)
+            coeffs, step_zi = design_fir(sample_rate, 0.5 * sample_rate / decimation * 0.8, taps=taps)
+            self.lowpass = StreamingFIR(coeffs, step_zi)
+        slow_rate = sample_rate / decimation
+        # At the decimated rate this sizes the FFT for a bin width of span / lines
+        super().configure(slow_rate, window, 0.0, span, number_of_lines, overlap_percentage, averaging_mode, number_of_averages)
+
+    def feed(self, frame, channel, n):
+        if not self.nfft:
+            return 0
+        samples = np.asarray(frame[channel][:n], dtype=np.float32)
+        step = 2 * np.pi * self.center_frequency / self.base_rate
+        # The mixer phase is accumulated in float64; the mixed stream itself is complex64
+        mixed = samples * np.exp(-1j * (self.mixer_phase + step * np.arange(samples.size))).astype(np.complex64)
+        self.mixer_phase = (self.mixer_phase + step * samples.size) % (2 * np.pi)
+        if self.lowpass is not None:
+            filtered = self.lowpass.process(0, mixed)
+            decimated = filtered[self.decimation_offset::self.decimation]
+            self.decimation_offset = (self.decimation_offset - samples.size) % self.decimation
+        else:
+            decimated = mixed
+        return self.feed_samples(decimated)
+
+    def bin_count(self):
+        return self.nfft
+
+    def transform(self, segment):
+        return np.fft.fftshift(np.fft.fft(segment))
+
+    def frequencies(self):
+        return self.center_frequency + np.fft.fftshift(np.fft.fftfreq(self.nfft, 1.0 / self.sample_rate))
+
+
+class SynchronousAverager:
+    """Time-synchronous averaging: revolutions are averaged in the angle domain before
+    a single FFT of the mean revolution.
+
+    Components that are not locked to shaft speed cancel in the average, so one
+    samples_per_rev FFT per frame replaces the per-segment transforms of spectral
+    averaging. Bins are shaft orders; frequencies follow the averaged RPM.
+    """
+
+    def __init__(self):
+        self.sample_rate = None
+        self.nfft = DEFAULT_SAMPLES_PER_REV
+        self.mode = "No Averaging"
+        self.number_of_averages = 1
+        self.config = None
+        self.dirty = False
+        self.reset()
+
+    def configure(self, sample_rate, window, start_frequency, stop_frequency, number_of_lines, overlap_percentage, averaging_mode, number_of_averages):
+        """Window, lines and overlap do not apply: every record is exactly one revolution."""
+        config = (sample_rate, averaging_mode, number_of_averages)
+        if config == self.config:
+            return
+        self.config = config
+        self.sample_rate = sample_rate
+        self.mode = averaging_mode
+        self.number_of_averages = max(1, int(number_of_averages))
+        self.reset()
+
+    def reset(self):
+        self.segments = 0
+        self.latest = None
+        self.rpm = 0.0
+        # Linear: per-frame revolution sums and counts for the last number_of_averages frames
+        self.ring_sum = np.zeros((self.number_of_averages, self.nfft))
+        self.ring_count = np.zeros(self.number_of_averages)
+        self.ring_rpm = np.zeros(self.number_of_averages)
+        self.ring_index = 0
+        self.exp_revolution = None
+        self.dirty = True
+
+    def feed(self, frame, channel, n):
+        """Average the order-tracked revolutions of frame[channel]; returns the revolutions added."""
+        tracked = track_frame(frame, self.sample_rate)
+        if tracked is None or channel not in tracked.channels:
+            return 0
+        revolutions = tracked.angle_data[tracked.row(channel)]
+        average = tracked.synchronous_average()[tracked.row(channel)]
+        self.latest = average
+        if self.mode == "Linear":
+            i = self.ring_index
+            self.ring_sum[i] = revolutions.sum(axis=0)
+            self.ring_count[i] = tracked.revolutions
+            self.ring_rpm[i] = tracked.rpm * tracked.revolutions
+            self.ring_index = (i + 1) % self.number_of_averages
+            count = self.ring_count.sum()
+            self.rpm = self.ring_rpm.sum() / count
+        elif self.mode == "Exponential":
+            alpha = 2.0 / (self.number_of_averages + 1)
+            if self.exp_revolution is None:
+                self.exp_revolution = average.copy()
+                self.rpm = tracked.rpm
+            else:
+                self.exp_revolution += alpha * (average - self.exp_revolution)
+                self.rpm += alpha * (tracked.rpm - self.rpm)
+        else:
+            self.rpm = tracked.rpm
+        self.segments += tracked.revolutions
+        self.dirty = True
+        return tracked.revolutions
+
+    def revolution(self):
+        if self.mode == "Linear":
+            return self.ring_sum.sum(axis=0) / self.ring_count.sum()
+        if self.mode == "Exponential":
+            return self.exp_revolution
+        return self.latest
+
+    def result(self, peak_hold=False):
+        """Return (frequencies, magnitudes, phases) of the averaged revolution, or None before the first frame."""
+        if self.latest is None or self.rpm <= 0:
+            return None
+        spectrum = rfft(self.revolution())
+        orders = np.arange(spectrum.size)
+        return orders * (self.rpm / 60.0), np.abs(spectrum) / self.nfft, np.angle(spectrum, deg=True)
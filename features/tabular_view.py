@@ -770,14 +770,24 @@
 
 
 import numpy as np
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QScrollArea, QPushButton, QCheckBox, QComboBox, QGridLayout, QHBoxLayout, QLabel
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QScrollArea, QPushButton, QCheckBox, QComboBox, QGridLayout, QHBoxLayout, QLabel
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
 import pyqtgraph as pg
 from datetime import datetime
+import time
+from collections import deque
 from pymongo import MongoClient
-import scipy.signal as signal
 import logging
+from features.harmonics import harmonic_components
+from features.order_tracking import track_frame, resample_revolutions
+from features.trigger_detection import detect_triggers, frame_triggers
+from features.filter_bank import FilterBank, BANDPASS_OPTIONS
+from scipy.fft import rfft
+from features.frame_cache import frame_cache
+from features.compute_stage import Frame
+from features.metrics_table_model import MetricsTableModel, TABLE_HEADERS, METRIC_COLUMNS
+from lazy_log import lazy_log
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -816,15 +826,17 @@ class TabularViewFeature:
         self.channel_names = ["Channel 1"]  # Default
         self.channel_properties = {}
         self.project_id = None
-        self.raw_data = [np.zeros(4096)]
-        self.low_pass_data = [np.zeros(4096)]
-        self.high_pass_data = [np.zeros(4096)]
-        self.band_pass_data = [np.zeros(4096)]
+        self.raw_data = [np.zeros(4096, dtype=np.float32)]
+        self.low_pass_data = [np.zeros(4096, dtype=np.float32)]
+        self.high_pass_data = [np.zeros(4096, dtype=np.float32)]
+        self.band_pass_data = [np.zeros(4096, dtype=np.float32)]
         self.time_points = np.arange(4096) / self.sample_rate
         self.band_pass_peak_to_peak_history = [[]]
         self.band_pass_peak_to_peak_times = [[]]
         self.average_frequency = [0.0]
         self.band_pass_peak_to_peak = [0.0]
+        # (elapsed, per-channel peak-to-peak) per computed frame, drained into the history by render()
+        self.pending_peak_to_peak = deque(maxlen=1000)
         self.start_time = datetime.now()
         self.column_visibility = {
             "RPM": True,
@@ -843,9 +855,12 @@ class TabularViewFeature:
             "Twiddle Factor": True
         }
         self.bandpass_selection = "None"
+        self.filter_bank = FilterBank()
+        self.calibration_gains = None
         self.mongo_client = MongoClient("mongodb://localhost:27017")
         self.plot_initialized = False
         self.table = None
+        self.table_model = None
         self.plot_widgets = []
         self.plots = []
         self.selected_channel_idx = 0
@@ -888,15 +903,11 @@ class TabularViewFeature:
 
         # Bandpass selection
         self.bandpass_combo = QComboBox()
-        self.bandpass_combo.addItems(["None", "50-200 Hz", "100-300 Hz"])
+        self.bandpass_combo.addItems(list(BANDPASS_OPTIONS.keys()))
         settings_layout.addWidget(self.bandpass_combo, 0, 0, 1, 2)
 
         # Checkboxes for column visibility
-        headers = [
-            "RPM", "Gap", "Channel Name", "DateTime", "Direct",
-            "1x Amp", "1x Phase", "2x Amp", "2x Phase", "nx Amp", "nx Phase",
-            "Vpp", "Vrms", "Twiddle Factor"
-        ]
+        headers = TABLE_HEADERS
         self.checkbox_dict = {}
         for i, header in enumerate(headers):
             cb = QCheckBox(header)
@@ -914,36 +925,13 @@ class TabularViewFeature:
 
         layout.addWidget(self.settings_panel)
 
-        # Table setup
-        self.table = QTableWidget()
-        self.table.setRowCount(self.num_channels)
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        # Table setup: a view over the metrics model, which formats only the visible cells
+        self.table_model = MetricsTableModel(self.channel_names)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.setFixedHeight(100 * self.num_channels)  # Adjust height for rows
         layout.addWidget(self.table)
 
-        # Initialize table with default values
-        default_data = {
-            "Channel Name": "N/A",
-            "DateTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "RPM": "0.00",
-            "Gap": "0.00",
-            "Direct": "0.00",
-            "1x Amp": "0.00",
-            "1x Phase": "0.00",
-            "2x Amp": "0.00",
-            "2x Phase": "0.00",
-            "nx Amp": "0.00",
-            "nx Phase": "0.00",
-            "Vpp": "0.00",
-            "Vrms": "0.00",
-            "Twiddle Factor": "0.00"
-        }
-        for row in range(self.num_channels):
-            default_data["Channel Name"] = self.channel_names[row] if row < len(self.channel_names) else f"Channel {row+1}"
-            for col, header in enumerate(headers):
-                self.table.setItem(row, col, QTableWidgetItem(default_data[header]))
-
         # Scroll area for plots
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -1017,7 +1005,6 @@ class TabularViewFeature:
                 self.log_and_set_status(f"Project {self.project_name} not found for email {self.db.email}. Using default channel.")
                 self.channel_names = ["Channel 1"]
                 self.num_channels = 1
-                self.table.setRowCount(1)
                 self.channel_selector.clear()
                 self.channel_selector.addItem("Select Channel")
                 self.channel_selector.addItems(self.channel_names)
@@ -1033,7 +1020,6 @@ class TabularViewFeature:
                 self.log_and_set_status(f"Model {self.model_name} or channels not found in project {self.project_name}. Using default channel.")
                 self.channel_names = ["Channel 1"]
                 self.num_channels = 1
-                self.table.setRowCount(1)
                 self.channel_selector.clear()
                 self.channel_selector.addItem("Select Channel")
                 self.channel_selector.addItems(self.channel_names)
@@ -1050,8 +1036,7 @@ class TabularViewFeature:
                 self.channel_names = ["Channel 1"]
                 self.num_channels = 1
 
-            # Update table and selector
-            self.table.setRowCount(self.num_channels)
+            # Update selector; the table rows follow in update_table_defaults
             self.channel_selector.clear()
             self.channel_selector.addItem("Select Channel")
             self.channel_selector.addItems(self.channel_names)
@@ -1078,6 +1063,7 @@ class TabularViewFeature:
                     "Gain": gain,
                     "Sensitivity": sensitivity
                 }
+            self.calibration_gains = None
 
             self.tag_name = model.get("tagName", "")
             if self.console:
@@ -1090,7 +1076,6 @@ class TabularViewFeature:
             self.log_and_set_status(f"Error initializing TabularView: {str(ex)}")
             self.channel_names = ["Channel 1"]
             self.num_channels = 1
-            self.table.setRowCount(1)
             self.channel_selector.clear()
             self.channel_selector.addItem("Select Channel")
             self.channel_selector.addItems(self.channel_names)
@@ -1100,42 +1085,21 @@ class TabularViewFeature:
             self.initialize_plots()
 
     def initialize_data_arrays(self):
-        self.raw_data = [np.zeros(4096) for _ in range(self.num_channels)]
-        self.low_pass_data = [np.zeros(4096) for _ in range(self.num_channels)]
-        self.high_pass_data = [np.zeros(4096) for _ in range(self.num_channels)]
-        self.band_pass_data = [np.zeros(4096) for _ in range(self.num_channels)]
+        self.raw_data = [np.zeros(4096, dtype=np.float32) for _ in range(self.num_channels)]
+        self.low_pass_data = [np.zeros(4096, dtype=np.float32) for _ in range(self.num_channels)]
+        self.high_pass_data = [np.zeros(4096, dtype=np.float32) for _ in range(self.num_channels)]
+        self.band_pass_data = [np.zeros(4096, dtype=np.float32) for _ in range(self.num_channels)]
         self.band_pass_peak_to_peak_history = [[] for _ in range(self.num_channels)]
         self.band_pass_peak_to_peak_times = [[] for _ in range(self.num_channels)]
         self.average_frequency = [0.0 for _ in range(self.num_channels)]
         self.band_pass_peak_to_peak = [0.0 for _ in range(self.num_channels)]
+        self.pending_peak_to_peak.clear()
         self.time_points = np.arange(4096) / self.sample_rate
 
     def update_table_defaults(self):
-        headers = [
-            "RPM", "Gap", "Channel Name", "DateTime", "Direct",
-            "1x Amp", "1x Phase", "2x Amp", "2x Phase", "nx Amp", "nx Phase",
-            "Vpp", "Vrms", "Twiddle Factor"
-        ]
-        default_data = {
-            "Channel Name": "N/A",
-            "DateTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "RPM": "0.00",
-            "Gap": "0.00",
-            "Direct": "0.00",
-            "1x Amp": "0.00",
-            "1x Phase": "0.00",
-            "2x Amp": "0.00",
-            "2x Phase": "0.00",
-            "nx Amp": "0.00",
-            "nx Phase": "0.00",
-            "Vpp": "0.00",
-            "Vrms": "0.00",
-            "Twiddle Factor": "0.00"
-        }
-        for row in range(self.num_channels):
-            default_data["Channel Name"] = self.channel_names[row] if row < len(self.channel_names) else f"Channel {row+1}"
-            for col, header in enumerate(headers):
-                self.table.setItem(row, col, QTableWidgetItem(default_data[header]))
+        self.table_model.set_channels([
+            self.channel_names[row] if row < len(self.channel_names) else f"Channel {row+1}" for row in range(self.num_channels)
+        ])
         self.table.setFixedHeight(100 * self.num_channels)
         if self.console:
             self.console.append_to_console(f"Updated table with {self.num_channels} rows for channels: {self.channel_names}")
@@ -1231,272 +1195,255 @@ class TabularViewFeature:
         self.settings_button.setVisible(True)
 
     def update_column_visibility(self):
-        headers = [
-            "RPM", "Gap", "Channel Name", "DateTime", "Direct",
-            "1x Amp", "1x Phase", "2x Amp", "2x Phase", "nx Amp", "nx Phase",
-            "Vpp", "Vrms", "Twiddle Factor"
-        ]
-        for col, header in enumerate(headers):
+        for col, header in enumerate(TABLE_HEADERS):
             try:
                 self.table.setColumnHidden(col, not self.column_visibility[header])
             except KeyError as e:
                 self.log_and_set_status(f"KeyError in update_column_visibility: {str(e)}")
 
-    def calculate_metrics(self, channel_data, tacho_trigger_data, channel_idx):
-        metrics = {
-            "rpm": 0.0, "gap": 0.0, "direct": 0.0, "1x Amp": 0.0, "1x Phase": 0.0,
-            "2x Amp": 0.0, "2x Phase": 0.0, "nx Amp": 0.0, "nx Phase": 0.0,
-            "vpp": 0.0, "vrms": 0.0, "twiddle_factor": 0.0
-        }
+    def calculate_metrics(self, channel_block, tacho_trigger_data, frame=None, trigger_info=None):
+        """Metrics of every row of a calibrated (channels x samples) block, one batched call per metric.
 
-        if len(channel_data) < 2 or len(tacho_trigger_data) < 2:
-            if self.console:
-                self.console.append_to_console(
-                    f"Channel {channel_idx+1}: Insufficient data length: channel_data={len(channel_data)}, "
-                    f"tacho_trigger_data={len(tacho_trigger_data)}"
-                )
-            return metrics
+        Returns a (channels x table columns) array laid out as MetricsTableModel expects.
+        """
+        count = channel_block.shape[0]
+        all_metrics = np.zeros((count, len(TABLE_HEADERS)))
+
+        if channel_block.shape[1] < 2 or len(tacho_trigger_data) < 2:
+            lazy_log.debug("tabular", lambda: (
+                f"Insufficient data length: channel_data={channel_block.shape[1]}, "
+                f"tacho_trigger_data={len(tacho_trigger_data)}"
+            ))
+            return all_metrics
 
         try:
-            # Basic calculations
-            metrics["vpp"] = float(np.max(channel_data) - np.min(channel_data))
-            metrics["vrms"] = float(np.sqrt(np.mean(np.square(channel_data))))
-            metrics["direct"] = float(np.mean(channel_data))
-
-            # Trigger detection
-            threshold = np.mean(tacho_trigger_data) + 0.5 * np.std(tacho_trigger_data)
-            trigger_indices = np.where(np.diff((tacho_trigger_data > threshold).astype(int)) > 0)[0]
-            min_distance = 5
-            filtered_trigger_indices = [trigger_indices[0]] if len(trigger_indices) > 0 else [0, len(tacho_trigger_data)-1]
-            for i in range(1, len(trigger_indices)):
-                if trigger_indices[i] - filtered_trigger_indices[-1] >= min_distance:
-                    filtered_trigger_indices.append(trigger_indices[i])
+            # Basic calculations; sums of squares are accumulated in float64
+            columns = {
+                "vpp": np.ptp(channel_block, axis=1),
+                "vrms": np.sqrt(np.mean(np.square(channel_block, dtype=np.float64), axis=1)),
+                "direct": np.mean(channel_block, axis=1, dtype=np.float64)
+            }
+
+            # Trigger detection, shared by all channels of the frame
+            if trigger_info is None:
+                trigger_info = detect_triggers(tacho_trigger_data, self.sample_rate)
+            filtered_trigger_indices = trigger_info.indices if len(trigger_info.indices) > 0 else [0, len(tacho_trigger_data)-1]
 
             # RPM calculation
-            if len(filtered_trigger_indices) >= 2:
-                samples_per_rotation = np.mean(np.diff(filtered_trigger_indices))
-                if samples_per_rotation > 0:
-                    metrics["rpm"] = (60 * self.sample_rate) / samples_per_rotation
-            else:
-                if self.console:
-                    self.console.append_to_console(f"Channel {channel_idx+1}: Insufficient trigger points for RPM.")
+            rpm = trigger_info.rpm if trigger_info.revolutions >= 1 else 0.0
+            if trigger_info.revolutions < 1:
+                lazy_log.debug("tabular", "Insufficient trigger points for RPM.")
 
             # Gap calculation
-            metrics["gap"] = float(np.mean(tacho_trigger_data))
-
-            # Harmonic calculations
-            if len(filtered_trigger_indices) >= 2:
-                start_idx = filtered_trigger_indices[0]
-                end_idx = filtered_trigger_indices[-1]
-                segment = channel_data[start_idx:end_idx]
-                segment_length = end_idx - start_idx
-                if segment_length > 0:
-                    for harmonic, (amp_key, phase_key) in enumerate([
-                        ("1x Amp", "1x Phase"),
-                        ("2x Amp", "2x Phase"),
-                        ("nx Amp", "nx Phase")
-                    ], 1):
-                        sine_sum = cosine_sum = 0.0
-                        for n in range(segment_length):
-                            global_idx = start_idx + n
-                            theta = (2 * np.pi * harmonic * n) / segment_length
-                            sine_sum += channel_data[global_idx] * np.sin(theta)
-                            cosine_sum += channel_data[global_idx] * np.cos(theta)
-                        metrics[amp_key] = np.sqrt((sine_sum / segment_length) ** 2 + (cosine_sum / segment_length) ** 2) * 4
-                        metrics[phase_key] = np.arctan2(cosine_sum, sine_sum) * (180.0 / np.pi)
-                        if metrics[phase_key] < 0:
-                            metrics[phase_key] += 360
+            gap = float(np.mean(tacho_trigger_data))
+
+            # Harmonic calculations on the synchronously averaged revolution (orders 1, 2, 3)
+            tracked = track_frame(frame, self.sample_rate) if frame is not None else None
+            if tracked is not None and all(ch in tracked.channels for ch in range(count)):
+                amplitudes, phases = tracked.order_components()
+                rows = [tracked.row(ch) for ch in range(count)]
+                # Order tracking runs on the raw counts; calibration is a positive gain
+                amplitudes = amplitudes[rows] * self.calibration_vector()[:, None]
+                phases = phases[rows]
+            elif len(filtered_trigger_indices) >= 2:
+                average = resample_revolutions(channel_block, filtered_trigger_indices).mean(axis=1)
+                amplitudes, phases = harmonic_components(average, 0, average.shape[1])
             else:
-                if self.console:
-                    self.console.append_to_console(f"Channel {channel_idx+1}: Insufficient triggers for harmonic calculations.")
-
-            # Twiddle factor
+                amplitudes = phases = None
+                lazy_log.debug("tabular", "Insufficient triggers for harmonic calculations.")
+            if amplitudes is not None:
+                for i, (amp_key, phase_key) in enumerate([("1x Amp", "1x Phase"), ("2x Amp", "2x Phase"), ("nx Amp", "nx Phase")]):
+                    columns[amp_key] = amplitudes[:, i]
+                    columns[phase_key] = phases[:, i]
+
+            # Twiddle factor: one batched rfft over the whole-revolution span of every channel.
+            # Phases do not depend on the (positive) calibration gain, so the frame's cached
+            # spectra of the raw counts are shared with the other views.
             if len(filtered_trigger_indices) >= 2:
-                fft_vals = np.fft.fft(channel_data[filtered_trigger_indices[0]:filtered_trigger_indices[-1]])
-                fft_phases = np.angle(fft_vals)
-                phase_diffs = np.diff(fft_phases[:len(fft_phases)//2])
-                metrics["twiddle_factor"] = float(np.std(phase_diffs)) if len(phase_diffs) > 0 else 0.0
+                start_idx = int(filtered_trigger_indices[0])
+                end_idx = int(filtered_trigger_indices[-1])
+                if frame is not None:
+                    fft_vals = frame_cache.spectra(frame, count, start=start_idx, stop=end_idx)
+                else:
+                    fft_vals = rfft(channel_block[:, start_idx:end_idx], axis=1)
+                fft_phases = np.angle(fft_vals[:, :(end_idx - start_idx) // 2])
+                phase_diffs = np.diff(fft_phases, axis=1)
+                if phase_diffs.shape[1] > 0:
+                    columns["twiddle_factor"] = np.std(phase_diffs, axis=1)
             else:
-                if self.console:
-                    self.console.append_to_console(f"Channel {channel_idx+1}: Insufficient triggers for twiddle factor.")
+                lazy_log.debug("tabular", "Insufficient triggers for twiddle factor.")
+
+            columns["rpm"] = rpm
+            columns["gap"] = gap
+            for key, column in columns.items():
+                all_metrics[:, METRIC_COLUMNS[key]] = column
         except Exception as ex:
-            self.log_and_set_status(f"Error calculating metrics for channel {channel_idx+1}: {str(ex)}")
+            self.log_and_set_status(f"Error calculating metrics: {str(ex)}")
 
-        return metrics
+        return all_metrics
 
-    def process_calibrated_data(self, data, channel_idx):
+    def calibration_factor(self, channel_idx):
+        """ADC counts to engineering units for one channel."""
         channel_name = self.channel_names[channel_idx] if channel_idx < len(self.channel_names) else f"Channel {channel_idx+1}"
-        if channel_idx >= len(data) or not data[channel_idx]:
-            if self.console:
-                self.console.append_to_console(f"Channel {channel_name}: No data at index {channel_idx}, using zeros.")
-            return np.zeros(4096)
         props = self.channel_properties.get(channel_name, {"Unit": "mil", "CorrectionValue": 1.0, "Gain": 1.0, "Sensitivity": 1.0})
-        try:
-            channel_data = np.array(data[channel_idx], dtype=float) * (3.3 / 65535.0) * (props["CorrectionValue"] * props["Gain"]) / props["Sensitivity"]
-            if props["Unit"].lower() == "mil":
-                channel_data /= 25.4
-            elif props["Unit"].lower() == "mm":
-                channel_data /= 1000
-            return channel_data
-        except Exception as ex:
-            self.log_and_set_status(f"Error calibrating data for channel {channel_name}: {str(ex)}")
-            return np.zeros(4096)
+        factor = (3.3 / 65535.0) * (props["CorrectionValue"] * props["Gain"]) / props["Sensitivity"]
+        if props["Unit"].lower() == "mil":
+            factor /= 25.4
+        elif props["Unit"].lower() == "mm":
+            factor /= 1000
+        return factor
+
+    def calibration_vector(self):
+        """float32 gain per channel, rebuilt only when the channel set changes."""
+        if self.calibration_gains is None or len(self.calibration_gains) != self.num_channels:
+            self.calibration_gains = np.array([self.calibration_factor(ch) for ch in range(self.num_channels)], dtype=np.float32)
+        return self.calibration_gains
 
     def on_data_received(self, tag_name, model_name, values, sample_rate):
-        if self.console:
-            self.console.append_to_console(
-                f"Received data: tag_name={tag_name}, model_name={model_name}, "
-                f"channels={len(values)}, sample_counts={[len(v) for v in values]}"
-            )
+        result = self.compute(Frame(tag_name, model_name, values, sample_rate))
+        if result is not None:
+            self.render(result)
+
+    def compute(self, frame):
+        """Filter and measure every channel of the frame; runs on a compute-stage worker.
+
+        Returns (metrics, timestamp, traces) for render(). Nothing update_plots reads is
+        modified here: the traces travel in the result and peak-to-peak points are queued.
+        """
+        tag_name, model_name, values, sample_rate = frame.tag_name, frame.model_name, frame.values, frame.sample_rate
+        lazy_log.debug("tabular", lambda: (
+            f"Received data: tag_name={tag_name}, model_name={model_name}, "
+            f"channels={len(values)}, sample_counts={[len(v) for v in values]}"
+        ))
         if self.model_name != model_name or tag_name != self.tag_name:
-            if self.console:
-                self.console.append_to_console(
-                    f"Skipped data: model_name={model_name} (expected {self.model_name}), "
-                    f"tag_name={tag_name} (expected {self.tag_name})"
-                )
-            return
+            lazy_log.debug("tabular", lambda: (
+                f"Skipped data: model_name={model_name} (expected {self.model_name}), "
+                f"tag_name={tag_name} (expected {self.tag_name})"
+            ))
+            return None
 
         try:
-            # Relaxed validation: accept any non-empty values
-            if not values:
-                if self.console:
-                    self.console.append_to_console("Empty data received, using zeros for all channels.")
-                values = [[] for _ in range(max(self.num_channels, 6))]
-            values = values[:max(self.num_channels, 6)] + [[] for _ in range(max(self.num_channels, 6) - len(values))]
-            for i in range(len(values)):
-                if not values[i]:
-                    values[i] = np.zeros(4096).tolist()
-                elif len(values[i]) < 4096:
-                    values[i] = (values[i] + [0] * (4096 - len(values[i])))[:4096]
-                elif len(values[i]) > 4096:
-                    values[i] = values[i][:4096]
+            frame = values
+            # Frames from MQTTHandler are six 4096-sample float32 rows of one block and are used in place
+            frame_ok = len(frame) == 6 and all(len(row) == 4096 for row in frame)
+            if not frame_ok:
+                # Relaxed validation: accept any non-empty values
+                if not values:
+                    lazy_log.debug("tabular", "Empty data received, using zeros for all channels.")
+                    values = [[] for _ in range(max(self.num_channels, 6))]
+                values = list(values[:max(self.num_channels, 6)]) + [[] for _ in range(max(self.num_channels, 6) - len(values))]
+                for i in range(len(values)):
+                    # Short or missing channels are zero-padded to 4096 samples
+                    channel = np.asarray(values[i], dtype=np.float32)[:4096]
+                    if channel.size < 4096:
+                        channel = np.concatenate((channel, np.zeros(4096 - channel.size, dtype=np.float32)))
+                    values[i] = channel
 
             self.sample_rate = sample_rate if sample_rate > 0 else 4096
             self.data = values
             main_channels = min(self.num_channels, len(values), 4)
-            if self.console:
-                self.console.append_to_console(f"Processing {main_channels} channels for topic {tag_name}")
-
-            headers = [
-                "RPM", "Gap", "Channel Name", "DateTime", "Direct",
-                "1x Amp", "1x Phase", "2x Amp", "2x Phase", "nx Amp", "nx Phase",
-                "Vpp", "Vrms", "Twiddle Factor"
-            ]
-            frequency_data = np.array(values[4], dtype=float) if len(values) > 4 and values[4] else np.zeros(4096)
-            trigger_data = np.array(values[5], dtype=float) if len(values) > 5 and values[5] else np.zeros(4096)
-
-            for ch in range(self.num_channels):
-                try:
-                    channel_name = self.channel_names[ch] if ch < len(self.channel_names) else f"Channel {ch+1}"
-                    self.raw_data[ch] = self.process_calibrated_data(values, ch)
-                    low_pass_cutoff = 100
-                    high_pass_cutoff = 200
-                    band_pass_low_cutoff = 50
-                    band_pass_high_cutoff = 200
-                    tap_num = 31
-                    nyquist = self.sample_rate / 2.0
-
-                    if low_pass_cutoff >= nyquist or high_pass_cutoff >= nyquist or band_pass_low_cutoff >= band_pass_high_cutoff or band_pass_high_cutoff >= nyquist:
-                        self.log_and_set_status(f"Invalid filter cutoff frequencies for channel {channel_name}.")
-                        self.raw_data[ch] = np.zeros(4096)
-                        self.low_pass_data[ch] = np.zeros(4096)
-                        self.high_pass_data[ch] = np.zeros(4096)
-                        self.band_pass_data[ch] = np.zeros(4096)
-                        self.update_table_row(ch, channel_name, {})
-                        continue
-
-                    low_pass_coeffs = signal.firwin(tap_num, low_pass_cutoff / nyquist, window='hamming')
-                    high_pass_coeffs = signal.firwin(tap_num, high_pass_cutoff / nyquist, window='hamming', pass_zero=False)
-                    band_pass_coeffs = signal.firwin(tap_num, [band_pass_low_cutoff / nyquist, band_pass_high_cutoff / nyquist], window='hamming', pass_zero=False)
-
-                    self.low_pass_data[ch] = signal.lfilter(low_pass_coeffs, 1.0, self.raw_data[ch])
-                    self.high_pass_data[ch] = signal.lfilter(high_pass_coeffs, 1.0, self.raw_data[ch])
-                    self.band_pass_data[ch] = signal.lfilter(band_pass_coeffs, 1.0, self.raw_data[ch])
-
-                    self.average_frequency[ch] = np.mean(frequency_data[frequency_data > 0]) if np.any(frequency_data > 0) else 0.0
-
-                    trigger_indices = np.where(trigger_data > np.mean(trigger_data) + 0.5 * np.std(trigger_data))[0]
-                    min_distance_between_triggers = 5
-                    filtered_trigger_indices = [trigger_indices[0]] if len(trigger_indices) > 0 else [0, len(trigger_data)-1]
-                    for i in range(1, len(trigger_indices)):
-                        if trigger_indices[i] - filtered_trigger_indices[-1] >= min_distance_between_triggers:
-                            filtered_trigger_indices.append(trigger_indices[i])
-
-                    band_pass_peak_to_peak_values = []
-                    for i in range(len(filtered_trigger_indices) - 1):
-                        start_idx = filtered_trigger_indices[i]
-                        end_idx = filtered_trigger_indices[i + 1]
-                        segment = self.band_pass_data[ch][start_idx:end_idx]
-                        if len(segment) > 0:
-                            band_pass_peak_to_peak_values.append(np.max(segment) - np.min(segment))
-                    self.band_pass_peak_to_peak[ch] = np.mean(band_pass_peak_to_peak_values) if band_pass_peak_to_peak_values else 0.0
-                    self.band_pass_peak_to_peak_history[ch].append(self.band_pass_peak_to_peak[ch])
-                    self.band_pass_peak_to_peak_times[ch].append((datetime.now() - self.start_time).total_seconds())
-
-                    metrics = self.calculate_metrics(self.raw_data[ch], trigger_data, ch)
-                    channel_data = {
-                        "Channel Name": channel_name,
-                        "DateTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "RPM": f"{metrics['rpm']:.2f}",
-                        "Gap": f"{metrics['gap']:.2f}",
-                        "Direct": f"{metrics['direct']:.2f}",
-                        "1x Amp": f"{metrics['1x Amp']:.2f}",
-                        "1x Phase": f"{metrics['1x Phase']:.2f}",
-                        "2x Amp": f"{metrics['2x Amp']:.2f}",
-                        "2x Phase": f"{metrics['2x Phase']:.2f}",
-                        "nx Amp": f"{metrics['nx Amp']:.2f}",
-                        "nx Phase": f"{metrics['nx Phase']:.2f}",
-                        "Vpp": f"{metrics['vpp']:.2f}",
-                        "Vrms": f"{metrics['vrms']:.2f}",
-                        "Twiddle Factor": f"{metrics['twiddle_factor']:.2f}"
-                    }
-
-                    self.update_table_row(ch, channel_name, channel_data)
-                    if self.console:
-                        self.console.append_to_console(f"Updated table for channel {channel_name}: {channel_data}")
-                except Exception as ex:
-                    self.log_and_set_status(f"Error processing channel {channel_name}: {str(ex)}")
-                    self.raw_data[ch] = np.zeros(4096)
-                    self.low_pass_data[ch] = np.zeros(4096)
-                    self.high_pass_data[ch] = np.zeros(4096)
-                    self.band_pass_data[ch] = np.zeros(4096)
-                    self.update_table_row(ch, channel_name, {})
-
-            self.update_plots()
-            if self.console:
-                self.console.append_to_console(f"Processed data for topic {tag_name}, {main_channels} channels: Updated table and plots.")
+            lazy_log.debug("tabular", lambda: f"Processing {main_channels} channels for topic {tag_name}")
+
+            frequency_data = np.asarray(values[4], dtype=np.float32) if len(values) > 4 else np.zeros(4096, dtype=np.float32)
+            trigger_data = np.asarray(values[5], dtype=np.float32) if len(values) > 5 else np.zeros(4096, dtype=np.float32)
+            filters_ready = self.configure_filters()
+            channel_names = [self.channel_names[ch] if ch < len(self.channel_names) else f"Channel {ch+1}" for ch in range(self.num_channels)]
+
+            # Detect triggers once per frame; the result is shared with the other views of the frame
+            if frame_ok:
+                trigger_info = frame_triggers(frame, self.sample_rate)
+            else:
+                trigger_info = detect_triggers(trigger_data, self.sample_rate)
+            filtered_trigger_indices = trigger_info.indices if len(trigger_info.indices) > 0 else [0, len(trigger_data)-1]
+            average_frequency = np.mean(frequency_data[frequency_data > 0]) if np.any(frequency_data > 0) else 0.0
+
+            if not filters_ready:
+                self.log_and_set_status(f"Invalid filter cutoff frequencies for channels {channel_names}.")
+                zeros = np.zeros((self.num_channels, 4096), dtype=np.float32)
+                traces = {"raw": zeros, "low_pass": zeros, "high_pass": zeros, "band_pass": zeros, "peak_to_peak": None}
+                return (np.zeros((self.num_channels, len(TABLE_HEADERS))), time.time(), traces)
+
+            # All channels as one (channels x samples) block: each stage below is one NumPy call per frame
+            block = frame_cache.block(frame, self.num_channels) if frame_ok else np.asarray(values[:self.num_channels])
+            raw = block * self.calibration_vector()[:, None]
+            low_pass = self.filter_bank.process_block("low_pass", "frame", raw)
+            high_pass = self.filter_bank.process_block("high_pass", "frame", raw)
+            band_pass = self.filter_bank.process_block("band_pass", "frame", raw)
+
+            # Band-pass peak-to-peak of every revolution of every channel via reduceat
+            bounds = np.asarray(filtered_trigger_indices, dtype=np.intp)
+            if len(bounds) >= 2 and bounds[-1] > bounds[0]:
+                revolutions = band_pass[:, :bounds[-1]]
+                peak_to_peak = np.maximum.reduceat(revolutions, bounds[:-1], axis=1) - np.minimum.reduceat(revolutions, bounds[:-1], axis=1)
+                band_pass_peak_to_peak = [float(v) for v in peak_to_peak.mean(axis=1)]
+            else:
+                band_pass_peak_to_peak = [0.0] * self.num_channels
+            # Queued rather than appended so no point is lost when the compute stage drops a stale result
+            self.pending_peak_to_peak.append(((datetime.now() - self.start_time).total_seconds(), band_pass_peak_to_peak))
+            traces = {
+                "raw": raw, "low_pass": low_pass, "high_pass": high_pass, "band_pass": band_pass,
+                "average_frequency": average_frequency, "peak_to_peak": band_pass_peak_to_peak
+            }
+
+            all_metrics = self.calculate_metrics(raw, trigger_data, frame if frame_ok else None, trigger_info)
+            lazy_log.debug("tabular", lambda: f"Processed data for topic {tag_name}, {main_channels} channels: Updated table and plots.")
+            return (all_metrics, time.time(), traces)
         except Exception as ex:
             self.log_and_set_status(f"Error processing data: {str(ex)}")
-            for ch in range(self.num_channels):
-                channel_name = self.channel_names[ch] if ch < len(self.channel_names) else f"Channel {ch+1}"
-                self.update_table_row(ch, channel_name, {})
-            self.update_plots()
-
-    def update_table_row(self, row, channel_name, channel_data):
-        headers = [
-            "RPM", "Gap", "Channel Name", "DateTime", "Direct",
-            "1x Amp", "1x Phase", "2x Amp", "2x Phase", "nx Amp", "nx Phase",
-            "Vpp", "Vrms", "Twiddle Factor"
-        ]
-        default_data = {
-            "Channel Name": channel_name,
-            "DateTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "RPM": "0.00",
-            "Gap": "0.00",
-            "Direct": "0.00",
-            "1x Amp": "0.00",
-            "1x Phase": "0.00",
-            "2x Amp": "0.00",
-            "2x Phase": "0.00",
-            "nx Amp": "0.00",
-            "nx Phase": "0.00",
-            "Vpp": "0.00",
-            "Vrms": "0.00",
-            "Twiddle Factor": "0.00"
-        }
-        data = channel_data if channel_data else default_data
-        for col, header in enumerate(headers):
-            self.table.setItem(row, col, QTableWidgetItem(data[header]))
+            return (np.zeros((self.num_channels, len(TABLE_HEADERS))), time.time(), None)
+
+    def warm(self, frame):
+        """Stand-in for compute while the window is hidden: only the filter state advances,
+        so the filtered traces carry on without a transient when the window is shown again."""
+        values = frame.values
+        if self.model_name != frame.model_name or frame.tag_name != self.tag_name:
+            return None
+        if len(values) != 6 or any(len(row) != 4096 for row in values) or not self.configure_filters():
+            return None
+        raw = frame_cache.block(values, self.num_channels) * self.calibration_vector()[:, None]
+        for name in ("low_pass", "high_pass", "band_pass"):
+            self.filter_bank.process_block(name, "frame", raw)
+        return None
+
+    def render(self, result):
+        metrics, timestamp, traces = result
+        self.table_model.update_rows(metrics, timestamp)
+        if traces is not None:
+            self.apply_traces(traces)
+        self.update_plots()
+
+    def apply_traces(self, traces):
+        """Publish a frame's traces and the queued peak-to-peak points for update_plots (GUI thread)."""
+        if len(traces["raw"]) != self.num_channels:
+            return  # Computed before the channel set was reset
+        self.raw_data = list(traces["raw"])
+        self.low_pass_data = list(traces["low_pass"])
+        self.high_pass_data = list(traces["high_pass"])
+        self.band_pass_data = list(traces["band_pass"])
+        if traces["peak_to_peak"] is None:
+            return
+        self.average_frequency = [traces["average_frequency"]] * self.num_channels
+        self.band_pass_peak_to_peak = traces["peak_to_peak"]
+        while self.pending_peak_to_peak:
+            elapsed, peak_to_peak = self.pending_peak_to_peak.popleft()
+            # The channel set may have been reset since the point was computed
+            for ch in range(min(len(peak_to_peak), len(self.band_pass_peak_to_peak_history))):
+                self.band_pass_peak_to_peak_history[ch].append(peak_to_peak[ch])
+                self.band_pass_peak_to_peak_times[ch].append(elapsed)
+
+    def configure_filters(self):
+        """Point the filter bank at the current sample rate and band selection."""
+        band = BANDPASS_OPTIONS.get(self.bandpass_selection, BANDPASS_OPTIONS["None"])
+        try:
+            self.filter_bank.configure(self.sample_rate, {
+                "low_pass": (100.0, True),
+                "high_pass": (200.0, False),
+                "band_pass": (band, False)
+            })
+            return True
+        except ValueError as ex:
+            logging.error(f"Filter design failed at {self.sample_rate} Hz: {str(ex)}")
+            return False
 
     def update_plots(self):
         """Update all plots for the selected channel."""
@@ -1507,38 +1454,28 @@ class TabularViewFeature:
         if self.selected_channel_idx >= self.num_channels:
             self.selected_channel_idx = 0
             self.channel_selector.setCurrentIndex(1 if self.channel_names else 0)
-            if self.console:
-                self.console.append_to_console(f"Selected channel index {self.selected_channel_idx} out of range, defaulting to 0")
+            lazy_log.debug("tabular", lambda: f"Selected channel index {self.selected_channel_idx} out of range, defaulting to 0")
 
         ch = self.selected_channel_idx
         channel_name = self.channel_names[ch] if ch < len(self.channel_names) else f"Channel {ch+1}"
-        trim_samples = 47
-        low_pass_trim = 0
-        high_pass_trim = 110
-        band_pass_trim = 110
-        raw_trim = trim_samples
-
-        if len(self.raw_data[ch]) <= trim_samples:
-            if self.console:
-                self.console.append_to_console(f"Channel {channel_name}: Warning: Data length ({len(self.raw_data[ch])}) too short to trim {trim_samples} samples for plotting.")
-            low_pass_trim = high_pass_trim = band_pass_trim = raw_trim = 0
+        band_low, band_high = BANDPASS_OPTIONS.get(self.bandpass_selection, BANDPASS_OPTIONS["None"])
 
+        # Filter state is carried across frames, so there is no start-up transient to trim.
         data_sets = [
-            (self.raw_data[ch], raw_trim, f"Channel {channel_name} Raw Data"),
-            (self.low_pass_data[ch], low_pass_trim, f"Channel {channel_name} Low-Pass Filtered Data (100 Hz Cutoff)"),
-            (self.high_pass_data[ch], high_pass_trim, f"Channel {channel_name} High-Pass Filtered Data (200 Hz Cutoff)"),
-            (self.band_pass_data[ch], band_pass_trim, f"Channel {channel_name} Band-Pass Filtered Data (50-200 Hz) ({self.average_frequency[ch]:.2f} Hz, Peak-to-Peak: {self.band_pass_peak_to_peak[ch]:.2f})")
+            (self.raw_data[ch], f"Channel {channel_name} Raw Data"),
+            (self.low_pass_data[ch], f"Channel {channel_name} Low-Pass Filtered Data (100 Hz Cutoff)"),
+            (self.high_pass_data[ch], f"Channel {channel_name} High-Pass Filtered Data (200 Hz Cutoff)"),
+            (self.band_pass_data[ch], f"Channel {channel_name} Band-Pass Filtered Data ({band_low:.0f}-{band_high:.0f} Hz) ({self.average_frequency[ch]:.2f} Hz, Peak-to-Peak: {self.band_pass_peak_to_peak[ch]:.2f})")
         ]
 
-        for i, (data, trim, title) in enumerate(data_sets):
+        for i, (data, title) in enumerate(data_sets):
             self.plots[i].clear()
-            trimmed_data = data[trim:] if len(data) > trim else (data if len(data) > 0 else np.array([0]))
-            trimmed_time = self.time_points[trim:] if len(self.time_points) > trim else (self.time_points if len(self.time_points) > 0 else np.array([0]))
-            self.plots[i].setData(trimmed_time, trimmed_data)
+            plot_data = data if len(data) > 0 else np.array([0])
+            plot_time = self.time_points[:len(plot_data)] if len(self.time_points) >= len(plot_data) else np.arange(len(plot_data)) / self.sample_rate
+            self.plots[i].setData(plot_time, plot_data)
             self.plot_widgets[i].setTitle(title)
-            self.plot_widgets[i].setYRange(np.min(trimmed_data) * 1.1 if trimmed_data.size > 0 else -1, np.max(trimmed_data) * 1.1 if trimmed_data.size > 0 else 1)
-            if self.console:
-                self.console.append_to_console(f"Updated plot {i+1} for channel {channel_name}: {len(trimmed_data)} samples")
+            self.plot_widgets[i].setYRange(np.min(plot_data) * 1.1, np.max(plot_data) * 1.1)
+            lazy_log.debug("tabular", lambda: f"Updated plot {i+1} for channel {channel_name}: {len(plot_data)} samples")
 
         # Update peak-to-peak plot
         self.plots[4].clear()
@@ -1546,13 +1483,11 @@ class TabularViewFeature:
         if frequency_values and self.band_pass_peak_to_peak_history[ch]:
             self.plots[4].setData(frequency_values, self.band_pass_peak_to_peak_history[ch])
             self.plot_widgets[4].setYRange(0, max(0.01, max(self.band_pass_peak_to_peak_history[ch], default=0) * 1.1))
-            if self.console:
-                self.console.append_to_console(f"Updated peak-to-peak plot for channel {channel_name}: {len(frequency_values)} points")
+            lazy_log.debug("tabular", lambda: f"Updated peak-to-peak plot for channel {channel_name}: {len(frequency_values)} points")
         else:
             self.plots[4].setData(np.array([0]), np.array([0]))
             self.plot_widgets[4].setYRange(0, 0.01)
-            if self.console:
-                self.console.append_to_console(f"Channel {channel_name}: No data for bandpass peak-to-peak plot")
+            lazy_log.debug("tabular", lambda: f"Channel {channel_name}: No data for bandpass peak-to-peak plot")
 
     def log_and_set_status(self, message):
         logging.error(message)
@@ -5,6 +5,10 @@ from PyQt5.QtGui import QPainter, QPen, QBrush, QColor
 from pyqtgraph import PlotWidget, mkPen, AxisItem, InfiniteLine, SignalProxy
 from datetime import datetime
 import logging
+from recording_cache import recording_cache
+from features.trigger_detection import detect_triggers
+from features.trigger_markers import TriggerMarkers
+from lazy_log import lazy_log
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -45,7 +49,8 @@ class TimeReportFeature:
         self.vlines = []
         self.proxies = []
         self.trackers = []
-        self.trigger_lines = []
+        self.trigger_markers = None  # Trigger lines on the last plot
+        self.trigger_times = np.array([])  # Detected once per loaded recording
         self.active_line_idx = None
         self.num_channels = 0
         self.num_plots = 0
@@ -54,6 +59,7 @@ class TimeReportFeature:
         self.selected_filename = filename
         self.refresh_timer = None
         self.is_initialized = False
+        self.visible = True  # False while the subwindow is off screen
         self.init_ui_deferred()
 
     def init_ui_deferred(self):
@@ -98,7 +104,8 @@ class TimeReportFeature:
         self.vlines = []
         self.proxies = []
         self.trackers = []
-        self.trigger_lines = []
+        self.trigger_markers = None
+        self.trigger_times = np.array([])
 
         self.scroll_content = QWidget()
         self.scroll_layout = QVBoxLayout(self.scroll_content)
@@ -131,9 +138,7 @@ class TimeReportFeature:
             self.vlines.append(vline)
 
             if i == self.num_plots - 1:
-                self.trigger_lines = []
-            else:
-                self.trigger_lines.append(None)
+                self.trigger_markers = TriggerMarkers(plot_widget)
 
             proxy = SignalProxy(plot_widget.scene().sigMouseMoved, rateLimit=60, slot=lambda evt, idx=i: self.mouse_moved(evt, idx))
             self.proxies.append(proxy)
@@ -144,7 +149,7 @@ class TimeReportFeature:
 
         self.scroll_area.setWidget(self.scroll_content)
         self.is_initialized = True
-        if not self.refresh_timer.isActive():
+        if not self.refresh_timer.isActive() and self.visible:
             self.refresh_timer.start(100)
 
     def load_data_async(self):
@@ -152,41 +157,22 @@ class TimeReportFeature:
             self.console.append_to_console("No saved file selected for Time Report.")
             return
         try:
-            messages = self.db.get_feature_messages(self.project_name, model_name=self.model_name, feature_name="Time View", filename=self.selected_filename)
-            if not messages:
+            recording = recording_cache.get(self.db, self.project_name, self.model_name, "Time View", self.selected_filename)
+            if recording is None:
                 self.console.append_to_console(f"No saved data found for {self.selected_filename}")
                 return
 
-            self.num_channels = messages[0].get('numberOfChannels', 4)
-            self.tacho_channels_count = messages[0].get('tachoChannelCount', 2)
-            self.num_plots = self.num_channels + self.tacho_channels_count
-            self.sample_rate = messages[0].get('samplingRate', 4096)
-            samples_per_channel = messages[0].get('samplingSize', 4096)
+            self.num_channels = recording.num_channels
+            self.tacho_channels_count = recording.tacho_channels_count
+            self.num_plots = recording.num_plots
+            self.sample_rate = recording.sample_rate
 
             self.initialize_plots()
 
-            all_data = [[] for _ in range(self.num_plots)]
-            all_times = [[] for _ in range(self.num_plots)]
-            for msg in messages:
-                created_at = datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00')).timestamp()
-                values = msg['message']
-                num_data_channels = len(values.get('channel_data', []))
-                samples = len(values.get('channel_data', [[]])[0])
-                time_step = 1.0 / self.sample_rate
-                times = np.array([created_at + i * time_step for i in range(samples)])
-                for ch in range(self.num_channels):
-                    all_data[ch].extend(values['channel_data'][ch])
-                    all_times[ch].extend(times)
-                if self.tacho_channels_count >= 1:
-                    all_data[self.num_channels].extend(values.get('tacho_freq', []))
-                    all_times[self.num_channels].extend(times)
-                if self.tacho_channels_count >= 2:
-                    all_data[self.num_channels + 1].extend(values.get('tacho_trigger', []))
-                    all_times[self.num_channels + 1].extend(times)
-
             for ch in range(self.num_plots):
-                self.data[ch] = np.array(all_data[ch])
-                self.times[ch] = np.array(all_times[ch])
+                self.data[ch] = recording.data[ch]
+                self.times[ch] = recording.times
+            self.trigger_times = self.find_trigger_times()
             self.refresh_plots()
             self.console.append_to_console(f"Loaded saved data for {self.selected_filename} in Time Report")
         except Exception as e:
@@ -212,22 +198,29 @@ class TimeReportFeature:
             else:
                 self.plot_widgets[ch].setYRange(-0.5, 1.5, padding=0)
 
-            if ch == self.num_plots - 1 and self.tacho_channels_count >= 2:
-                if self.trigger_lines:
-                    for line in self.trigger_lines:
-                        if line:
-                            self.plot_widgets[ch].removeItem(line)
-                    self.trigger_lines = []
+            if ch == self.num_plots - 1 and self.trigger_markers is not None:
+                self.trigger_markers.set_times(self.trigger_times)
 
-                trigger_indices = np.where(self.data[ch] == 1)[0]
-                for idx in trigger_indices:
-                    if idx < len(times):
-                        line = InfiniteLine(pos=times[idx], angle=90, movable=False, pen=mkPen('k', width=2, style=Qt.SolidLine))
-                        self.plot_widgets[ch].addItem(line)
-                        self.trigger_lines.append(line)
+        lazy_log.debug("time_report", lambda: f"Time Report ({self.model_name}): Refreshed {self.num_plots} plots")
 
-        if self.console:
-            self.console.append_to_console(f"Time Report ({self.model_name}): Refreshed {self.num_plots} plots")
+    def find_trigger_times(self):
+        """Times of the trigger edges on the last (trigger) plot; the recording is static, so run once per load."""
+        if self.tacho_channels_count < 2 or self.num_plots == 0:
+            return np.array([])
+        times = np.asarray(self.times[-1])
+        trigger_indices = detect_triggers(self.data[-1], self.sample_rate).indices
+        return times[trigger_indices[trigger_indices < len(times)]]
+
+    def set_visible(self, visible):
+        """Stop redrawing while the subwindow is off screen and redraw once when shown."""
+        self.visible = visible
+        if not self.refresh_timer:
+            return
+        if not visible:
+            self.refresh_timer.stop()
+        elif self.is_initialized:
+            self.refresh_timer.start(100)
+            self.refresh_plots()
 
     def mouse_enter(self, idx):
         self.active_line_idx = idx
@@ -276,5 +269,6 @@ class TimeReportFeature:
         self.data = []
         self.times = []
         self.vlines = []
-        self.trigger_lines = []
+        self.trigger_markers = None
+        self.trigger_times = np.array([])
         self.widget = None
\ No newline at end of file
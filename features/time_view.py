@@ -1,11 +1,17 @@
 import numpy as np
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QPushButton, QComboBox, QGridLayout
-from PyQt5.QtCore import QObject, QEvent, Qt, QTimer
+from PyQt5.QtCore import QObject, QEvent, QTimer
 from PyQt5.QtGui import QIcon
 from pyqtgraph import PlotWidget, mkPen, AxisItem, InfiniteLine, SignalProxy
 from datetime import datetime
 import time
 import logging
+from features.trigger_detection import detect_triggers, frame_triggers
+from features.trigger_markers import TriggerMarkers
+from features.ring_buffer import RingBuffer
+from features.frame_cache import frame_cache
+from features.envelope import minmax_envelope, visible_range
+from lazy_log import lazy_log
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -43,8 +49,10 @@ class TimeViewFeature:
         self.widget = None
         self.plot_widgets = []
         self.plots = []
-        self.fifo_data = []
-        self.fifo_times = []
+        self.ring = None  # All plots' live samples as one RingBuffer
+        self.channel_scales = None
+        self.saved_data = None  # (plots x samples) of a loaded recording, kept as one plain array
+        self.saved_times = None  # Explicit times of a loaded recording, which may have gaps
         self.sample_rate = None
         self.main_channels = None
         self.tacho_channels_count = None
@@ -55,7 +63,8 @@ class TimeViewFeature:
         self.vlines = []
         self.proxies = []
         self.trackers = []
-        self.trigger_lines = []
+        self.trigger_markers = None  # Trigger lines on the last plot
+        self.trigger_times = np.zeros(0)  # Times of tacho trigger edges still inside the FIFO
         self.active_line_idx = None
         self.window_seconds = 1
         self.fifo_window_samples = None
@@ -63,6 +72,8 @@ class TimeViewFeature:
         self.settings_button = None
         self.refresh_timer = None
         self.needs_refresh = []
+        self.drawing = False  # Set while refresh_plots moves the view itself
+        self.visible = True  # False while the subwindow is off screen
         self.is_initialized = False
         self.initUI()
         if self.saved_filename:
@@ -126,12 +137,14 @@ class TimeViewFeature:
 
         self.plot_widgets = []
         self.plots = []
-        self.fifo_data = []
-        self.fifo_times = []
+        self.ring = None
+        self.saved_data = None
+        self.saved_times = None
         self.vlines = []
         self.proxies = []
         self.trackers = []
-        self.trigger_lines = []
+        self.trigger_markers = None
+        self.trigger_times = np.zeros(0)
         self.needs_refresh = []
 
         self.scroll_content = QWidget()
@@ -156,19 +169,20 @@ class TimeViewFeature:
             plot = plot_widget.plot([], [], pen=pen)
             self.plots.append(plot)
             self.plot_widgets.append(plot_widget)
-            self.fifo_data.append([])
-            self.fifo_times.append([])
             self.needs_refresh.append(True)
 
+            # Zoom, pan and resize change which samples land in each pixel column
+            view_box = plot_widget.getViewBox()
+            view_box.sigXRangeChanged.connect(lambda *args, idx=i: self.on_view_changed(idx))
+            view_box.sigResized.connect(lambda *args, idx=i: self.on_view_changed(idx))
+
             vline = InfiniteLine(angle=90, movable=False, pen=mkPen('r', width=2))
             vline.setVisible(False)
             plot_widget.addItem(vline)
             self.vlines.append(vline)
 
             if i == self.num_plots - 1:
-                self.trigger_lines = []
-            else:
-                self.trigger_lines.append(None)
+                self.trigger_markers = TriggerMarkers(plot_widget)
 
             proxy = SignalProxy(plot_widget.scene().sigMouseMoved, rateLimit=60, slot=lambda evt, idx=i: self.mouse_moved(evt, idx))
             self.proxies.append(proxy)
@@ -188,12 +202,16 @@ class TimeViewFeature:
             self.log_and_set_status("Buffer initialization failed")
             return
         self.fifo_window_samples = self.sample_rate * self.window_seconds
-        for i in range(self.num_plots):
-            self.fifo_data[i] = np.zeros(self.fifo_window_samples)
-            time_step = self.window_seconds / self.fifo_window_samples
-            self.fifo_times[i] = np.array([i * time_step for i in range(self.fifo_window_samples)])
+        # The window starts out as zeros ending now; later samples follow at 1 / sample_rate
+        self.ring = RingBuffer(self.num_plots, self.fifo_window_samples, 1.0 / self.sample_rate,
+                               start_time=time.time() - self.window_seconds)
+        # ADC counts to volts for main channels, tacho frequency / 100, trigger as-is
+        self.channel_scales = np.ones(self.num_plots, dtype=np.float32)
+        self.channel_scales[:self.main_channels] = self.scaling_factor
+        if self.tacho_channels_count >= 1:
+            self.channel_scales[self.main_channels] = 0.01
         self.is_initialized = True
-        if not self.refresh_timer.isActive() and not self.saved_filename:
+        if not self.refresh_timer.isActive() and not self.saved_filename and self.visible:
             self.refresh_timer.start(100)
 
     def load_saved_data(self):
@@ -204,8 +222,6 @@ class TimeViewFeature:
             self.console.append_to_console(f"No saved data found for {self.saved_filename}")
             return
 
-        all_data = [[] for _ in range(self.num_plots)]
-        all_times = [[] for _ in range(self.num_plots)]
         self.sample_rate = messages[0].get('samplingRate', 4096)
         self.main_channels = messages[0].get('numberOfChannels', 4)
         self.tacho_channels_count = messages[0].get('tacoChannelCount', 2)
@@ -214,30 +230,57 @@ class TimeViewFeature:
         self.samples_per_channel = messages[0].get('samplingSize', 4096)
 
         self.initialize_plots()
+        self.ring = None  # The recording is not a live window; see saved_data
 
+        data_parts = []
+        time_parts = []
+        time_step = 1.0 / self.sample_rate
         for msg in messages:
             created_at = datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00')).timestamp()
             values = msg['message']
             num_channels = len(values) - 2
-            samples = len(values[0])
-            time_step = 1.0 / self.sample_rate
-            times = np.array([created_at + i * time_step for i in range(samples)])
-            for ch in range(self.main_channels):
-                all_data[ch].extend(values[ch])
-                all_times[ch].extend(times)
+            rows = list(values[:self.main_channels])
             if self.tacho_channels_count >= 1:
-                all_data[self.main_channels].extend(values[num_channels])
-                all_times[self.main_channels].extend(times)
+                rows.append(values[num_channels])
             if self.tacho_channels_count >= 2:
-                all_data[self.main_channels + 1].extend(values[num_channels + 1])
-                all_times[self.main_channels + 1].extend(times)
+                rows.append(values[num_channels + 1])
+            data_parts.append(np.asarray(rows, dtype=np.float32))
+            time_parts.append(created_at + np.arange(len(values[0])) * time_step)
 
+        # The whole recording is one window; times are kept explicitly because recordings can have gaps
+        self.saved_data = np.concatenate(data_parts, axis=1)
+        self.saved_times = np.concatenate(time_parts)
         for ch in range(self.num_plots):
-            self.fifo_data[ch] = np.array(all_data[ch])
-            self.fifo_times[ch] = np.array(all_times[ch])
             self.needs_refresh[ch] = True
+        trigger_info = detect_triggers(self.saved_data[-1], self.sample_rate)
+        self.trigger_times = self.saved_times[trigger_info.indices]
         self.refresh_plots()
 
+    @property
+    def fifo_data(self):
+        """Per-plot windows in chronological order (views into the ring buffer or the recording)."""
+        return list(self.window_data()) if self.has_window() else []
+
+    @property
+    def fifo_times(self):
+        """The shared time axis, once per plot."""
+        return [self.window_times()] * self.num_plots if self.has_window() else []
+
+    def has_window(self):
+        return self.saved_data is not None or self.ring is not None
+
+    def window_data(self, channel=None):
+        """Samples of all plots, or of one, in chronological order."""
+        if self.saved_data is not None:
+            return self.saved_data if channel is None else self.saved_data[channel]
+        return self.ring.read(channel)
+
+    def window_length(self):
+        return self.saved_data.shape[1] if self.saved_data is not None else self.ring.capacity
+
+    def window_times(self):
+        return self.saved_times if self.saved_data is not None else self.ring.times()
+
     def toggle_settings(self):
         self.settings_panel.setVisible(not self.settings_panel.isVisible())
         self.settings_button.setVisible(not self.settings_panel.isVisible())
@@ -268,15 +311,10 @@ class TimeViewFeature:
             logging.error("Cannot update window size: sample_rate or num_plots not set")
             return
         new_fifo_window_samples = self.sample_rate * self.window_seconds
+        # A loaded recording keeps all of its samples; only the visible range changes
+        if self.ring is not None:
+            self.ring.resize(new_fifo_window_samples)
         for i in range(self.num_plots):
-            current_data = self.fifo_data[i]
-            current_length = len(current_data)
-            new_data = np.zeros(new_fifo_window_samples)
-            copy_length = min(current_length, new_fifo_window_samples)
-            new_data[:copy_length] = current_data[:copy_length]
-            self.fifo_data[i] = new_data
-            time_step = self.window_seconds / new_fifo_window_samples
-            self.fifo_times[i] = np.array([j * time_step for j in range(new_fifo_window_samples)])
             self.needs_refresh[i] = True
         self.fifo_window_samples = new_fifo_window_samples
 
@@ -312,55 +350,42 @@ class TimeViewFeature:
                 self.log_and_set_status(f"Tacho data length mismatch")
                 return
 
-            if not self.fifo_data or len(self.fifo_data) != self.num_plots or not self.is_initialized:
+            if (self.ring is None or self.ring.channels != self.num_plots or not self.is_initialized
+                    or self.ring.sample_period != 1.0 / sample_rate):
                 self.initialize_plots()
 
-            current_time = time.time()
-            time_step = 1.0 / sample_rate
-            new_times = np.array([current_time - (self.samples_per_channel - 1 - i) * time_step for i in range(self.samples_per_channel)])
-
-            for ch in range(self.main_channels):
-                new_data = np.array(values[ch]) * self.scaling_factor
-                self.fifo_data[ch] = np.roll(self.fifo_data[ch], -self.samples_per_channel)
-                self.fifo_data[ch][-self.samples_per_channel:] = new_data
+            # One scaled (plots x samples) block into the ring: O(new samples) whatever the window length
+            first_index = self.ring.write(frame_cache.block(values, self.num_plots) * self.channel_scales[:, None])
+            for ch in range(self.num_plots):
                 self.needs_refresh[ch] = True
 
-            if self.tacho_channels_count >= 1:
-                self.fifo_data[self.main_channels] = np.roll(self.fifo_data[self.main_channels], -self.samples_per_channel)
-                self.fifo_data[self.main_channels][-self.samples_per_channel:] = np.array(values[self.main_channels]) / 100
-                self.needs_refresh[self.main_channels] = True
-
-            if self.tacho_channels_count >= 2:
-                self.fifo_data[self.main_channels + 1] = np.roll(self.fifo_data[self.main_channels + 1], -self.samples_per_channel)
-                self.fifo_data[self.main_channels + 1][-self.samples_per_channel:] = np.array(values[self.main_channels + 1])
-                self.needs_refresh[self.main_channels + 1] = True
-
-            for ch in range(self.num_plots):
-                self.fifo_times[ch] = np.roll(self.fifo_times[ch], -self.samples_per_channel)
-                base_time = self.fifo_times[ch][-self.samples_per_channel - 1] if len(self.fifo_times[ch]) > self.samples_per_channel else 0
-                self.fifo_times[ch][-self.samples_per_channel:] = base_time + np.array([(i + 1) * time_step for i in range(self.samples_per_channel)])
+            # Trigger edges come from the per-frame detector shared with the other views
+            trigger_info = frame_triggers(values, sample_rate)
+            self.trigger_times = np.concatenate((
+                self.trigger_times[self.trigger_times >= self.ring.window_start()],
+                self.ring.time_of(first_index + trigger_info.indices)
+            ))
 
         except Exception as e:
             self.log_and_set_status(f"Error processing data: {str(e)}")
 
     def refresh_plots(self):
-        if not self.is_initialized or self.fifo_window_samples is None or not self.plot_widgets or not self.plots or not self.fifo_data or not self.fifo_times:
+        if not self.is_initialized or self.fifo_window_samples is None or not self.plot_widgets or not self.plots or not self.has_window():
+            return
+        if self.ring is not None and self.ring.capacity < self.fifo_window_samples:
             return
 
+        window_start, window_end = self.window_bounds()
         for ch in range(self.num_plots):
             if not self.needs_refresh[ch]:
                 continue
 
-            times = self.fifo_times[ch]
-            data = self.fifo_data[ch]
-            if len(data) == 0 or len(times) == 0:
-                continue
-
-            if len(times) < self.fifo_window_samples:
-                continue
-
-            self.plots[ch].setData(times, data)
-            self.plot_widgets[ch].setXRange(times[-self.fifo_window_samples], times[-1], padding=0)
+            self.drawing = True
+            try:
+                self.plot_widgets[ch].setXRange(window_start, window_end, padding=0)
+            finally:
+                self.drawing = False
+            self.draw_plot(ch)
             if ch < self.main_channels:
                 self.plot_widgets[ch].enableAutoRange(axis='y')
             elif ch == self.main_channels:
@@ -368,24 +393,69 @@ class TimeViewFeature:
             else:
                 self.plot_widgets[ch].setYRange(-0.5, 1.5, padding=0)
 
-            if ch == self.num_plots - 1:
-                if self.trigger_lines:
-                    for line in self.trigger_lines:
-                        if line:
-                            self.plot_widgets[ch].removeItem(line)
-                    self.trigger_lines = []
-
-                trigger_indices = np.where(self.fifo_data[ch][-self.fifo_window_samples:] == 1)[0]
-                for idx in trigger_indices:
-                    if idx < len(times):
-                        line = InfiniteLine(pos=times[idx], angle=90, movable=False, pen=mkPen('k', width=2, style=Qt.SolidLine))
-                        self.plot_widgets[ch].addItem(line)
-                        self.trigger_lines.append(line)
+            if ch == self.num_plots - 1 and self.trigger_markers is not None:
+                self.trigger_markers.set_times(self.trigger_times[self.trigger_times >= window_start])
+
+            self.needs_refresh[ch] = False
+
+            lazy_log.debug("time_view", lambda: f"Time View ({self.model_name}): Refreshed {self.num_plots} plots")
+
+    def draw_plot(self, ch):
+        """Draw the part of the window inside plot ch's x range, decimated to its pixel width.
+
+        Zoomed out, each pixel column gets the min and max of its samples, so a 10 s window
+        costs about 2 * width points instead of sample_rate * 10; zoomed in far enough,
+        the samples are drawn as they are.
+        """
+        view_box = self.plot_widgets[ch].getViewBox()
+        x_min, x_max = view_box.viewRange()[0]
+        if self.saved_data is not None:
+            start, stop = visible_range(self.saved_times, x_min, x_max)
+        else:
+            # Implied sample times, so the range is found without building the time axis
+            period = self.ring.sample_period
+            offset = self.ring.window_start()
+            start = max(int(np.floor((x_min - offset) / period)) - 1, 0)
+            stop = min(int(np.ceil((x_max - offset) / period)) + 2, self.ring.capacity)
+        columns = max(int(view_box.width()), 100)  # Not laid out yet: assume a narrow plot
+        indices, values = minmax_envelope(self.window_data(ch), start, stop, columns)
+        self.plots[ch].setData(self.sample_times(indices), values)
+
+    def on_view_changed(self, idx):
+        if self.drawing or not self.has_window() or idx >= len(self.plots):
+            return
+        if not self.visible:
+            self.needs_refresh[idx] = True
+            return
+        if self.refresh_timer is not None and self.refresh_timer.isActive():
+            self.needs_refresh[idx] = True  # Redrawn on the next tick with the new range
+        else:
+            self.draw_plot(idx)  # Loaded recording: no refresh timer runs
+
+    def set_visible(self, visible):
+        """Stop redrawing while the subwindow is off screen; the ring keeps filling meanwhile."""
+        self.visible = visible
+        if not visible:
+            if self.refresh_timer is not None:
+                self.refresh_timer.stop()
+            return
+        for ch in range(len(self.needs_refresh)):
+            self.needs_refresh[ch] = True
+        if self.is_initialized and not self.saved_filename and self.refresh_timer is not None:
+            self.refresh_timer.start(100)
+        self.refresh_plots()
 
-                self.needs_refresh[ch] = False
+    def sample_times(self, indices):
+        """Times of window sample indices."""
+        if self.saved_data is not None:
+            return self.saved_times[indices]
+        return self.ring.time_of(self.ring.first_index() + indices)
 
-            if self.console:
-                self.console.append_to_console(f"Time View ({self.model_name}): Refreshed {self.num_plots} plots")
+    def window_bounds(self):
+        """Times of the first and last sample of the visible window."""
+        if self.saved_data is not None:
+            return self.saved_times[max(len(self.saved_times) - self.fifo_window_samples, 0)], self.saved_times[-1]
+        return self.ring.window_start(), self.ring.window_end()
 
     def mouse_enter(self, idx):
         self.active_line_idx = idx
@@ -404,12 +474,9 @@ class TimeViewFeature:
             return
         mouse_point = self.plot_widgets[idx].plotItem.vb.mapSceneToView(pos)
         x = mouse_point.x()
-        times = self.fifo_times[idx]
-        if len(times) > 0:
-            if x < times[0]:
-                x = times[0]
-            elif x > times[-1]:
-                x = times[-1]
+        if self.has_window():
+            first, last = self.sample_times(np.array([0, self.window_length() - 1]))
+            x = min(max(x, first), last)
         for vline in self.vlines:
             vline.setPos(x)
             vline.setVisible(True)
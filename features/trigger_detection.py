@@ -0,0 +1,48 @@
+import numpy as np
+from features.frame_cache import frame_cache
+
+MIN_TRIGGER_DISTANCE = 5  # Samples; closer rising edges are treated as contact bounce
+
+
+class TriggerInfo:
+    """Tacho triggers of one frame: rising-edge indices, speed and whole revolutions."""
+
+    def __init__(self, indices, sample_rate, threshold):
+        self.indices = indices
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.revolutions = max(len(indices) - 1, 0)
+        if self.revolutions:
+            self.samples_per_rev = float(np.mean(np.diff(indices)))
+            self.rpm = 60.0 * sample_rate / self.samples_per_rev
+        else:
+            self.samples_per_rev = 0.0
+            self.rpm = 0.0
+
+
+def detect_triggers(trigger_data, sample_rate, min_distance=MIN_TRIGGER_DISTANCE):
+    """Rising edges through mean + 0.5 std of the trigger channel.
+
+    An edge is kept when it is at least min_distance samples after the previous edge,
+    which removes bounce without a per-sample Python loop.
+    """
+    trigger_data = np.asarray(trigger_data, dtype=np.float32)
+    if trigger_data.size < 2:
+        return TriggerInfo(np.zeros(0, dtype=int), sample_rate, 0.0)
+    threshold = float(np.mean(trigger_data) + 0.5 * np.std(trigger_data))
+    edges = np.flatnonzero(np.diff((trigger_data > threshold).astype(np.int8)) > 0)
+    if edges.size > 1:
+        keep = np.empty(edges.size, dtype=bool)
+        keep[0] = True
+        keep[1:] = np.diff(edges) >= min_distance
+        edges = edges[keep]
+    edges.setflags(write=False)
+    return TriggerInfo(edges, sample_rate, threshold)
+
+
+def frame_triggers(frame, sample_rate, channel=-1):
+    """Trigger info for a frame, detected once and shared through the frame cache.
+
+    The tacho trigger is the last channel of a frame unless channel says otherwise.
+    """
+    return frame_cache.get(frame, ("triggers", channel, sample_rate), lambda: detect_triggers(frame[channel], sample_rate))
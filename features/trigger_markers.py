@@ -0,0 +1,33 @@
+import numpy as np
+from pyqtgraph import PlotDataItem, mkPen
+
+
+class TriggerMarkers:
+    """Vertical tacho trigger lines of one plot, drawn by a single PlotDataItem.
+
+    Each trigger is one segment from y_low to y_high, joined with connect='pairs', so
+    the plot keeps one graphics item however many triggers are shown. set_times only
+    rebuilds the path when the trigger times actually changed.
+    """
+
+    def __init__(self, plot_widget, y_low=-0.5, y_high=1.5, pen=None):
+        self.y_low = y_low
+        self.y_high = y_high
+        self.times = np.zeros(0)
+        self.item = PlotDataItem([], [], connect='pairs', pen=pen or mkPen('k', width=2))
+        # The lines follow the plot's range instead of widening it
+        plot_widget.addItem(self.item, ignoreBounds=True)
+
+    def set_times(self, times):
+        times = np.asarray(times, dtype=float)
+        if times.shape == self.times.shape and np.array_equal(times, self.times):
+            return
+        self.times = times
+        x = np.repeat(times, 2)
+        y = np.empty(x.size)
+        y[0::2] = self.y_low
+        y[1::2] = self.y_high
+        self.item.setData(x, y, connect='pairs')
+
+    def clear(self):
+        self.set_times(np.zeros(0))
@@ -1,9 +1,15 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Figure
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtCore import QRectF
+from collections import deque
+import pyqtgraph as pg
 import numpy as np
 import math
+from features.frame_cache import frame_cache
+from features.compute_stage import Frame
+from lazy_log import lazy_log
+
+# Dark blue through green to yellow: low amplitudes recede, peaks stand out
+WATERFALL_COLORS = [(0, 0, 64), (0, 64, 160), (0, 160, 160), (96, 208, 64), (255, 255, 0)]
 
 class WaterfallFeature:
     def __init__(self, parent, db, project_name, channel=None, model_name=None, console=None):
@@ -16,9 +22,18 @@ class WaterfallFeature:
         self.widget = None
 
         # Waterfall specific attributes
-        self.max_lines = 1  # Increased for better scrolling visibility
-        self.data_history = [[] for _ in range(4)]  # Holds previous FFT magnitude lines for 4 main channels
-        self.phase_history = [[] for _ in range(4)]  # Holds previous FFT phase lines for 4 main channels
+        self.max_lines = 200  # Spectra kept per channel; older lines scroll off the bottom
+        self.num_channels = 4  # Main channels; tacho frequency and trigger are not plotted
+        self.plots = []
+        self.groups = []  # Per channel, parent of its line images; moved to scroll them
+        self.lines = []  # Per channel, deque of one-line ImageItems, oldest first
+        self.line_count = 0
+        self.geometry = None  # (bins, bin width, frame period) the lines were drawn with
+        self.lut = None
+        self.level_max = 0.0
+        self.levels = None  # Upper colour level of the drawn lines
+        # Lines computed but not yet drawn; more than one piles up while the window is hidden
+        self.pending_lines = deque(maxlen=self.max_lines)
         self.scaling_factor = 3.3 / 65535.0  # Scaling factor for voltage conversion
         self.sample_rate = 4096  # Matches MQTTHandler default
         self.samples_per_channel = 4096  # Matches MQTTHandler
@@ -30,17 +45,21 @@ class WaterfallFeature:
         layout = QVBoxLayout()
         self.widget.setLayout(layout)
 
-
-
-        # Matplotlib figure
-        self.figure = Figure(figsize=(8, 6))
-        self.canvas = FigureCanvas(self.figure)
-        self.ax = self.figure.add_subplot(111, projection='3d')  # 3D for waterfall
-        layout.addWidget(self.canvas)
-
-        # Add Matplotlib navigation toolbar for zooming and panning
-        self.toolbar = NavigationToolbar(self.canvas, self.widget)
-        layout.addWidget(self.toolbar)
+        # One plot per channel: frequency across, newest spectrum on top
+        self.graphics = pg.GraphicsLayoutWidget()
+        self.graphics.setBackground('w')
+        layout.addWidget(self.graphics)
+        self.lut = pg.ColorMap(np.linspace(0.0, 1.0, len(WATERFALL_COLORS)), WATERFALL_COLORS).getLookupTable(0.0, 1.0, 256)
+        for ch in range(self.num_channels):
+            plot = self.graphics.addPlot(row=ch, col=0)
+            plot.setTitle(f"Waterfall FFT - Channel {ch+1} (Model: {self.model_name})")
+            plot.setLabel('bottom', "Frequency (Hz)")
+            plot.setLabel('left', "Time (s)")
+            group = pg.ItemGroup()
+            plot.addItem(group)
+            self.plots.append(plot)
+            self.groups.append(group)
+            self.lines.append(deque())
 
         if not self.model_name and self.console:
             self.console.append_to_console("No model selected in FFTViewFeature.")
@@ -51,106 +70,123 @@ class WaterfallFeature:
         return self.widget
 
     def on_data_received(self, tag_name, model_name, values, sample_rate):
+        result = self.compute(Frame(tag_name, model_name, values, sample_rate))
+        if result is not None:
+            self.render(result)
+
+    def compute(self, frame):
+        """Spectra of the four main channels; runs on a compute-stage worker."""
+        tag_name, model_name, values, sample_rate = frame.tag_name, frame.model_name, frame.values, frame.sample_rate
         if self.model_name != model_name:
-            return  # Ignore data for other models
-        if self.console:
-            self.console.append_to_console(
-                f"FFT View ({self.model_name} - Channels 1-4): Received data for {tag_name} - {len(values)} channels, sample_rate={sample_rate}"
-            )
+            return None  # Ignore data for other models
+        lazy_log.debug("waterfall", lambda: (
+            f"FFT View ({self.model_name} - Channels 1-4): Received data for {tag_name} - {len(values)} channels, sample_rate={sample_rate}"
+        ))
 
         # Update sample rate from MQTT data
         self.sample_rate = sample_rate if sample_rate > 0 else self.sample_rate
 
         # Expecting values to contain at least 4 lists: 4 main channels (ignore tacho freq and trigger)
         if len(values) < 4:
-            if self.console:
-                self.console.append_to_console(f"Insufficient channels received: {len(values)}")
-            return
-
-        channel_data = values[:4]  # First 4 lists are main channel data
+            lazy_log.debug("waterfall", lambda: f"Insufficient channels received: {len(values)}")
+            return None
 
-        # Verify data length
-        for ch_data in channel_data:
+        # Verify data length of the 4 main channels
+        for ch_data in values[:4]:
             if len(ch_data) != self.samples_per_channel:
-                if self.console:
-                    self.console.append_to_console(f"Invalid channel data length: got {len(ch_data)}, expected {self.samples_per_channel}")
-                return
-
-        # Apply scaling factor to channel data (convert ADC counts to volts)
-        channel_data = [np.array(ch, dtype=np.float32) * self.scaling_factor for ch in channel_data]
+                lazy_log.debug("waterfall", lambda: f"Invalid channel data length: got {len(ch_data)}, expected {self.samples_per_channel}")
+                return None
 
         # Calculate target length (next power of 2)
         sample_count = self.samples_per_channel
         target_length = 2 ** math.ceil(math.log2(sample_count))
 
-        fft_magnitudes = []
-        fft_phases = []
-        frequencies = []
-
-        for i in range(4):
-            # Zero-pad data if necessary
-            padded_data = np.pad(channel_data[i], (0, target_length - sample_count), mode='constant') if target_length > sample_count else channel_data[i]
-
-            # Compute FFT
-            fft_result = np.fft.fft(padded_data)
-            N = len(padded_data)
-
-            # Single-sided FFT magnitude scaled for correct amplitude peak (in volts)
-            half = N // 2
-            magnitudes = (2.0 / N) * np.abs(fft_result[:half])  # Scale for single-sided FFT
-            magnitudes[0] /= 2  # DC component no doubling
-            if N % 2 == 0:
-                magnitudes[-1] /= 2  # Nyquist component no doubling if even length
-
-            fft_phase = np.angle(fft_result[:half], deg=True)
-
-            # Frequency axis: [0, Fs/N, 2*Fs/N, ..., (N/2 - 1)*Fs/N]
-            freqs = np.array([i * self.sample_rate / N for i in range(half)])
-
-            fft_magnitudes.append(magnitudes)
-            fft_phases.append(fft_phase)
-            frequencies.append(freqs)
-
-        # Store FFT data in history
-        for ch in range(4):
-            self.data_history[ch].append(fft_magnitudes[ch])
-            self.phase_history[ch].append(fft_phases[ch])  # Store phases (not plotted)
-            if len(self.data_history[ch]) > self.max_lines:
-                self.data_history[ch].pop(0)
-                self.phase_history[ch].pop(0)  # Keep phase history in sync
-
-        self.update_waterfall_plot(frequencies[0])  # All channels use same frequency bins
-
-    def update_waterfall_plot(self, frequencies):
-        self.ax.clear()
-        self.ax.set_title(f"Waterfall FFT Plot (Channels, Model: {self.model_name})")
-        self.ax.set_xlabel("Frequency (Hz)")
-        self.ax.set_ylabel("Channel")
-        self.ax.set_zlabel("Amplitude (V)")
-        self.ax.grid(True)
-
-        colors = ['blue', 'red', 'green', 'purple']
-        max_amplitude = 0
-
-        for ch in range(4):
-            num_lines = len(self.data_history[ch])
-            for idx, fft_line in enumerate(self.data_history[ch]):
-                x = frequencies
-                # Offset each line in time (y-axis), recent data at y=0
-                y = np.full_like(x, num_lines - idx - 1 + ch * (self.max_lines + 2))
-                z = fft_line
-                self.ax.plot(x, y, z, color=colors[ch], label=f'Channel {ch+1}' if idx == num_lines - 1 else None)
-                max_amplitude = max(max_amplitude, np.max(z))
-
-        # Set axis limits to focus on recent data
-        self.ax.set_ylim(-1, 4 * (self.max_lines + 2))
-        self.ax.set_xlim(frequencies[0], frequencies[-1])
-        self.ax.set_zlim(0, max_amplitude * 1.1)  # Add 10% margin to z-axis
-
-        self.ax.legend(loc='upper right')
-        self.figure.tight_layout()
-
-        # Set 3D view angle for better visibility
-        self.ax.view_init(elev=20, azim=-45)
-
-        self.canvas.draw()
\ No newline at end of file
+        # Zero-padded spectra of the raw counts of all 4 channels in one batched rfft,
+        # shared with other views of this frame
+        N = target_length
+        half = N // 2
+        fft_result = frame_cache.spectra(values, 4, None, N, 0, sample_count)[:, :half]
+
+        # Single-sided FFT magnitude scaled for correct amplitude peak (ADC counts converted to volts)
+        fft_magnitudes = (2.0 * self.scaling_factor / N) * np.abs(fft_result)  # Scale for single-sided FFT
+        fft_magnitudes[:, 0] /= 2  # DC component no doubling
+        if N % 2 == 0:
+            fft_magnitudes[:, -1] /= 2  # Nyquist component no doubling if even length
+
+        # Frequency axis: [0, Fs/N, 2*Fs/N, ..., (N/2 - 1)*Fs/N]
+        frequencies = np.arange(half) * (self.sample_rate / N)
+
+        # Only new lines leave the worker; the ring is written on the GUI thread
+        self.pending_lines.append(fft_magnitudes)
+        return frequencies
+
+    def render(self, frequencies):
+        lines = []
+        while self.pending_lines:
+            lines.append(self.pending_lines.popleft())
+        if lines:
+            # A sample-rate change alters the bin count; only lines like the newest are kept
+            lines = [line for line in lines if line.shape == lines[-1].shape]
+            self.update_waterfall_plot(frequencies, np.stack(lines, axis=-1))
+
+    def update_waterfall_plot(self, frequencies, fft_magnitudes):
+        """Add (channels x bins x lines) spectra.
+
+        Every line is its own one-row image, coloured once when it arrives. Older lines
+        scroll by moving their channel's group, so a frame costs one new row per channel
+        instead of re-sending the whole history as a texture.
+        """
+        if fft_magnitudes.ndim == 2:
+            fft_magnitudes = fft_magnitudes[:, :, None]
+        channels, bins, count = fft_magnitudes.shape
+        frame_period = self.samples_per_channel / self.sample_rate
+        df = frequencies[1] - frequencies[0] if len(frequencies) > 1 else 1.0
+        if self.geometry != (bins, df, frame_period):
+            self.reset_lines((bins, df, frame_period), frequencies[0] - df / 2)
+
+        # Colour scale follows recent peaks and relaxes slowly after a transient; drawn lines
+        # are only re-coloured when it has drifted well away from their levels
+        self.level_max = max(float(fft_magnitudes.max()), self.level_max * 0.99)
+        if self.levels is None or not 0.5 * self.levels <= self.level_max <= 1.25 * self.levels:
+            self.levels = max(self.level_max, 1e-12)
+            for lines in self.lines:
+                for item in lines:
+                    item.setLevels((0.0, self.levels))
+
+        for i in range(count):
+            self.line_count += 1
+            # Line n spans [(n - 1) * period, n * period) in group coordinates
+            rect = QRectF(frequencies[0] - df / 2, (self.line_count - 1) * frame_period, bins * df, frame_period)
+            for ch in range(min(channels, len(self.groups))):
+                item = pg.ImageItem()
+                item.setLookupTable(self.lut)
+                item.setImage(fft_magnitudes[ch, :, i:i + 1], autoLevels=False, levels=(0.0, self.levels))
+                item.setRect(rect)
+                item.setParentItem(self.groups[ch])
+                self.lines[ch].append(item)
+                if len(self.lines[ch]) > self.max_lines:
+                    self.remove_line(self.lines[ch].popleft())
+        # Newest line ends at 0 s, the oldest kept one at -max_lines * period
+        for group in self.groups:
+            group.setPos(0, -self.line_count * frame_period)
+
+    def reset_lines(self, geometry, x_min):
+        """Drop every line and fit the plots to a new bin count, bin width or frame period."""
+        for lines in self.lines:
+            while lines:
+                self.remove_line(lines.popleft())
+        self.line_count = 0
+        self.level_max = 0.0
+        self.levels = None
+        self.geometry = geometry
+        bins, df, frame_period = geometry
+        for plot in self.plots:
+            plot.setXRange(x_min, x_min + bins * df, padding=0)
+            plot.setYRange(-self.max_lines * frame_period, 0, padding=0)
+
+    def remove_line(self, item):
+        scene = item.scene()
+        if scene is not None:
+            scene.removeItem(item)
+        else:
+            item.setParentItem(None)
@@ -0,0 +1,111 @@
+import time
+import logging
+import threading
+
+# Categories shown by default below WARNING; the console has always shown MQTT and layout messages
+DEFAULT_LEVELS = {"mqtt": logging.INFO, "layout": logging.INFO}
+
+
+class RateLimit:
+    """Token bucket: up to count messages per period seconds, refilled continuously."""
+
+    def __init__(self, count, period):
+        self.count = count
+        self.period = period
+        self.tokens = float(count)
+        self.updated = time.monotonic()
+        self.suppressed = 0  # Since the last message let through
+        self.dropped = 0
+
+    def allow(self, now):
+        self.tokens = min(self.count, self.tokens + (now - self.updated) * self.count / self.period)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.suppressed += 1
+        self.dropped += 1
+        return False
+
+
+class LazyLog:
+    """Category-based logging for per-frame hot paths.
+
+    A message is a format string with arguments, or a callable returning the text, so
+    f-strings can be deferred as lambda: f"...". Nothing is formatted unless the record
+    passes its category's level and rate limit, which makes a filtered call a dict lookup
+    and a comparison. Records that pass go to the standard logging module under the
+    category's logger name and to every sink (the dashboard console registers one).
+    """
+
+    def __init__(self, default_level=logging.WARNING, rate=(10, 1.0)):
+        self.default_level = default_level
+        self.levels = dict(DEFAULT_LEVELS)
+        self.rate = rate
+        self.rates = {}
+        self.limits = {}
+        self.sinks = []
+        self.lock = threading.Lock()
+
+    def set_level(self, category, level):
+        self.levels[category] = level
+
+    def set_rate(self, category, count, period=1.0):
+        """Allow category count messages per period seconds (bursts up to count)."""
+        with self.lock:
+            self.rates[category] = (count, period)
+            self.limits.pop(category, None)
+
+    def enabled(self, category, level=logging.DEBUG):
+        return level >= self.levels.get(category, self.default_level)
+
+    def add_sink(self, sink):
+        """sink(category, level, text) is called from whichever thread logged."""
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def log(self, category, level, message, *args):
+        if level < self.levels.get(category, self.default_level):
+            return
+        with self.lock:
+            limit = self.limits.get(category)
+            if limit is None:
+                limit = self.limits[category] = RateLimit(*self.rates.get(category, self.rate))
+            if not limit.allow(time.monotonic()):
+                return
+            suppressed, limit.suppressed = limit.suppressed, 0
+        try:
+            text = message() if callable(message) else (message % args if args else message)
+        except Exception as e:
+            text = f"Unformattable {category} message: {str(e)}"
+        if suppressed:
+            text = f"{text} ({suppressed} similar messages suppressed)"
+        logging.getLogger(category).log(level, text)
+        for sink in list(self.sinks):
+            try:
+                sink(category, level, text)
+            except Exception as e:
+                logging.error(f"Log sink failed: {str(e)}")
+
+    def debug(self, category, message, *args):
+        self.log(category, logging.DEBUG, message, *args)
+
+    def info(self, category, message, *args):
+        self.log(category, logging.INFO, message, *args)
+
+    def warning(self, category, message, *args):
+        self.log(category, logging.WARNING, message, *args)
+
+    def error(self, category, message, *args):
+        self.log(category, logging.ERROR, message, *args)
+
+    def stats(self):
+        with self.lock:
+            return {category: {"dropped": limit.dropped} for category, limit in self.limits.items()}
+
+
+lazy_log = LazyLog()
@@ -1,18 +1,20 @@
 import paho.mqtt.client as mqtt
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer
-import struct
+import numpy as np
 import json
 import logging
 from datetime import datetime
 import threading
 import queue
 from collections import defaultdict
+from lazy_log import lazy_log
+from startup_timeline import startup_timeline
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class MQTTHandler(QObject):
-    # Modified signal to include feature_name
-    data_received = pyqtSignal(str, str, str, list, int)  # feature_name, tag_name, model_name, values, sample_rate
+    # Emitted once per payload; values is passed by reference so every feature sees the same frame object
+    data_received = pyqtSignal(str, str, object, int)  # tag_name, model_name, values, sample_rate
     connection_status = pyqtSignal(str)
 
     def __init__(self, db, project_name, broker="192.168.1.231", port=1883):
@@ -28,21 +30,6 @@ class MQTTHandler(QObject):
         self.batch_interval_ms = 100  # Batch data every 100ms
         self.processing_thread = None
         self.running = False
-        self.feature_mapping = {
-            "Tabular View": ["TabularView"],
-            "Time View": ["TimeWave", "TimeReport"],
-            "Time Report": ["TimeReport"],
-            "FFT": ["FFT"],
-            "Waterfall": ["WaterFall"],
-            "Centerline": ["CenterLinePlot"],
-            "Orbit": ["OrbitView"],
-            "Trend View": ["TrendView"],
-            "Multiple Trend View": ["MultiTrendView"],
-            "Bode Plot": ["BodePlot"],
-            "History Plot": ["HistoryPlot"],
-            "Polar Plot": ["PolarPlot"],
-            "Report": ["Report"]
-        }
         logging.debug(f"Initializing MQTTHandler with project_name: {project_name}, broker: {broker}")
 
     def parse_topic(self, topic):
@@ -55,7 +42,7 @@ class MQTTHandler(QObject):
                     if model.get("tagName") == topic:
                         model_name = model.get("name")
                         break
-            logging.debug(f"Parsed topic {topic}: project_name={self.project_name}, model_name={model_name}, tag_name={tag_name}")
+            lazy_log.debug("mqtt.frames", lambda: f"Parsed topic {topic}: project_name={self.project_name}, model_name={model_name}, tag_name={tag_name}")
             return self.project_name, model_name, tag_name
         except Exception as e:
             logging.error(f"Error parsing topic {topic}: {str(e)}")
@@ -64,6 +51,7 @@ class MQTTHandler(QObject):
     def on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             self.connected = True
+            startup_timeline.mark("mqtt_connected", broker=self.broker)
             self.connection_status.emit("Connected to MQTT Broker")
             logging.info("Connected to MQTT Broker")
             QTimer.singleShot(0, self.subscribe_to_topics)
@@ -116,32 +104,28 @@ class MQTTHandler(QObject):
                                 if not isinstance(values, list) or not values:
                                     logging.warning(f"Invalid JSON payload format: {payload_str}")
                                     continue
+                                values = [np.asarray(ch, dtype=np.float32) for ch in values]
                                 num_channels = len(values)
-                                logging.debug(f"Parsed JSON payload: {num_channels} channels")
+                                lazy_log.debug("mqtt.frames", lambda: f"Parsed JSON payload: {num_channels} channels")
                             except (UnicodeDecodeError, json.JSONDecodeError):
                                 payload_length = len(payload)
                                 if payload_length < 20 or payload_length % 2 != 0:
                                     logging.warning(f"Invalid payload length: {payload_length} bytes")
                                     continue
 
-                                num_samples = payload_length // 2
-                                try:
-                                    values = struct.unpack(f"<{num_samples}H", payload)
-                                except struct.error as e:
-                                    logging.error(f"Failed to unpack payload of {num_samples} uint16_t: {str(e)}")
+                                # Zero-copy view of the little-endian uint16 samples
+                                raw = np.frombuffer(payload, dtype='<u2')
+                                if raw.size < 100:
+                                    logging.warning(f"Payload too short: {raw.size} samples")
                                     continue
 
-                                if len(values) < 100:
-                                    logging.warning(f"Payload too short: {len(values)} samples")
-                                    continue
-
-                                header = values[:100]
-                                total_values = values[100:]
-                                main_channels = header[2]
-                                sample_rate = header[3]
-                                tacho_channels_count = header[6]
+                                header = raw[:100]
+                                total_values = raw[100:]
+                                main_channels = int(header[2])
+                                sample_rate = int(header[3])
+                                tacho_channels_count = int(header[6])
                                 total_channels = main_channels + tacho_channels_count
-                                samples_per_channel = (len(total_values) // total_channels) if total_values else 0
+                                samples_per_channel = (total_values.size // total_channels) if total_channels > 0 else 0
 
                                 if main_channels <= 0 or sample_rate <= 0 or tacho_channels_count <= 0 or samples_per_channel <= 0:
                                     logging.error(f"Invalid header values: main_channels={main_channels}, sample_rate={sample_rate}, "
@@ -149,34 +133,26 @@ class MQTTHandler(QObject):
                                     continue
 
                                 expected_total = samples_per_channel * total_channels
-                                if len(total_values) != expected_total:
-                                    logging.warning(f"Unexpected data length: got {len(total_values)}, expected {expected_total}")
+                                if total_values.size != expected_total:
+                                    logging.warning(f"Unexpected data length: got {total_values.size}, expected {expected_total}")
                                     continue
 
+                                # Main channels are interleaved sample by sample, tacho channels follow as blocks.
+                                # Everything is widened once into one contiguous float32 (channels x samples) block.
+                                kept_tacho = min(tacho_channels_count, 2)
+                                block = np.empty((main_channels + kept_tacho, samples_per_channel), dtype=np.float32)
                                 main_data = total_values[:samples_per_channel * main_channels]
+                                block[:main_channels] = main_data.reshape(samples_per_channel, main_channels).T
                                 tacho_data = total_values[samples_per_channel * main_channels:]
+                                block[main_channels:] = tacho_data[:kept_tacho * samples_per_channel].reshape(kept_tacho, samples_per_channel)
+                                values = list(block)
 
-                                channel_data = [[] for _ in range(main_channels)]
-                                for i in range(0, len(main_data), main_channels):
-                                    for ch in range(main_channels):
-                                        channel_data[ch].append(main_data[i + ch])
-
-                                tacho_freq_data = tacho_data[:samples_per_channel] if tacho_channels_count >= 1 else []
-                                tacho_trigger_data = tacho_data[samples_per_channel:2 * samples_per_channel] if tacho_channels_count >= 2 else []
-
-                                values = [[float(v) for v in ch] for ch in channel_data]
-                                if tacho_freq_data:
-                                    values.append([float(v) for v in tacho_freq_data])
-                                if tacho_trigger_data:
-                                    values.append([float(v) for v in tacho_trigger_data])
-
-                                logging.debug(f"Parsed binary payload: main_channels={main_channels}, total_channels={total_channels}, "
-                                             f"samples_per_channel={samples_per_channel}")
+                                lazy_log.debug("mqtt.frames", lambda: f"Parsed binary payload: main_channels={main_channels}, total_channels={total_channels}, "
+                                                                      f"samples_per_channel={samples_per_channel}")
 
-                            # Emit data for each feature
-                            for feature_name, _ in self.feature_mapping.items():
-                                self.data_received.emit(feature_name, tag_name, model_name, values, sample_rate)
-                                logging.debug(f"Emitted data for {feature_name}/{tag_name}/{model_name}: {len(values)} channels, sample_rate={sample_rate}")
+                            # Emit once; the dashboard fans the frame out to every feature of the model
+                            self.data_received.emit(tag_name, model_name, values, sample_rate)
+                            lazy_log.debug("mqtt.frames", lambda: f"Emitted data for {tag_name}/{model_name}: {len(values)} channels, sample_rate={sample_rate}")
 
                         except Exception as e:
                             logging.error(f"Error processing payload for topic {topic}: {str(e)}")
@@ -193,6 +169,7 @@ class MQTTHandler(QObject):
                 if tag_name and tag_name not in self.subscribed_topics:
                     self.client.subscribe(tag_name)
                     self.subscribed_topics.append(tag_name)
+                    startup_timeline.mark("mqtt_subscribed", topic=tag_name)
                     logging.info(f"Subscribed to topic: {tag_name}")
         except Exception as e:
             logging.error(f"Error subscribing to topics: {str(e)}")
@@ -1,5 +1,3 @@
-from dashboard.dashboard_window import DashboardWindow
-
 class ProjectSelectionWindow:
 
     def __init__(self, db, email, auth_window=None):
@@ -10,6 +8,8 @@ class ProjectSelectionWindow:
         self.open_dashboard()
 
     def open_dashboard(self):
+        # Imported here so the login window does not wait for the dashboard; the warm-up has usually loaded it by now
+        from dashboard.dashboard_window import DashboardWindow
         self.dashboard_window = DashboardWindow(self.db, self.email, self.auth_window)
         self.dashboard_window.show()
     
@@ -7,6 +7,7 @@ from PyQt5.QtCore import Qt, QTimer
 import json
 import logging
 import time
+from startup_timeline import startup_timeline
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -96,6 +97,10 @@ class ProjectStructureWidget(QWidget):
         return tree
 
     def load_projects(self):
+        with startup_timeline.span("project_structure_preload"):
+            self.preload_projects()
+
+    def preload_projects(self):
         try:
             projects = self.db.load_projects()
             self.project_list.clear()
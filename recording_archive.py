@@ -0,0 +1,214 @@
+import os
+import json
+import logging
+from datetime import datetime
+from bson.objectid import ObjectId
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+ARCHIVE_VERSION = 1
+
+
+def _recording_query(db, project_name, model_name, feature_name, filename):
+    query = {"projectName": project_name, "email": db.email, "filename": filename}
+    if model_name:
+        query["moduleName"] = model_name
+    if feature_name:
+        query["featureName"] = feature_name
+    return query
+
+
+def _numeric_array(value):
+    """value as a numeric ndarray, or None if it is not one (e.g. rows of unequal length)."""
+    try:
+        arr = np.asarray(value)
+    except (ValueError, TypeError):
+        return None
+    return arr if arr.dtype.kind in "biuf" else None
+
+
+def _split_message(message):
+    """Split a saved message into numeric arrays and plain JSON fields.
+
+    Values that do not form a rectangular numeric array stay in the JSON fields.
+    """
+    if not isinstance(message, dict):
+        arr = _numeric_array(message)
+        return ({"message": arr}, {}, False) if arr is not None else ({}, {"message": message}, False)
+    arrays = {}
+    fields = {}
+    for key, value in message.items():
+        if isinstance(value, (list, tuple)):
+            arr = _numeric_array(value)
+            if arr is not None:
+                arrays[key] = arr
+                continue
+        fields[key] = value
+    return arrays, fields, True
+
+
+def _json_safe(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class _SegmentWriter:
+    def __init__(self, out_dir, compress):
+        self.out_dir = out_dir
+        self.compress = compress
+        self.index = 0
+        self.segments = []
+        self._reset()
+
+    def _reset(self):
+        self.arrays = {}
+        self.frames = []
+        self.signature = None
+
+    def add(self, doc):
+        arrays, fields, is_dict = _split_message(doc.get("message"))
+        signature = (is_dict, tuple(sorted((k, a.shape, a.dtype.str) for k, a in arrays.items())))
+        if self.signature is not None and signature != self.signature:
+            self.flush()
+        self.signature = signature
+        for key, arr in arrays.items():
+            self.arrays.setdefault(key, []).append(arr)
+        frame = {k: v for k, v in doc.items() if k not in ("_id", "message")}
+        frame["messageFields"] = fields
+        frame["messageIsDict"] = is_dict
+        self.frames.append(frame)
+
+    def flush(self):
+        if not self.frames:
+            return
+        stacked = {key: np.stack(parts) for key, parts in self.arrays.items()}
+        if self.compress:
+            name = f"segment_{self.index:05d}.npz"
+            np.savez_compressed(os.path.join(self.out_dir, name), **stacked)
+        else:
+            name = f"segment_{self.index:05d}"
+            os.makedirs(os.path.join(self.out_dir, name), exist_ok=True)
+            for key, arr in stacked.items():
+                np.save(os.path.join(self.out_dir, name, f"{key}.npy"), arr)
+        self.segments.append({
+            "file": name,
+            "frames": self.frames,
+            "arrays": {key: {"shape": list(arr.shape), "dtype": arr.dtype.str} for key, arr in stacked.items()}
+        })
+        self.index += 1
+        self._reset()
+
+
+def export_recording(db, project_name, model_name, feature_name, filename, out_dir, frames_per_segment=64, compress=False, progress=None):
+    """Stream one recording from feature_messages into segments plus a JSON manifest.
+
+    Only one segment of frames is held in memory at a time. Each segment is a directory
+    of .npy files that open_segment can memory-map; compress=True writes a smaller .npz
+    instead, which has to be decompressed to be read.
+    """
+    query = _recording_query(db, project_name, model_name, feature_name, filename)
+    total = db.feature_collection.count_documents(query)
+    if total == 0:
+        logging.warning(f"No frames found to export for {project_name}/{model_name}/{feature_name}/{filename}")
+        return None
+
+    os.makedirs(out_dir, exist_ok=True)
+    writer = _SegmentWriter(out_dir, compress)
+    done = 0
+    cursor = db.feature_collection.find(query).sort("createdAt", 1).batch_size(frames_per_segment)
+    try:
+        for doc in cursor:
+            writer.add(doc)
+            done += 1
+            if len(writer.frames) >= frames_per_segment:
+                writer.flush()
+            if progress:
+                progress(done, total)
+        writer.flush()
+    finally:
+        cursor.close()
+
+    manifest = {
+        "version": ARCHIVE_VERSION,
+        "projectName": project_name,
+        "moduleName": model_name,
+        "featureName": feature_name,
+        "filename": filename,
+        "exportedAt": datetime.now().isoformat(),
+        "compressed": compress,
+        "frames": done,
+        "segments": writer.segments
+    }
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, default=_json_safe)
+    logging.info(f"Exported {done} frames of {filename} into {len(writer.segments)} segments at {out_dir}")
+    return manifest_path
+
+
+def load_manifest(archive_dir):
+    with open(os.path.join(archive_dir, MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def open_segment(archive_dir, segment, mmap=True):
+    """Return {key: ndarray} for one manifest segment, memory-mapped where the format allows."""
+    path = os.path.join(archive_dir, segment["file"])
+    if os.path.isdir(path):
+        mode = "r" if mmap else None
+        return {key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode=mode) for key in segment["arrays"]}
+    # .npz members are decompressed lazily, one array per key access.
+    return np.load(path)
+
+
+def import_recording(db, archive_dir, project_name=None, model_name=None, filename=None, progress=None):
+    """Insert an exported recording back into feature_messages, one segment at a time."""
+    manifest = load_manifest(archive_dir)
+    if manifest.get("version") != ARCHIVE_VERSION:
+        logging.error(f"Unsupported archive version {manifest.get('version')} in {archive_dir}")
+        return False, "Unsupported archive version"
+
+    project_name = project_name or manifest["projectName"]
+    model_name = model_name or manifest["moduleName"]
+    filename = filename or manifest["filename"]
+    total = manifest["frames"]
+    done = 0
+    try:
+        for segment in manifest["segments"]:
+            segment_file = open_segment(archive_dir, segment, mmap=True)
+            arrays = {key: segment_file[key] for key in segment["arrays"]}
+            if hasattr(segment_file, "close"):
+                segment_file.close()
+            documents = []
+            for i, frame in enumerate(segment["frames"]):
+                doc = {k: v for k, v in frame.items() if k not in ("messageFields", "messageIsDict")}
+                if frame["messageIsDict"]:
+                    message = dict(frame["messageFields"])
+                    for key in segment["arrays"]:
+                        message[key] = arrays[key][i].tolist()
+                elif "message" in arrays:
+                    message = arrays["message"][i].tolist()
+                else:
+                    message = frame["messageFields"]["message"]
+                doc.update({
+                    "_id": ObjectId(),
+                    "message": message,
+                    "projectName": project_name,
+                    "moduleName": model_name,
+                    "filename": filename,
+                    "email": db.email
+                })
+                documents.append(doc)
+            if documents:
+                db.feature_collection.insert_many(documents, ordered=False)
+            done += len(documents)
+            if progress:
+                progress(done, total)
+        logging.info(f"Imported {done} frames from {archive_dir} as {project_name}/{model_name}/{filename}")
+        return True, f"Imported {done} frames"
+    except Exception as e:
+        logging.error(f"Failed to import recording from {archive_dir}: {str(e)}")
+        return False, f"Failed to import recording: {str(e)}"
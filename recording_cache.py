@@ -0,0 +1,167 @@
+import threading
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+
+
+class DecodedRecording:
+    def __init__(self, sample_rate, num_channels, tacho_channels_count, data, times):
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.tacho_channels_count = tacho_channels_count
+        self.num_plots = num_channels + tacho_channels_count
+        self.data = data  # one read-only ndarray per plot
+        self.times = times  # shared read-only time axis (epoch seconds)
+        self.nbytes = sum(arr.nbytes for arr in data) + times.nbytes
+
+
+def decode_recording(messages):
+    """Turn the saved feature_messages of one recording into contiguous ndarrays."""
+    if not messages:
+        return None
+    first = messages[0]
+    num_channels = first.get('numberOfChannels', 4)
+    tacho_channels_count = first.get('tachoChannelCount', 2)
+    sample_rate = first.get('samplingRate', 4096)
+    num_plots = num_channels + tacho_channels_count
+    time_step = 1.0 / sample_rate
+
+    data_parts = [[] for _ in range(num_plots)]
+    time_parts = []
+    for msg in messages:
+        created_at = datetime.fromisoformat(msg['createdAt'].replace('Z', '+00:00')).timestamp()
+        values = msg['message']
+        channel_data = values.get('channel_data', [])
+        samples = len(channel_data[0]) if channel_data else 0
+        time_parts.append(created_at + np.arange(samples) * time_step)
+        for ch in range(num_channels):
+            data_parts[ch].append(np.asarray(channel_data[ch], dtype=np.float32))
+        if tacho_channels_count >= 1:
+            data_parts[num_channels].append(np.asarray(values.get('tacho_freq', []), dtype=np.float32))
+        if tacho_channels_count >= 2:
+            data_parts[num_channels + 1].append(np.asarray(values.get('tacho_trigger', []), dtype=np.float32))
+
+    data = []
+    for parts in data_parts:
+        arr = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        arr.setflags(write=False)
+        data.append(arr)
+    times = np.concatenate(time_parts) if time_parts else np.zeros(0)
+    times.setflags(write=False)
+    return DecodedRecording(sample_rate, num_channels, tacho_channels_count, data, times)
+
+
+class RecordingCache:
+    """Memory-bounded LRU of decoded recordings keyed by (project, model, feature, filename)."""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        # Bumped by invalidate() per key and by clear() for all keys; a load that started
+        # under an older generation does not store its (stale) result
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, db, project_name, model_name, feature_name, filename, prefetch=True):
+        key = (project_name, model_name, feature_name, filename)
+        with self._lock:
+            recording = self._entries.get(key)
+            if recording is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if recording is None:
+            recording = self._load(db, key)
+            with self._lock:
+                self.misses += 1
+        if prefetch:
+            self.prefetch_neighbours(db, project_name, model_name, feature_name, filename)
+        return recording
+
+    def prefetch_neighbours(self, db, project_name, model_name, feature_name, filename):
+        match = re.match(r"data(\d+)$", filename or "")
+        if not match:
+            return
+        number = int(match.group(1))
+        for neighbour in (number - 1, number + 1):
+            if neighbour < 1:
+                continue
+            key = (project_name, model_name, feature_name, f"data{neighbour}")
+            with self._lock:
+                if key in self._entries or key in self._inflight:
+                    continue
+            threading.Thread(target=self._load, args=(db, key), daemon=True).start()
+
+    def invalidate(self, project_name, model_name, feature_name, filename):
+        key = (project_name, model_name, feature_name, filename)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            recording = self._entries.pop(key, None)
+            if recording is not None:
+                self.current_bytes -= recording.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _generation(self, key):
+        return (self._epoch, self._generations.get(key, 0))
+
+    def _load(self, db, key):
+        with self._lock:
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if owner:
+                event, generation = threading.Event(), self._generation(key)
+                self._inflight[key] = (event, generation)
+            else:
+                event, generation = inflight
+        if not owner:
+            # Someone (usually a prefetch) is already decoding this recording.
+            event.wait()
+            with self._lock:
+                recording = self._entries.get(key)
+                invalidated = self._generation(key) != generation
+            if recording is None and invalidated:
+                return self._load(db, key)  # That load was discarded by invalidate(); fetch the new data
+            return recording
+
+        try:
+            project_name, model_name, feature_name, filename = key
+            messages = db.get_feature_messages(project_name, model_name=model_name, feature_name=feature_name, filename=filename)
+            recording = decode_recording(messages)
+            if recording is not None:
+                self._put(key, recording, generation)
+                logging.debug(f"Cached recording {key}: {recording.nbytes} bytes, cache size {self.current_bytes} bytes")
+            return recording
+        except Exception as e:
+            logging.error(f"Error loading recording {key}: {str(e)}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def _put(self, key, recording, generation):
+        with self._lock:
+            if recording.nbytes > self.max_bytes or self._generation(key) != generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.nbytes
+            self._entries[key] = recording
+            self.current_bytes += recording.nbytes
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+
+recording_cache = RecordingCache()
@@ -0,0 +1,116 @@
+import json
+import time
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+
+
+def parse_args(argv):
+    """Startup options of app.py; unknown arguments are left for Qt."""
+    parser = argparse.ArgumentParser(description="Sarayu Desktop Application")
+    parser.add_argument("--startup-report", metavar="PATH",
+                        help="write the startup timeline to PATH as JSON")
+    parser.add_argument("--exit-after-first-frame", action="store_true",
+                        help="quit once the first live frame reaches the dashboard (exit code 0)")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS",
+                        help="with --exit-after-first-frame, quit with exit code 1 if no frame arrived in time")
+    parser.add_argument("--login", metavar="EMAIL",
+                        help="log in without the form, password taken from SARAYU_PASSWORD")
+    parser.add_argument("--project", metavar="NAME", help="open this project after login")
+    parser.add_argument("--broker", metavar="HOST[:PORT]", help="MQTT broker instead of the built-in address")
+    options, _ = parser.parse_known_args(argv)
+    return options
+
+
+class StartupTimeline:
+    """Monotonic milestones from app launch to the first live frame.
+
+    mark() records a point and span() the duration of a phase. Both only keep the first
+    occurrence of a name, so call sites that run again later (reconnects, every frame)
+    cost a set lookup after startup. Listeners registered for a milestone run on the
+    thread that reached it.
+    """
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.origin_wall_time = time.time()
+        self.entries = []
+        self.seen = set()
+        self.listeners = {}
+        self.lock = threading.Lock()
+        self.options = parse_args([])
+
+    def elapsed(self):
+        return time.monotonic() - self.origin
+
+    def reached(self, name):
+        return name in self.seen
+
+    def record(self, name, start, duration=None, **details):
+        with self.lock:
+            if name in self.seen:
+                return False
+            self.seen.add(name)
+            entry = {"name": name, "at": round(start, 4), "thread": threading.current_thread().name}
+            if duration is not None:
+                entry["duration"] = round(duration, 4)
+            entry.update(details)
+            self.entries.append(entry)
+        for listener in self.listeners.pop(name, []):
+            try:
+                listener()
+            except Exception as e:
+                logging.error(f"Startup listener for {name} failed: {str(e)}")
+        return True
+
+    def mark(self, name, **details):
+        if name not in self.seen:
+            self.record(name, self.elapsed(), **details)
+
+    @contextmanager
+    def span(self, name, **details):
+        if name in self.seen:
+            yield
+            return
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            self.record(name, start, self.elapsed() - start, **details)
+
+    def on(self, name, listener):
+        """Call listener once when name is reached, immediately if it already was."""
+        with self.lock:
+            if name not in self.seen:
+                self.listeners.setdefault(name, []).append(listener)
+                return
+        listener()
+
+    def report(self):
+        with self.lock:
+            entries = sorted(self.entries, key=lambda entry: entry["at"])
+        return {
+            "launched_at": self.origin_wall_time,
+            "total": round(self.elapsed(), 4),
+            "milestones": entries,
+        }
+
+    def format_report(self):
+        report = self.report()
+        lines = ["Startup timeline (seconds since launch):"]
+        for entry in report["milestones"]:
+            duration = f"{entry['duration']:8.3f}" if "duration" in entry else " " * 8
+            lines.append(f"  {entry['at']:8.3f} {duration}  {entry['name']}")
+        return "\n".join(lines)
+
+    def write_report(self, path):
+        try:
+            with open(path, "w") as f:
+                json.dump(self.report(), f, indent=2)
+            logging.info(f"Startup report written to {path}")
+        except OSError as e:
+            logging.error(f"Failed to write startup report to {path}: {str(e)}")
+
+
+startup_timeline = StartupTimeline()